@@ -8,6 +8,8 @@ from bs4 import BeautifulSoup
 from utilities.helpers.env_helper import EnvHelper
 from utilities.helpers.azure_blob_storage_client import AzureBlobStorageClient
 from utilities.helpers.embedders.embedder_factory import EmbedderFactory
+from utilities.helpers.search_result_cache import bump_index_generation
+from utilities.document_loading.web import WebDocumentLoading
 
 bp_add_url_embeddings = func.Blueprint()
 logger = logging.getLogger(__name__)
@@ -43,6 +45,7 @@ def process_url_contents_directly(url: str, env_helper: EnvHelper):
     try:
         embedder = EmbedderFactory.create(env_helper)
         embedder.embed_file(url, ".url")
+        bump_index_generation(AzureBlobStorageClient())
     except Exception:
         logger.error(
             f"Error while processing contents of URL {url}: {traceback.format_exc()}"
@@ -61,7 +64,8 @@ def download_url_and_upload_to_blob(url: str):
     try:
         response = requests.get(url)
         parsed_data = BeautifulSoup(response.content, "html.parser")
-        with io.BytesIO(parsed_data.get_text().encode("utf-8")) as stream:
+        text = WebDocumentLoading.get_text(parsed_data)
+        with io.BytesIO(text.encode("utf-8")) as stream:
             blob_client = AzureBlobStorageClient()
             blob_client.upload_file(stream, url, metadata={"title": url})
         return func.HttpResponse(f"URL {url} added to knowledge base", status_code=200)
@@ -0,0 +1,176 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
+
+import azure.functions as func
+from bs4 import BeautifulSoup
+from utilities.helpers.env_helper import EnvHelper
+from utilities.helpers.azure_blob_storage_client import AzureBlobStorageClient
+from utilities.helpers.embedders.embedder_factory import EmbedderFactory
+from utilities.helpers.search_result_cache import bump_index_generation
+from utilities.helpers.url_fetcher import FetchedPage, UrlFetcher
+from utilities.helpers.web_crawler import WebCrawler
+from utilities.document_loading.web import WebDocumentLoading
+
+bp_batch_add_url_embeddings = func.Blueprint()
+logger = logging.getLogger(__name__)
+logger.setLevel(level=os.environ.get("LOGLEVEL", "INFO").upper())
+
+
+@bp_batch_add_url_embeddings.route(route="BatchAddURLEmbeddings")
+def batch_add_url_embeddings(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Adds the web pages of the URLs in the request body to the knowledge base, fetching
+    them concurrently and skipping those not modified since they were added. Responds
+    with the status of each URL: added, unchanged or failed.
+    """
+    try:
+        urls = req.get_json().get("urls")
+    except Exception:
+        urls = None
+
+    if not urls or not isinstance(urls, list):
+        return func.HttpResponse(
+            "Please pass a list of URLs as urls in the request body",
+            status_code=400,
+        )
+
+    env_helper: EnvHelper = EnvHelper()
+    fetcher = UrlFetcher(env_helper)
+    ingestion = WebPageIngestion(env_helper)
+    # a URL listed twice is only fetched once
+    urls = list(dict.fromkeys(urls))
+    with ThreadPoolExecutor(max_workers=env_helper.EMBEDDING_MAX_WORKERS) as executor:
+        futures = {
+            url: executor.submit(ingestion.add_url, url, fetcher) for url in urls
+        }
+
+    return ingestion.respond(_get_results(futures))
+
+
+@bp_batch_add_url_embeddings.route(route="CrawlURLEmbeddings")
+def crawl_url_embeddings(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Adds the web pages of the site crawled from the URL, a page or a sitemap, in the
+    request body to the knowledge base, see WebCrawler. The optional max_depth and
+    max_pages default to CRAWL_MAX_DEPTH and CRAWL_MAX_PAGES. The pages are added
+    while the site is crawled, skipping those not modified since they were added.
+    Responds with the status of each crawled page: added, unchanged or failed.
+    """
+    try:
+        body = req.get_json()
+        url = body.get("url")
+        max_depth, max_pages = (
+            None if body.get(key) is None else int(body[key])
+            for key in ("max_depth", "max_pages")
+        )
+    except Exception:
+        url = None
+
+    if not url:
+        return func.HttpResponse(
+            "Please pass the URL of a page or sitemap as url in the request body",
+            status_code=400,
+        )
+
+    env_helper: EnvHelper = EnvHelper()
+    crawler = WebCrawler(env_helper, max_depth=max_depth, max_pages=max_pages)
+    ingestion = WebPageIngestion(env_helper)
+    max_workers = env_helper.EMBEDDING_MAX_WORKERS
+    # bounds the crawled pages waiting to be added, holding their content
+    pending = threading.BoundedSemaphore(2 * max_workers)
+    futures: Dict[str, Future] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for page in crawler.crawl(url):
+            pending.acquire()
+            futures[page.url] = executor.submit(ingestion.add_crawled_page, page)
+            futures[page.url].add_done_callback(lambda _: pending.release())
+
+    results = _get_results(futures)
+    results.extend(
+        {"url": failed_url, "status": "failed", "error": error}
+        for failed_url, error in crawler.failed.items()
+    )
+    return ingestion.respond(results)
+
+
+class WebPageIngestion:
+    """
+    Adds web pages to the knowledge base: with integrated vectorization, uploads their
+    text to the blob storage for the indexer, else embeds them. The ETag and
+    Last-Modified of the pages are stored with them, so that the pages not modified
+    since are not added again.
+    """
+
+    def __init__(self, env_helper: EnvHelper):
+        self.integrated_vectorization = (
+            env_helper.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION
+        )
+        if self.integrated_vectorization:
+            self.blob_client = AzureBlobStorageClient()
+        else:
+            self.embedder = EmbedderFactory.create(env_helper)
+
+    def add_url(self, url: str, fetcher: UrlFetcher) -> str:
+        page = fetcher.fetch(url, self.get_validators(url))
+        if page.not_modified:
+            return "unchanged"
+        self.add_page(page)
+        return "added"
+
+    def add_crawled_page(self, page: FetchedPage) -> str:
+        stored_validators = self.get_validators(page.url)
+        if page.validators and all(
+            stored_validators.get(key) == value
+            for key, value in page.validators.items()
+        ):
+            return "unchanged"
+        self.add_page(page)
+        return "added"
+
+    def get_validators(self, url: str) -> Dict[str, str]:
+        if self.integrated_vectorization:
+            return self.blob_client.get_blob_metadata(url) or {}
+        return self.embedder.get_web_page_validators(url)
+
+    def add_page(self, page: FetchedPage):
+        if self.integrated_vectorization:
+            parsed_data = BeautifulSoup(page.content, "html.parser")
+            self.blob_client.upload_file(
+                WebDocumentLoading.get_text(parsed_data).encode("utf-8"),
+                page.url,
+                metadata={"title": page.url, **page.validators},
+            )
+        else:
+            self.embedder.embed_web_page(page.url, page.content, page.validators)
+
+    def respond(self, results: List[dict]) -> func.HttpResponse:
+        if not self.integrated_vectorization and any(
+            result["status"] == "added" for result in results
+        ):
+            bump_index_generation(AzureBlobStorageClient())
+
+        return func.HttpResponse(
+            json.dumps({"results": results}),
+            mimetype="application/json",
+            status_code=200,
+        )
+
+
+def _get_results(futures: Dict[str, Future]) -> List[dict]:
+    results = []
+    for url, future in futures.items():
+        if future.exception() is None:
+            results.append({"url": url, "status": future.result()})
+        else:
+            logger.error(
+                f"Error while adding URL {url} to the knowledge base",
+                exc_info=future.exception(),
+            )
+            results.append(
+                {"url": url, "status": "failed", "error": str(future.exception())}
+            )
+    return results
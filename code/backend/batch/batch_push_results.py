@@ -7,6 +7,7 @@ import azure.functions as func
 from utilities.helpers.azure_blob_storage_client import AzureBlobStorageClient
 from utilities.helpers.env_helper import EnvHelper
 from utilities.helpers.embedders.embedder_factory import EmbedderFactory
+from utilities.helpers.search_result_cache import bump_index_generation
 from utilities.search.search import Search
 
 bp_batch_push_results = func.Blueprint()
@@ -33,8 +34,12 @@ def batch_push_results(msg: func.QueueMessage) -> None:
     event_type = message_body.get("eventType", "")
     # We handle "" in this scenario for backwards compatibility
     # This function is primarily triggered by an Event Grid queue message from the blob storage
-    # However, it can also be triggered using a legacy schema from BatchStartProcessing
-    if event_type in ("", "Microsoft.Storage.BlobCreated"):
+    # However, it can also be triggered using a legacy schema, or a batch of files
+    # from BatchStartProcessing
+    if event_type == "" and "filenames" in message_body:
+        _process_documents_batch(message_body)
+
+    elif event_type in ("", "Microsoft.Storage.BlobCreated"):
         _process_document_created_event(message_body)
 
     elif event_type == "Microsoft.Storage.BlobDeleted":
@@ -53,6 +58,26 @@ def _process_document_created_event(message_body) -> None:
 
     embedder = EmbedderFactory.create(env_helper)
     embedder.embed_file(file_sas, file_name)
+    bump_index_generation(blob_client)
+
+
+def _process_documents_batch(message_body) -> None:
+    env_helper: EnvHelper = EnvHelper()
+
+    blob_client = AzureBlobStorageClient()
+    file_names = message_body["filenames"]
+
+    embedder = EmbedderFactory.create(env_helper)
+    try:
+        embedder.embed_files(
+            [
+                (blob_client.get_blob_sas(file_name), file_name)
+                for file_name in file_names
+            ]
+        )
+    finally:
+        # the files embedded before a failure are in the index
+        bump_index_generation(blob_client)
 
 
 def _process_document_deleted_event(message_body) -> None:
@@ -61,3 +86,4 @@ def _process_document_deleted_event(message_body) -> None:
 
     blob_url = message_body.get("data", {}).get("url", "")
     search_handler.delete_from_index(blob_url)
+    bump_index_generation(AzureBlobStorageClient())
@@ -1,6 +1,8 @@
 import os
 import logging
 import json
+from itertools import islice
+from typing import Iterable, Iterator, List
 import azure.functions as func
 from utilities.helpers.embedders.integrated_vectorization_embedder import (
     IntegratedVectorizationEmbedder,
@@ -10,6 +12,7 @@ from utilities.helpers.azure_blob_storage_client import (
     AzureBlobStorageClient,
     create_queue_client,
 )
+from utilities.helpers.search_result_cache import bump_index_generation
 
 bp_batch_start_processing = func.Blueprint()
 logger = logging.getLogger(__name__)
@@ -22,21 +25,27 @@ def batch_start_processing(req: func.HttpRequest) -> func.HttpResponse:
     env_helper: EnvHelper = EnvHelper()
     # Set up Blob Storage Client
     azure_blob_storage_client = AzureBlobStorageClient()
-    # Get all files from Blob Storage
-    files_data = azure_blob_storage_client.get_all_files()
-
-    files_data = list(map(lambda x: {"filename": x["filename"]}, files_data))
+    # List the names of the files from Blob Storage, page by page
+    files_data = azure_blob_storage_client.iter_files(include_metadata=False)
 
     if env_helper.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION:
+        file_count = sum(1 for _ in files_data)
         reprocess_integrated_vectorization(env_helper)
+        bump_index_generation(azure_blob_storage_client)
     else:
-        # Send a message to the queue for each file
+        # Send a message to the queue for each batch of files, embedded concurrently
         queue_client = create_queue_client()
-        for fd in files_data:
-            queue_client.send_message(json.dumps(fd).encode("utf-8"))
+        file_count = 0
+        for filenames in _batched(
+            (fd["filename"] for fd in files_data), env_helper.EMBEDDING_MAX_WORKERS
+        ):
+            queue_client.send_message(
+                json.dumps({"filenames": filenames}).encode("utf-8")
+            )
+            file_count += len(filenames)
 
     return func.HttpResponse(
-        f"Conversion started successfully for {len(files_data)} documents.",
+        f"Conversion started successfully for {file_count} documents.",
         status_code=200,
     )
 
@@ -44,3 +53,9 @@ def batch_start_processing(req: func.HttpRequest) -> func.HttpResponse:
 def reprocess_integrated_vectorization(env_helper: EnvHelper):
     indexer_embedder = IntegratedVectorizationEmbedder(env_helper)
     indexer_embedder.reprocess_all()
+
+
+def _batched(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
@@ -2,9 +2,11 @@ import logging
 import os
 import azure.functions as func
 from add_url_embeddings import bp_add_url_embeddings
+from batch_add_url_embeddings import bp_batch_add_url_embeddings
 from batch_push_results import bp_batch_push_results
 from batch_start_processing import bp_batch_start_processing
 from get_conversation_response import bp_get_conversation_response
+from get_indexer_status import bp_get_indexer_status
 from azure.monitor.opentelemetry import configure_azure_monitor
 
 logging.captureWarnings(True)
@@ -17,6 +19,8 @@ app = func.FunctionApp(
     http_auth_level=func.AuthLevel.FUNCTION
 )  # change to ANONYMOUS for local debugging
 app.register_functions(bp_add_url_embeddings)
+app.register_functions(bp_batch_add_url_embeddings)
 app.register_functions(bp_batch_push_results)
 app.register_functions(bp_batch_start_processing)
 app.register_functions(bp_get_conversation_response)
+app.register_functions(bp_get_indexer_status)
@@ -0,0 +1,40 @@
+import os
+import json
+import logging
+import azure.functions as func
+from azure.core.exceptions import ResourceNotFoundError
+from utilities.helpers.env_helper import EnvHelper
+from utilities.integrated_vectorization.azure_search_indexer import AzureSearchIndexer
+
+bp_get_indexer_status = func.Blueprint()
+logger = logging.getLogger(__name__)
+logger.setLevel(level=os.environ.get("LOGLEVEL", "INFO").upper())
+
+
+@bp_get_indexer_status.route(route="IndexerStatus", methods=["GET"])
+def get_indexer_status(req: func.HttpRequest) -> func.HttpResponse:
+    env_helper: EnvHelper = EnvHelper()
+    if not env_helper.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION:
+        return func.HttpResponse(
+            "Integrated vectorization is not enabled", status_code=404
+        )
+
+    try:
+        status = AzureSearchIndexer(env_helper).get_indexer_status(
+            env_helper.AZURE_SEARCH_INDEXER_NAME
+        )
+    except ResourceNotFoundError:
+        return func.HttpResponse(
+            "The indexer is created when the first document is uploaded",
+            status_code=404,
+        )
+    except Exception:
+        logger.exception("Error while getting the status of the indexer")
+        return func.HttpResponse(
+            "Unexpected error occurred while getting the status of the indexer",
+            status_code=500,
+        )
+
+    return func.HttpResponse(
+        json.dumps(status), mimetype="application/json", status_code=200
+    )
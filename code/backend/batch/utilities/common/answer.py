@@ -1,4 +1,5 @@
 import json
+import orjson
 from typing import List, Optional
 from .source_document import SourceDocument
 
@@ -11,12 +12,14 @@ class Answer:
         source_documents: List[SourceDocument] = [],
         prompt_tokens: Optional[int] = 0,
         completion_tokens: Optional[int] = 0,
+        cached_prompt_tokens: Optional[int] = 0,
     ):
         self.question = question
         self.answer = answer
         self.source_documents = source_documents
         self.prompt_tokens = prompt_tokens
         self.completion_tokens = completion_tokens
+        self.cached_prompt_tokens = cached_prompt_tokens
 
     def __eq__(self, value: object) -> bool:
         if not isinstance(value, Answer):
@@ -28,38 +31,53 @@ class Answer:
             and self.source_documents == value.source_documents
             and self.prompt_tokens == value.prompt_tokens
             and self.completion_tokens == value.completion_tokens
+            and self.cached_prompt_tokens == value.cached_prompt_tokens
         )
 
+    def to_dict(self) -> dict:
+        return {
+            "question": self.question,
+            "answer": self.answer,
+            "source_documents": [doc.to_dict() for doc in self.source_documents],
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_prompt_tokens": self.cached_prompt_tokens,
+        }
+
     def to_json(self):
-        return json.dumps(self, cls=AnswerEncoder)
+        return orjson.dumps(self.to_dict()).decode("utf-8")
+
+    @classmethod
+    def from_dict(cls, obj: dict) -> "Answer":
+        return cls(
+            question=obj["question"],
+            answer=obj["answer"],
+            source_documents=[
+                # source documents used to be serialized as nested JSON strings
+                (
+                    SourceDocument.from_json(doc)
+                    if isinstance(doc, str)
+                    else SourceDocument.from_dict(doc)
+                )
+                for doc in obj["source_documents"]
+            ],
+            prompt_tokens=obj["prompt_tokens"],
+            completion_tokens=obj["completion_tokens"],
+            cached_prompt_tokens=obj.get("cached_prompt_tokens", 0),
+        )
 
     @classmethod
     def from_json(cls, json_string):
-        return json.loads(json_string, cls=AnswerDecoder)
+        return cls.from_dict(orjson.loads(json_string))
 
 
 class AnswerEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, Answer):
-            return {
-                "question": obj.question,
-                "answer": obj.answer,
-                "source_documents": [doc.to_json() for doc in obj.source_documents],
-                "prompt_tokens": obj.prompt_tokens,
-                "completion_tokens": obj.completion_tokens,
-            }
+            return obj.to_dict()
         return super().default(obj)
 
 
 class AnswerDecoder(json.JSONDecoder):
     def decode(self, s, **kwargs):
-        obj = super().decode(s, **kwargs)
-        return Answer(
-            question=obj["question"],
-            answer=obj["answer"],
-            source_documents=[
-                SourceDocument.from_json(doc) for doc in obj["source_documents"]
-            ],
-            prompt_tokens=obj["prompt_tokens"],
-            completion_tokens=obj["completion_tokens"],
-        )
+        return Answer.from_dict(super().decode(s, **kwargs))
@@ -0,0 +1,107 @@
+import json
+from typing import AsyncIterator, List, Optional
+
+# stands for the content of the streamed message when serializing the response object
+_CONTENT_PLACEHOLDER = "\x00content\x00"
+
+
+def merge_message_deltas(deltas: List[dict]) -> List[dict]:
+    """
+    Rebuild the messages from a stream of message deltas.
+
+    Consecutive deltas with the same role belong to the same message: their contents are
+    concatenated and the message takes the end_turn of its last delta.
+    """
+    messages: List[dict] = []
+    for delta in deltas:
+        if messages and messages[-1]["role"] == delta["role"]:
+            messages[-1]["content"] += delta.get("content") or ""
+            messages[-1]["end_turn"] = delta.get("end_turn", False)
+        else:
+            messages.append(
+                {
+                    "role": delta["role"],
+                    "content": delta.get("content") or "",
+                    "end_turn": delta.get("end_turn", False),
+                }
+            )
+    return messages
+
+
+async def serialize_full_responses(
+    deltas: AsyncIterator[dict], response_obj: dict
+) -> AsyncIterator[str]:
+    """
+    Serialize message deltas as JSON lines, each line holding the full response object
+    with all the messages received so far.
+
+    The response object is only serialized when a message starts or ends; for every other
+    delta only the new content is JSON-escaped and spliced into the previous line.
+    """
+    messages: List[dict] = []
+    prefix: Optional[str] = None
+    suffix = ""
+    content_parts: List[str] = []
+    escaped_content = ""
+
+    async for delta in deltas:
+        content = delta.get("content") or ""
+        if not messages or messages[-1]["role"] != delta["role"]:
+            if messages:
+                messages[-1]["content"] = "".join(content_parts)
+            messages.append({"role": delta["role"], "content": "", "end_turn": False})
+            content_parts = []
+            escaped_content = ""
+            prefix = None
+        content_parts.append(content)
+
+        end_turn = delta.get("end_turn", False)
+        if prefix is None or messages[-1]["end_turn"] != end_turn:
+            messages[-1]["end_turn"] = end_turn
+            messages[-1]["content"] = _CONTENT_PLACEHOLDER
+            prefix, _, suffix = json.dumps(
+                {**response_obj, "choices": [{"messages": messages}]},
+                ensure_ascii=False,
+            ).rpartition(json.dumps(_CONTENT_PLACEHOLDER)[1:-1])
+
+        # JSON escaping is per character, so escaped chunks can be concatenated
+        escaped_content += json.dumps(content, ensure_ascii=False)[1:-1]
+
+        yield prefix + escaped_content + suffix + "\n"
+
+
+async def serialize_deltas(
+    deltas: AsyncIterator[dict], response_obj: dict
+) -> AsyncIterator[str]:
+    """
+    Serialize message deltas as JSON lines using the delta protocol: the response object
+    is sent with the messages preceding the answer (e.g. the citations), then every line
+    only carries the new content of the answer, {"delta": "..."}, and the stream ends
+    with {"end_turn": true}.
+    """
+    messages: List[dict] = []
+    header_sent = False
+
+    async for delta in deltas:
+        if delta["role"] != "assistant":
+            messages.append(
+                {
+                    "role": delta["role"],
+                    "content": delta.get("content") or "",
+                    "end_turn": delta.get("end_turn", False),
+                }
+            )
+            continue
+
+        if not header_sent:
+            messages.append({"role": "assistant", "content": "", "end_turn": False})
+            yield json.dumps(
+                {**response_obj, "choices": [{"messages": messages}]},
+                ensure_ascii=False,
+            ) + "\n"
+            header_sent = True
+
+        if delta.get("content"):
+            yield json.dumps({"delta": delta["content"]}, ensure_ascii=False) + "\n"
+        if delta.get("end_turn"):
+            yield json.dumps({"end_turn": True}) + "\n"
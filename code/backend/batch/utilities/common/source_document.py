@@ -1,11 +1,26 @@
 from typing import Optional, Type
 import hashlib
 import json
+import orjson
 from urllib.parse import urlparse, quote
 from ..helpers.azure_blob_storage_client import AzureBlobStorageClient
 
 
 class SourceDocument:
+    __slots__ = (
+        "id",
+        "content",
+        "source",
+        "title",
+        "chunk",
+        "offset",
+        "page_number",
+        "chunk_id",
+        # derived from the source, computed on first use: (source, value)
+        "_filename_cache",
+        "_quoted_source_cache",
+    )
+
     def __init__(
         self,
         content: str,
@@ -25,6 +40,8 @@ class SourceDocument:
         self.offset = offset
         self.page_number = page_number
         self.chunk_id = chunk_id
+        self._filename_cache = None
+        self._quoted_source_cache = None
 
     def __str__(self):
         return f"SourceDocument(id={self.id}, title={self.title}, source={self.source}, chunk={self.chunk}, offset={self.offset}, page_number={self.page_number}, chunk_id={self.chunk_id})"
@@ -43,12 +60,24 @@ class SourceDocument:
             )
         return False
 
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "content": self.content,
+            "source": self.source,
+            "title": self.title,
+            "chunk": self.chunk,
+            "offset": self.offset,
+            "page_number": self.page_number,
+            "chunk_id": self.chunk_id,
+        }
+
     def to_json(self):
-        return json.dumps(self, cls=SourceDocumentEncoder)
+        return orjson.dumps(self.to_dict()).decode("utf-8")
 
     @classmethod
     def from_json(cls, json_string):
-        return json.loads(json_string, cls=SourceDocumentDecoder)
+        return cls.from_dict(orjson.loads(json_string))
 
     @classmethod
     def from_dict(cls, dict_obj):
@@ -100,18 +129,27 @@ class SourceDocument:
             chunk_id=metadata.get("chunk_id"),
         )
 
+    def _get_filenames(self) -> tuple[str, str]:
+        if self._filename_cache is None or self._filename_cache[0] != self.source:
+            filename = (
+                self.source.replace("_SAS_TOKEN_PLACEHOLDER_", "")
+                .replace("http://", "")
+                .split("/")[-1]
+            )
+            self._filename_cache = (self.source, (filename, filename.split(".")[0]))
+        return self._filename_cache[1]
+
     def get_filename(self, include_path=False):
-        filename = self.source.replace("_SAS_TOKEN_PLACEHOLDER_", "").replace(
-            "http://", ""
-        )
-        if include_path:
-            filename = filename.split("/")[-1]
-        else:
-            filename = filename.split("/")[-1].split(".")[0]
-        return filename
+        filename_with_extension, filename = self._get_filenames()
+        return filename_with_extension if include_path else filename
 
     def get_markdown_url(self):
-        url = quote(self.source, safe=":/")
+        if (
+            self._quoted_source_cache is None
+            or self._quoted_source_cache[0] != self.source
+        ):
+            self._quoted_source_cache = (self.source, quote(self.source, safe=":/"))
+        url = self._quoted_source_cache[1]
         if "_SAS_TOKEN_PLACEHOLDER_" in url:
             blob_client = AzureBlobStorageClient()
             container_sas = blob_client.get_container_sas()
@@ -122,16 +160,7 @@ class SourceDocument:
 class SourceDocumentEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, SourceDocument):
-            return {
-                "id": obj.id,
-                "content": obj.content,
-                "source": obj.source,
-                "title": obj.title,
-                "chunk": obj.chunk,
-                "offset": obj.offset,
-                "page_number": obj.page_number,
-                "chunk_id": obj.chunk_id,
-            }
+            return obj.to_dict()
         return super().default(obj)
 
 
@@ -1,30 +1,72 @@
 from typing import List
 import re
+from bs4 import BeautifulSoup
 from langchain_community.document_loaders import WebBaseLoader
 from .document_loading_base import DocumentLoadingBase
 from ..common.source_document import SourceDocument
 
+# Removed from the text: the control characters but the line feed, and the half
+# non-ascii characters found at the start/end of the content
+_REMOVED_CHARACTERS = re.compile(
+    r"[\x00-\x09\x0b-\x1f\x7f\u0080-\u00a0\u2000-\u3000\ufff0-\uffff]+"
+)
+# The same for ASCII text, which str.translate removes several times faster than the
+# regular expression, but slower when the text is not ASCII
+_REMOVED_ASCII_CHARACTERS = str.maketrans(
+    dict.fromkeys([*range(0x00, 0x0A), *range(0x0B, 0x20), 0x7F])
+)
+# More than one blank line, once the characters above are removed
+_BLANK_LINES = re.compile(r"\n(?: *\n){2,}")
+# Elements of the page which are not part of its content
+_BOILERPLATE_TAGS = [
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "nav",
+    "footer",
+    "aside",
+]
+_BOILERPLATE_ROLES = ["navigation", "contentinfo"]
+
 
 class WebDocumentLoading(DocumentLoadingBase):
     def __init__(self) -> None:
         super().__init__()
 
     def load(self, document_url: str) -> List[SourceDocument]:
-        documents = WebBaseLoader(document_url).load()
-        for document in documents:
-            document.page_content = re.sub("\n{3,}", "\n\n", document.page_content)
-            # Remove half non-ascii character from start/end of doc content
-            pattern = re.compile(
-                r"[\x00-\x1f\x7f\u0080-\u00a0\u2000-\u3000\ufff0-\uffff]"
-            )
-            document.page_content = re.sub(pattern, "", document.page_content)
-            if document.page_content == "":
-                documents.remove(document)
-        source_documents: List[SourceDocument] = [
-            SourceDocument(
-                content=document.page_content,
-                source=document.metadata["source"],
-            )
-            for document in documents
-        ]
-        return source_documents
+        return self._to_source_documents(
+            document_url, WebBaseLoader(document_url).scrape()
+        )
+
+    def load_content(self, document_url: str, content: bytes) -> List[SourceDocument]:
+        """Loads the already fetched content of the page, as load does."""
+        return self._to_source_documents(
+            document_url, BeautifulSoup(content, "html.parser")
+        )
+
+    @staticmethod
+    def get_text(parsed_data: BeautifulSoup) -> str:
+        """
+        Returns the text of the page without its boilerplate (scripts, navigation,
+        footer...), the removed characters and the extra blank lines. Removes the
+        boilerplate from parsed_data.
+        """
+        for element in parsed_data(_BOILERPLATE_TAGS):
+            element.decompose()
+        for element in parsed_data.find_all(role=_BOILERPLATE_ROLES):
+            element.decompose()
+        text = parsed_data.get_text()
+        if text.isascii():
+            text = text.translate(_REMOVED_ASCII_CHARACTERS)
+        else:
+            text = _REMOVED_CHARACTERS.sub("", text)
+        return _BLANK_LINES.sub("\n\n", text).strip()
+
+    def _to_source_documents(
+        self, document_url: str, parsed_data: BeautifulSoup
+    ) -> List[SourceDocument]:
+        content = self.get_text(parsed_data)
+        if not content:
+            return []
+        return [SourceDocument(content=content, source=document_url)]
@@ -1,5 +1,8 @@
+import logging
 import mimetypes
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, NamedTuple, Optional
 from datetime import datetime, timedelta
 from azure.storage.blob import (
     BlobServiceClient,
@@ -8,12 +11,20 @@ from azure.storage.blob import (
     ContentSettings,
     UserDelegationKey,
 )
+from azure.core import MatchConditions
 from azure.core.credentials import AzureNamedKeyCredential
+from azure.core.exceptions import (
+    ResourceExistsError,
+    ResourceModifiedError,
+    ResourceNotFoundError,
+)
 from azure.storage.queue import QueueClient, BinaryBase64EncodePolicy
 import chardet
 from .env_helper import EnvHelper
 from azure.identity import DefaultAzureCredential
 
+logger = logging.getLogger(__name__)
+
 
 def connection_string(account_name: str, account_key: str):
     return f"DefaultEndpointsProtocol=https;AccountName={account_name};AccountKey={account_key};EndpointSuffix=core.windows.net"
@@ -39,7 +50,19 @@ def create_queue_client():
         )
 
 
+class FilePage(NamedTuple):
+    files: list[dict]
+    # token to list the next page from, None after the last page
+    continuation_token: Optional[str]
+
+
 class AzureBlobStorageClient:
+    _CONVERTED_PREFIX = "converted/"
+    _METADATA_UPDATE_ATTEMPTS = 5
+    # seconds, the shortest lease, held while upserting the container metadata
+    _CONTAINER_LEASE_DURATION = 15
+    _CONTAINER_LEASE_RETRY_DELAY = 0.2
+
     def __init__(
         self,
         account_name: Optional[str] = None,
@@ -175,69 +198,204 @@ class AzureBlobStorageClient:
             self.delete_file(filename)
 
     def get_all_files(self):
-        # Get all files in the container from Azure Blob Storage
+        return list(self.iter_files())
+
+    def iter_files(
+        self,
+        prefix: Optional[str] = None,
+        include_metadata: bool = True,
+        page_size: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """
+        Lists the files of the container page by page, without the converted files.
+        With include_metadata False, only the names of the files are listed, without
+        their conversion state and urls.
+        """
+        for page in self.iter_file_pages(
+            prefix=prefix, include_metadata=include_metadata, page_size=page_size
+        ):
+            yield from page.files
+
+    def iter_file_pages(
+        self,
+        prefix: Optional[str] = None,
+        include_metadata: bool = True,
+        page_size: Optional[int] = None,
+        continuation_token: Optional[str] = None,
+    ) -> Iterator[FilePage]:
+        """
+        Lists the files of the container as pages of at most page_size files, starting
+        from the page of continuation_token. See iter_files.
+        """
         container_client = self.blob_service_client.get_container_client(
             self.container_name
         )
-        blob_list = container_client.list_blobs(include="metadata")
-        # sas = generate_blob_sas(account_name, container_name, blob.name,account_key=account_key,  permission="r", expiry=datetime.utcnow() + timedelta(hours=3))
-        sas = generate_container_sas(
-            self.account_name,
-            self.container_name,
-            user_delegation_key=self.user_delegation_key,
-            account_key=self.account_key,
-            permission="r",
-            expiry=datetime.utcnow() + timedelta(hours=3),
-        )
-        files = []
-        converted_files = {}
-        for blob in blob_list:
-            if not blob.name.startswith("converted/"):
-                files.append(
-                    {
-                        "filename": blob.name,
-                        "converted": (
-                            blob.metadata.get("converted", "false") == "true"
-                            if blob.metadata
-                            else False
-                        ),
-                        "embeddings_added": (
-                            blob.metadata.get("embeddings_added", "false") == "true"
-                            if blob.metadata
-                            else False
-                        ),
-                        "fullpath": f"{self.endpoint}{self.container_name}/{blob.name}?{sas}",
-                        "converted_filename": (
-                            blob.metadata.get("converted_filename", "")
-                            if blob.metadata
-                            else ""
-                        ),
-                        "converted_path": "",
-                    }
+        if include_metadata:
+            sas = generate_container_sas(
+                self.account_name,
+                self.container_name,
+                user_delegation_key=self.user_delegation_key,
+                account_key=self.account_key,
+                permission="r",
+                expiry=datetime.utcnow() + timedelta(hours=3),
+            )
+            # only the names of the converted files are kept, to tell which files
+            # were converted
+            converted_files = {
+                name
+                for name in container_client.list_blob_names(
+                    name_starts_with=self._CONVERTED_PREFIX
                 )
-            else:
-                converted_files[blob.name] = (
-                    f"{self.endpoint}{self.container_name}/{blob.name}?{sas}"
+            }
+
+        pages = container_client.list_blobs(
+            name_starts_with=prefix,
+            include=["metadata"] if include_metadata else None,
+            results_per_page=page_size,
+        ).by_page(continuation_token=continuation_token)
+        for page in pages:
+            files = [
+                (
+                    self._to_file(blob, sas, converted_files)
+                    if include_metadata
+                    else {"filename": blob.name}
                 )
+                for blob in page
+                if not blob.name.startswith(self._CONVERTED_PREFIX)
+            ]
+            yield FilePage(files, pages.continuation_token)
 
-        for file in files:
-            converted_filename = file.pop("converted_filename", "")
-            if converted_filename in converted_files:
-                file["converted"] = True
-                file["converted_path"] = converted_files[converted_filename]
+    def _to_file(self, blob, sas: str, converted_files: set[str]) -> dict:
+        metadata = blob.metadata or {}
+        converted_filename = metadata.get("converted_filename", "")
+        converted = converted_filename in converted_files
+        return {
+            "filename": blob.name,
+            "converted": converted or metadata.get("converted", "false") == "true",
+            "embeddings_added": metadata.get("embeddings_added", "false") == "true",
+            "fullpath": f"{self.endpoint}{self.container_name}/{blob.name}?{sas}",
+            "converted_path": (
+                f"{self.endpoint}{self.container_name}/{converted_filename}?{sas}"
+                if converted
+                else ""
+            ),
+        }
 
-        return files
+    def get_blob_metadata(self, file_name) -> Optional[dict[str, str]]:
+        """Returns the metadata of the blob, None if it does not exist."""
+        blob_client = self.blob_service_client.get_blob_client(
+            container=self.container_name, blob=file_name
+        )
+        try:
+            return blob_client.get_blob_properties().metadata
+        except ResourceNotFoundError:
+            return None
 
     def upsert_blob_metadata(self, file_name, metadata):
         blob_client = self.blob_service_client.get_blob_client(
             container=self.container_name, blob=file_name
         )
-        # Read metadata from the blob
-        blob_metadata = blob_client.get_blob_properties().metadata
-        # Update metadata
-        blob_metadata.update(metadata)
-        # Add metadata to the blob
-        blob_client.set_blob_metadata(metadata=blob_metadata)
+        for attempt in range(1, self._METADATA_UPDATE_ATTEMPTS + 1):
+            # Read metadata from the blob
+            properties = blob_client.get_blob_properties()
+            blob_metadata = properties.metadata
+            if all(blob_metadata.get(key) == value for key, value in metadata.items()):
+                return
+            # Update metadata
+            blob_metadata.update(metadata)
+            # Add metadata to the blob, unless it was modified since it was read
+            try:
+                blob_client.set_blob_metadata(
+                    metadata=blob_metadata,
+                    etag=properties.etag,
+                    match_condition=MatchConditions.IfNotModified,
+                )
+                return
+            except ResourceModifiedError:
+                if attempt == self._METADATA_UPDATE_ATTEMPTS:
+                    raise
+                logger.debug(f"Metadata of {file_name} modified concurrently, retrying")
+
+    def upsert_blobs_metadata(
+        self, metadata_by_file: dict[str, dict[str, str]], max_workers: int = 10
+    ):
+        """
+        Upserts the metadata of many blobs concurrently, see upsert_blob_metadata. The
+        blobs that fail do not stop the others, a RuntimeError listing them is raised
+        once all are processed.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                file_name: executor.submit(
+                    self.upsert_blob_metadata, file_name, metadata
+                )
+                for file_name, metadata in metadata_by_file.items()
+            }
+        errors = {
+            file_name: future.exception()
+            for file_name, future in futures.items()
+            if future.exception() is not None
+        }
+        if errors:
+            raise RuntimeError(
+                f"Metadata update failed for {len(errors)} of {len(futures)} blobs: "
+                f"{', '.join(errors)}"
+            ) from next(iter(errors.values()))
+
+    def get_container_metadata(self) -> dict[str, str]:
+        container_client = self.blob_service_client.get_container_client(
+            self.container_name
+        )
+        return container_client.get_container_properties().metadata
+
+    def upsert_container_metadata(
+        self, metadata: dict[str, str], exclusive: bool = True
+    ):
+        """
+        Upserts the metadata of the container under a lease of the container, as
+        upsert_blob_metadata does with the ETag of the blob, which Set Container
+        Metadata does not support: concurrent upserts never overwrite each other.
+
+        Without exclusive, the metadata is written without taking the lease, and the
+        last writer wins, which is enough for values that are only ever replaced.
+        """
+        container_client = self.blob_service_client.get_container_client(
+            self.container_name
+        )
+        if not exclusive:
+            container_metadata = container_client.get_container_properties().metadata
+            container_metadata.update(metadata)
+            container_client.set_container_metadata(metadata=container_metadata)
+            return
+
+        for attempt in range(1, self._METADATA_UPDATE_ATTEMPTS + 1):
+            try:
+                lease = container_client.acquire_lease(
+                    lease_duration=self._CONTAINER_LEASE_DURATION
+                )
+            except ResourceExistsError:
+                if attempt == self._METADATA_UPDATE_ATTEMPTS:
+                    raise
+                logger.debug("Container metadata being updated, retrying")
+                time.sleep(self._CONTAINER_LEASE_RETRY_DELAY * attempt)
+                continue
+            try:
+                # Read metadata from the container while holding the lease
+                container_metadata = container_client.get_container_properties(
+                    lease=lease
+                ).metadata
+                if all(
+                    container_metadata.get(key) == value
+                    for key, value in metadata.items()
+                ):
+                    return
+                container_metadata.update(metadata)
+                container_client.set_container_metadata(
+                    metadata=container_metadata, lease=lease
+                )
+                return
+            finally:
+                lease.release()
 
     def get_container_sas(self):
         # Generate a SAS URL to the container and return it
@@ -1,21 +1,46 @@
 import logging
+import threading
+from typing import Callable, Optional
 from urllib.parse import urljoin
 from azure.identity import DefaultAzureCredential, get_bearer_token_provider
 
 import requests
 from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .env_helper import EnvHelper
 
 logger = logging.getLogger(__name__)
 
 
+class _RetryOnThrottling(Retry):
+    """Retries throttled requests, waiting for the Retry-After of the response up to a
+    maximum, since the text vectorization is on the path of every question."""
+
+    MAX_RETRY_AFTER_SECONDS = 10
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.MAX_RETRY_AFTER_SECONDS)
+
+
 class AzureComputerVisionClient:
 
     __TOKEN_SCOPE = "https://cognitiveservices.azure.com/.default"
     __VECTORIZE_IMAGE_PATH = "computervision/retrieval:vectorizeImage"
     __VECTORIZE_TEXT_PATH = "computervision/retrieval:vectorizeText"
     __RESPONSE_VECTOR_KEY = "vector"
+    __MAX_RETRIES = 3
+    __POOL_SIZE = 10
+
+    # shared by the clients of the process: the token provider caches the token until
+    # it nears expiry, and the session keeps the connections alive
+    _token_provider: Optional[Callable[[], str]] = None
+    _session: Optional[requests.Session] = None
+    _lock = threading.Lock()
 
     def __init__(self, env_helper: EnvHelper) -> None:
         self.host = env_helper.AZURE_COMPUTER_VISION_ENDPOINT
@@ -49,18 +74,56 @@ class AzureComputerVisionClient:
         response_json = self.__get_json_body(response)
         return self.__get_vectors(response_json)
 
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            if cls._session is not None:
+                cls._session.close()
+            cls._session = None
+            cls._token_provider = None
+
+    @classmethod
+    def _get_token_provider(cls) -> Callable[[], str]:
+        with cls._lock:
+            if cls._token_provider is None:
+                cls._token_provider = get_bearer_token_provider(
+                    DefaultAzureCredential(), cls.__TOKEN_SCOPE
+                )
+            return cls._token_provider
+
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        with cls._lock:
+            if cls._session is None:
+                retry = _RetryOnThrottling(
+                    total=cls.__MAX_RETRIES,
+                    read=0,
+                    other=0,
+                    status_forcelist=[429],
+                    allowed_methods=["POST"],
+                    backoff_factor=0.5,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=cls.__POOL_SIZE,
+                    pool_maxsize=cls.__POOL_SIZE,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                cls._session = session
+            return cls._session
+
     def __make_request(self, path: str, body) -> Response:
         try:
             headers = {}
             if self.use_keys:
                 headers["Ocp-Apim-Subscription-Key"] = self.key
             else:
-                token_provider = get_bearer_token_provider(
-                    DefaultAzureCredential(), self.__TOKEN_SCOPE
-                )
-                headers["Authorization"] = "Bearer " + token_provider()
+                headers["Authorization"] = "Bearer " + self._get_token_provider()()
 
-            return requests.post(
+            return self._get_session().post(
                 url=urljoin(self.host, path),
                 params={
                     "api-version": self.api_version,
@@ -28,6 +28,13 @@ from azure.search.documents.indexes.models import (
 from ..helpers.azure_computer_vision_client import AzureComputerVisionClient
 from .llm_helper import LLMHelper
 from .env_helper import EnvHelper
+from .search_index_cache import SearchIndexCache
+from .embedding_dimensions import (
+    COMPUTER_VISION_MODEL_DIMENSIONS,
+    EMBEDDING_MODEL_DIMENSIONS,
+    get_index_field_dimensions,
+    resolve_dimensions,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -68,26 +75,52 @@ class AzureSearchHelper:
         )
 
     def get_search_client(self) -> SearchClient:
-        self.create_index()
+        if not SearchIndexCache.is_known(
+            self.env_helper.AZURE_SEARCH_SERVICE, self.env_helper.AZURE_SEARCH_INDEX
+        ):
+            self.create_index()
         return self.search_client
 
     @property
     def search_dimensions(self) -> int:
         if AzureSearchHelper._search_dimension is None:
-            AzureSearchHelper._search_dimension = len(
-                self.llm_helper.get_embedding_model().embed_query("Text")
+            AzureSearchHelper._search_dimension = resolve_dimensions(
+                "text",
+                self.env_helper.AZURE_SEARCH_DIMENSIONS,
+                EMBEDDING_MODEL_DIMENSIONS.get(
+                    self.env_helper.AZURE_OPENAI_EMBEDDING_MODEL_NAME
+                ),
+                lambda: get_index_field_dimensions(
+                    self.search_index_client,
+                    self.env_helper.AZURE_SEARCH_INDEX,
+                    self.env_helper.AZURE_SEARCH_CONTENT_VECTOR_COLUMN,
+                ),
+                lambda: len(self.llm_helper.get_embedding_model().embed_query("Text")),
             )
         return AzureSearchHelper._search_dimension
 
     @property
     def image_search_dimensions(self) -> int:
         if AzureSearchHelper._image_search_dimension is None:
-            AzureSearchHelper._image_search_dimension = len(
-                self.azure_computer_vision_client.vectorize_text("Text")
+            AzureSearchHelper._image_search_dimension = resolve_dimensions(
+                "image",
+                "",
+                COMPUTER_VISION_MODEL_DIMENSIONS.get(
+                    self.env_helper.AZURE_COMPUTER_VISION_VECTORIZE_IMAGE_MODEL_VERSION
+                ),
+                lambda: get_index_field_dimensions(
+                    self.search_index_client,
+                    self.env_helper.AZURE_SEARCH_INDEX,
+                    "image_vector",
+                ),
+                lambda: len(self.azure_computer_vision_client.vectorize_text("Text")),
             )
         return AzureSearchHelper._image_search_dimension
 
     def create_index(self):
+        if not self._index_not_exists(self.env_helper.AZURE_SEARCH_INDEX):
+            return
+
         fields = [
             SimpleField(
                 name=self.env_helper.AZURE_SEARCH_FIELDS_ID,
@@ -195,16 +228,21 @@ class AzureSearchHelper:
             ),
         )
 
-        if self._index_not_exists(self.env_helper.AZURE_SEARCH_INDEX):
-            logger.info(
-                f"Creating or updating index {self.env_helper.AZURE_SEARCH_INDEX}"
-            )
-            self.search_index_client.create_index(index)
+        logger.info(f"Creating or updating index {self.env_helper.AZURE_SEARCH_INDEX}")
+        self.search_index_client.create_index(index)
+        SearchIndexCache.mark_exists(
+            self.env_helper.AZURE_SEARCH_SERVICE,
+            self.env_helper.AZURE_SEARCH_INDEX,
+            self.env_helper.AZURE_SEARCH_INDEX_CACHE_TTL,
+        )
 
     def _index_not_exists(self, index_name: str) -> bool:
-        return index_name not in [
-            name for name in self.search_index_client.list_index_names()
-        ]
+        return not SearchIndexCache.index_exists(
+            self.env_helper.AZURE_SEARCH_SERVICE,
+            index_name,
+            lambda: list(self.search_index_client.list_index_names()),
+            self.env_helper.AZURE_SEARCH_INDEX_CACHE_TTL,
+        )
 
     def get_conversation_logger(self):
         fields = [
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import tiktoken
+
+from .env_helper import EnvHelper
+from .llm_helper import LLMHelper
+
+logger = logging.getLogger(__name__)
+
+
+class ChatHistoryCompactor:
+    """
+    Keeps the chat history sent to the LLM within a token budget.
+
+    The most recent messages are kept verbatim while they fit in the budget; older
+    messages are replaced by a rolling summary which is cached per conversation_id, so
+    each turn only summarizes the messages that fell out of the window since the last one.
+    The summary is a user and assistant exchange, the roles every orchestrator keeps from
+    the chat history.
+    """
+
+    _ENCODER_NAME = "cl100k_base"
+    # fixed overhead of the chat format for every message
+    _TOKENS_PER_MESSAGE = 4
+    _MAX_CACHED_CONVERSATIONS = 1000
+    SUMMARY_REQUEST = "Summarize our earlier conversation."
+
+    # conversation_id -> (number of summarized messages, digest of those messages, summary)
+    _summaries: "OrderedDict[str, tuple[int, str, str]]" = OrderedDict()
+    _lock = threading.Lock()
+
+    def __init__(self, max_tokens: Optional[int] = None) -> None:
+        self.max_tokens = (
+            EnvHelper().CHAT_HISTORY_MAX_TOKENS if max_tokens is None else max_tokens
+        )
+        self.summary_max_words = max(self.max_tokens // 8, 50)
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def count_tokens(self, message: dict) -> int:
+        encoding = tiktoken.get_encoding(self._ENCODER_NAME)
+        content = message.get("content") or ""
+        if not isinstance(content, str):
+            content = json.dumps(content)
+        return len(encoding.encode(content)) + self._TOKENS_PER_MESSAGE
+
+    def compact(
+        self, chat_history: List[dict], conversation_id: Optional[str] = None
+    ) -> List[dict]:
+        if self.max_tokens <= 0 or not chat_history:
+            return chat_history
+
+        token_counts = [self.count_tokens(message) for message in chat_history]
+        if sum(token_counts) <= self.max_tokens:
+            return chat_history
+
+        # leave room for the summary exchange in the budget
+        budget = max(
+            self.max_tokens
+            - self.count_tokens({"content": self.SUMMARY_REQUEST})
+            - self.summary_max_words * 2,
+            0,
+        )
+        # the latest turn, from the last user message, is kept verbatim whatever its size
+        latest_turn = next(
+            (
+                i
+                for i in range(len(chat_history) - 1, -1, -1)
+                if chat_history[i].get("role") == "user"
+            ),
+            len(chat_history) - 1,
+        )
+        kept_tokens = 0
+        split = len(chat_history)
+        while split > 0 and (
+            split > latest_turn or kept_tokens + token_counts[split - 1] <= budget
+        ):
+            split -= 1
+            kept_tokens += token_counts[split]
+
+        if split == 0:
+            return chat_history
+
+        summary = self.get_summary(chat_history[:split], conversation_id)
+        logger.info(
+            f"Compacted {split} chat history messages into a summary, keeping {len(chat_history) - split} recent messages"
+        )
+
+        return [
+            {"role": "user", "content": self.SUMMARY_REQUEST},
+            {"role": "assistant", "content": summary},
+            *chat_history[split:],
+        ]
+
+    def get_summary(self, messages: List[dict], conversation_id: Optional[str]) -> str:
+        previous_summary = ""
+        summarized_count = 0
+
+        if conversation_id:
+            with self._lock:
+                cached = self._summaries.get(conversation_id)
+            if cached:
+                count, digest, summary = cached
+                if count <= len(messages) and digest == self._digest(messages[:count]):
+                    previous_summary, summarized_count = summary, count
+
+        if summarized_count == len(messages):
+            return previous_summary
+
+        summary = self.summarize(previous_summary, messages[summarized_count:])
+
+        if conversation_id:
+            with self._lock:
+                self._summaries[conversation_id] = (
+                    len(messages),
+                    self._digest(messages),
+                    summary,
+                )
+                self._summaries.move_to_end(conversation_id)
+                while len(self._summaries) > self._MAX_CACHED_CONVERSATIONS:
+                    self._summaries.popitem(last=False)
+
+        return summary
+
+    def summarize(self, previous_summary: str, messages: List[dict]) -> str:
+        llm_helper = LLMHelper()
+
+        transcript = "\n".join(
+            f"{message['role']}: {message['content']}" for message in messages
+        )
+        system_message = f"""You summarize conversations between a user and an AI assistant.
+        Update the summary with the new messages, keeping the facts, names, numbers and open questions needed to continue the conversation.
+        Answer with the summary only, in at most {self.summary_max_words} words, in the language of the conversation."""
+
+        result = llm_helper.get_chat_completion(
+            [
+                {"role": "system", "content": system_message},
+                {
+                    "role": "user",
+                    "content": f"SUMMARY:\n{previous_summary}\n\nNEW MESSAGES:\n{transcript}",
+                },
+            ],
+            temperature=0,
+        )
+
+        self.prompt_tokens += result.usage.prompt_tokens
+        self.completion_tokens += result.usage.completion_tokens
+
+        return result.choices[0].message.content
+
+    @staticmethod
+    def _digest(messages: List[dict]) -> str:
+        return hashlib.sha256(
+            json.dumps(
+                [[message["role"], message["content"]] for message in messages]
+            ).encode("utf-8")
+        ).hexdigest()
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._lock:
+            cls._summaries.clear()
@@ -1,6 +1,15 @@
+import hashlib
+import json
+import threading
+from typing import Optional
+
+from azure.core.exceptions import ResourceNotFoundError
+
 from .embedder_base import EmbedderBase
+from ..azure_blob_storage_client import AzureBlobStorageClient
 from ..env_helper import EnvHelper
 from ..llm_helper import LLMHelper
+from ..search_index_cache import SearchIndexCache
 from ...integrated_vectorization.azure_search_index import AzureSearchIndex
 from ...integrated_vectorization.azure_search_indexer import AzureSearchIndexer
 from ...integrated_vectorization.azure_search_datasource import AzureSearchDatasource
@@ -10,14 +19,113 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# metadata of the documents container holding the fingerprint of the reconciled resources
+FINGERPRINT_METADATA_KEY = "integrated_vectorization_fingerprint"
+
 
 class IntegratedVectorizationEmbedder(EmbedderBase):
-    def __init__(self, env_helper: EnvHelper):
+    # fingerprint of the resources last reconciled or found up to date by this process
+    _reconciled_fingerprint: Optional[str] = None
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        env_helper: EnvHelper,
+        blob_client: Optional[AzureBlobStorageClient] = None,
+    ):
         self.env_helper = env_helper
         self.llm_helper: LLMHelper = LLMHelper()
+        self.blob_client = blob_client
 
     def embed_file(self, source_url: str, file_name: str = None):
-        self.process_using_integrated_vectorization(source_url=source_url)
+        if self.reconcile(source_url):
+            # the indexer was created or updated, which runs it
+            return
+        # the indexer only has to pick up the new or changed documents
+        search_indexer = AzureSearchIndexer(self.env_helper)
+        try:
+            search_indexer.request_run(
+                self.env_helper.AZURE_SEARCH_INDEXER_NAME,
+                self.env_helper.AZURE_SEARCH_INDEXER_RUN_WINDOW,
+            )
+        except ResourceNotFoundError:
+            logger.warning("Indexer not found, recreating the search resources")
+            SearchIndexCache.invalidate(
+                self.env_helper.AZURE_SEARCH_SERVICE, self.env_helper.AZURE_SEARCH_INDEX
+            )
+            self.reconcile(source_url, force=True)
+
+    def reconcile(self, source_url: str = "all", force: bool = False) -> bool:
+        """
+        Creates or updates the datasource, index, skillset and indexer when their
+        definitions changed since they were last reconciled, compared by a fingerprint
+        stored in the metadata of the documents container, or when forced. Returns
+        whether they were.
+        """
+        fingerprint = self.get_fingerprint()
+        with self._lock:
+            if (
+                not force
+                and fingerprint
+                == IntegratedVectorizationEmbedder._reconciled_fingerprint
+            ):
+                return False
+
+        blob_client = self._get_blob_client()
+        stored_fingerprint = None
+        if not force:
+            try:
+                stored_fingerprint = blob_client.get_container_metadata().get(
+                    FINGERPRINT_METADATA_KEY
+                )
+            except Exception:
+                logger.warning(
+                    "Failed to read the integrated vectorization fingerprint",
+                    exc_info=True,
+                )
+
+        reconciled = stored_fingerprint != fingerprint
+        if reconciled:
+            self.process_using_integrated_vectorization(source_url=source_url)
+            try:
+                blob_client.upsert_container_metadata(
+                    {FINGERPRINT_METADATA_KEY: fingerprint}
+                )
+            except Exception:
+                # the resources are reconciled again on the next file
+                logger.warning(
+                    "Failed to store the integrated vectorization fingerprint",
+                    exc_info=True,
+                )
+
+        with self._lock:
+            IntegratedVectorizationEmbedder._reconciled_fingerprint = fingerprint
+        return reconciled
+
+    def get_fingerprint(self) -> str:
+        config = ConfigHelper.get_active_config_or_default()
+        skillset = AzureSearchSkillset(
+            self.env_helper, config.integrated_vectorization_config
+        ).get_skillset()
+        definitions = [
+            AzureSearchDatasource(self.env_helper).get_datasource(),
+            AzureSearchIndex(self.env_helper, self.llm_helper).get_index(),
+            skillset,
+            AzureSearchIndexer(self.env_helper).get_indexer(
+                self.env_helper.AZURE_SEARCH_INDEXER_NAME, skillset_name=skillset.name
+            ),
+        ]
+        serialized = json.dumps(
+            [definition.serialize() for definition in definitions],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._reconciled_fingerprint = None
 
     def process_using_integrated_vectorization(self, source_url: str):
         config = ConfigHelper.get_active_config_or_default()
@@ -45,4 +153,9 @@ class IntegratedVectorizationEmbedder(EmbedderBase):
         if search_indexer.indexer_exists(self.env_helper.AZURE_SEARCH_INDEXER_NAME):
             search_indexer.run_indexer(self.env_helper.AZURE_SEARCH_INDEXER_NAME)
         else:
-            self.process_using_integrated_vectorization(source_url="all")
+            self.reconcile(force=True)
+
+    def _get_blob_client(self) -> AzureBlobStorageClient:
+        if self.blob_client is None:
+            self.blob_client = AzureBlobStorageClient()
+        return self.blob_client
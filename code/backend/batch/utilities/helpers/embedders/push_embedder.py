@@ -1,7 +1,8 @@
 import hashlib
 import json
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 from ...helpers.llm_helper import LLMHelper
@@ -15,9 +16,12 @@ from ..config.config_helper import ConfigHelper
 
 from .embedder_base import EmbedderBase
 from ..azure_search_helper import AzureSearchHelper
+from ..search_index_cache import SearchIndexCache
 from ..document_loading_helper import DocumentLoading
 from ..document_chunking_helper import DocumentChunking
+from ..url_fetcher import ETAG_METADATA_KEY, LAST_MODIFIED_METADATA_KEY
 from ...common.source_document import SourceDocument
+from ...document_loading.web import WebDocumentLoading
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +42,13 @@ class PushEmbedder(EmbedderBase):
             self.embedding_configs[ext] = processor
 
     def embed_file(self, source_url: str, file_name: str):
+        if self.__embed_file(source_url, file_name):
+            self.blob_client.upsert_blob_metadata(
+                file_name, {"embeddings_added": "true"}
+            )
+
+    def __embed_file(self, source_url: str, file_name: str) -> bool:
+        """Embeds the file, returns whether it is a blob to mark as embedded."""
         file_extension = file_name.split(".")[-1].lower()
         embedding_config = self.embedding_configs.get(file_extension)
         self.__embed(
@@ -45,10 +56,89 @@ class PushEmbedder(EmbedderBase):
             file_extension=file_extension,
             embedding_config=embedding_config,
         )
-        if file_extension != "url":
-            self.blob_client.upsert_blob_metadata(
-                file_name, {"embeddings_added": "true"}
+        return file_extension != "url"
+
+    def embed_files(
+        self, files: List[Tuple[str, str]], max_workers: Optional[int] = None
+    ):
+        """
+        Embeds the (source_url, file_name) files concurrently, with at most max_workers
+        (default EMBEDDING_MAX_WORKERS) files in flight. The files that fail do not stop
+        the others, a RuntimeError listing them is raised once all are processed. The
+        embedded blobs are marked at the end, in one concurrent metadata update.
+        """
+        max_workers = max_workers or self.env_helper.EMBEDDING_MAX_WORKERS
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                file_name: executor.submit(self.__embed_file, source_url, file_name)
+                for source_url, file_name in files
+            }
+        errors = {
+            file_name: future.exception()
+            for file_name, future in futures.items()
+            if future.exception() is not None
+        }
+        embedded_blobs = [
+            file_name
+            for file_name, future in futures.items()
+            if file_name not in errors and future.result()
+        ]
+        if embedded_blobs:
+            self.blob_client.upsert_blobs_metadata(
+                {
+                    file_name: {"embeddings_added": "true"}
+                    for file_name in embedded_blobs
+                }
             )
+        for file_name, error in errors.items():
+            logger.error(f"Failed to embed {file_name}: {error}")
+        if errors:
+            raise RuntimeError(
+                f"Embedding failed for {len(errors)} of {len(files)} files: "
+                f"{', '.join(errors)}"
+            ) from next(iter(errors.values()))
+
+    def embed_web_page(
+        self, url: str, content: bytes, validators: Optional[Dict[str, str]] = None
+    ):
+        """
+        Embeds the already fetched content of the web page, storing the validators it
+        was fetched with in the metadata of its chunks, see get_web_page_validators.
+        """
+        embedding_config = self.embedding_configs.get("url")
+        documents = WebDocumentLoading().load_content(url, content)
+        documents = self.document_chunking.chunk(documents, embedding_config.chunking)
+        self.__upload_documents(
+            [
+                self.__convert_to_search_document(document, validators)
+                for document in documents
+            ]
+        )
+
+    def get_web_page_validators(self, url: str) -> Dict[str, str]:
+        """
+        Returns the ETag and Last-Modified the web page was fetched with when it was
+        embedded, empty when it is not in the index.
+        """
+        source = SourceDocument.from_metadata(
+            content="", metadata={}, document_url=url, idx=0
+        ).source.replace("'", "''")
+        metadata_column = self.env_helper.AZURE_SEARCH_FIELDS_METADATA
+        with self.__invalidate_index_on_not_found():
+            results = self.azure_search_helper.get_search_client().search(
+                "*",
+                filter=f"{self.env_helper.AZURE_SEARCH_SOURCE_COLUMN} eq '{source}'",
+                select=[metadata_column],
+                top=1,
+            )
+            for result in results:
+                metadata = json.loads(result[metadata_column])
+                return {
+                    key: metadata[key]
+                    for key in (ETAG_METADATA_KEY, LAST_MODIFIED_METADATA_KEY)
+                    if metadata.get(key)
+                }
+        return {}
 
     def __embed(
         self, source_url: str, file_extension: str, embedding_config: EmbeddingConfig
@@ -59,10 +149,15 @@ class PushEmbedder(EmbedderBase):
             and file_extension
             in self.config.get_advanced_image_processing_image_types()
         ):
-            caption = self.__generate_image_caption(source_url)
-            caption_vector = self.llm_helper.generate_embeddings(caption)
-
-            image_vector = self.azure_computer_vision_client.vectorize_image(source_url)
+            # the image vector does not depend on the caption, so it is computed while
+            # the caption is generated and embedded
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                image_vector_future = executor.submit(
+                    self.azure_computer_vision_client.vectorize_image, source_url
+                )
+                caption = self.__generate_image_caption(source_url)
+                caption_vector = self.llm_helper.generate_embeddings(caption)
+                image_vector = image_vector_future.result()
             documents_to_upload.append(
                 self.__create_image_document(
                     source_url, image_vector, caption, caption_vector
@@ -79,19 +174,28 @@ class PushEmbedder(EmbedderBase):
             for document in documents:
                 documents_to_upload.append(self.__convert_to_search_document(document))
 
+        self.__upload_documents(documents_to_upload)
+
+    def __upload_documents(self, documents_to_upload: List[dict]):
         # Upload documents (which are chunks) to search index in batches
         if documents_to_upload:
             batch_size = self.env_helper.AZURE_SEARCH_DOC_UPLOAD_BATCH_SIZE
             search_client = self.azure_search_helper.get_search_client()
             for i in range(0, len(documents_to_upload), batch_size):
                 batch = documents_to_upload[i : i + batch_size]
-                response = search_client.upload_documents(batch)
+                with self.__invalidate_index_on_not_found():
+                    response = search_client.upload_documents(batch)
                 if not all(r.succeeded for r in response if response):
                     logger.error("Failed to upload documents to search index")
                     raise RuntimeError(f"Upload failed for some documents: {response}")
         else:
             logger.warning("No documents to upload.")
 
+    def __invalidate_index_on_not_found(self):
+        return SearchIndexCache.invalidate_on_not_found(
+            self.env_helper.AZURE_SEARCH_SERVICE, self.env_helper.AZURE_SEARCH_INDEX
+        )
+
     def __generate_image_caption(self, source_url):
         model = self.env_helper.AZURE_OPENAI_VISION_MODEL
         caption_system_message = """You are an assistant that generates rich descriptions of images.
@@ -118,7 +222,9 @@ If the image is mostly text, use OCR to extract the text as it is displayed in t
         caption = response.choices[0].message.content
         return caption
 
-    def __convert_to_search_document(self, document: SourceDocument):
+    def __convert_to_search_document(
+        self, document: SourceDocument, extra_metadata: Optional[dict] = None
+    ):
         embedded_content = self.llm_helper.generate_embeddings(document.content)
         metadata = {
             self.env_helper.AZURE_SEARCH_FIELDS_ID: document.id,
@@ -128,6 +234,7 @@ If the image is mostly text, use OCR to extract the text as it is displayed in t
             self.env_helper.AZURE_SEARCH_OFFSET_COLUMN: document.offset,
             "page_number": document.page_number,
             "chunk_id": document.chunk_id,
+            **(extra_metadata or {}),
         }
         return {
             self.env_helper.AZURE_SEARCH_FIELDS_ID: document.id,
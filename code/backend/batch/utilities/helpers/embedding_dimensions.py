@@ -0,0 +1,64 @@
+import logging
+from typing import Callable, Optional
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.search.documents.indexes import SearchIndexClient
+
+logger = logging.getLogger(__name__)
+
+# output size of the Azure OpenAI embedding models, by model name
+EMBEDDING_MODEL_DIMENSIONS = {
+    "text-embedding-ada-002": 1536,
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+}
+
+# output size of the Azure AI Vision multimodal embeddings, by model version
+COMPUTER_VISION_MODEL_DIMENSIONS = {
+    "2022-04-11": 1024,
+    "2023-04-15": 1024,
+}
+
+
+def get_index_field_dimensions(
+    search_index_client: SearchIndexClient, index_name: str, field_name: str
+) -> Optional[int]:
+    """Read the dimensions of a vector field from the schema of an existing index."""
+    try:
+        index = search_index_client.get_index(index_name)
+    except ResourceNotFoundError:
+        return None
+
+    for field in index.fields:
+        if field.name == field_name:
+            return field.vector_search_dimensions
+    return None
+
+
+def resolve_dimensions(
+    name: str,
+    configured: str,
+    known: Optional[int],
+    from_index: Callable[[], Optional[int]],
+    probe: Callable[[], int],
+) -> int:
+    """
+    Resolve the dimensions of an embedding, in order: the configured value, the schema
+    of the existing index, the known model table, and as a last resort a probe call
+    embedding a sample text. The existing index comes before the table, as its vector
+    field size is what uploads must match.
+    """
+    if configured:
+        try:
+            return int(configured)
+        except ValueError:
+            logger.warning(f"Ignoring invalid {name} embedding dimensions {configured}")
+
+    if dimensions := from_index():
+        return dimensions
+
+    if known:
+        return known
+
+    logger.info(f"Probing the {name} embedding dimensions with an embedding call")
+    return probe()
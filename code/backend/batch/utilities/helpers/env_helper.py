@@ -41,6 +41,12 @@ class EnvHelper:
         self.AZURE_SEARCH_USE_SEMANTIC_SEARCH = self.get_env_var_bool(
             "AZURE_SEARCH_USE_SEMANTIC_SEARCH", "False"
         )
+        self.AZURE_SEARCH_USE_LOCAL_RERANK = self.get_env_var_bool(
+            "AZURE_SEARCH_USE_LOCAL_RERANK", "False"
+        )
+        self.AZURE_SEARCH_RERANK_CANDIDATES = self.get_env_var_int(
+            "AZURE_SEARCH_RERANK_CANDIDATES", 20
+        )
         self.AZURE_SEARCH_SEMANTIC_SEARCH_CONFIG = os.getenv(
             "AZURE_SEARCH_SEMANTIC_SEARCH_CONFIG", "default"
         )
@@ -49,6 +55,17 @@ class EnvHelper:
         )
         self.AZURE_SEARCH_FILTER = os.getenv("AZURE_SEARCH_FILTER", "")
         self.AZURE_SEARCH_TOP_K = self.get_env_var_int("AZURE_SEARCH_TOP_K", 5)
+        self.AZURE_SEARCH_SOURCES_MAX_TOKENS = self.get_env_var_int(
+            "AZURE_SEARCH_SOURCES_MAX_TOKENS", 6000
+        )
+        self.AZURE_SEARCH_INDEX_CACHE_TTL = self.get_env_var_int(
+            "AZURE_SEARCH_INDEX_CACHE_TTL", 300
+        )
+        self.AZURE_SEARCH_RESULT_CACHE_TTL = self.get_env_var_int(
+            "AZURE_SEARCH_RESULT_CACHE_TTL", 60
+        )
+        # searches a snapshot of the index exported to this directory when set
+        self.LOCAL_SEARCH_INDEX_PATH = os.getenv("LOCAL_SEARCH_INDEX_PATH", "")
         self.AZURE_SEARCH_ENABLE_IN_DOMAIN = (
             os.getenv("AZURE_SEARCH_ENABLE_IN_DOMAIN", "true").lower() == "true"
         )
@@ -59,7 +76,8 @@ class EnvHelper:
         self.AZURE_SEARCH_CONTENT_VECTOR_COLUMN = os.getenv(
             "AZURE_SEARCH_CONTENT_VECTOR_COLUMN", "content_vector"
         )
-        self.AZURE_SEARCH_DIMENSIONS = os.getenv("AZURE_SEARCH_DIMENSIONS", "1536")
+        # resolved from the embedding model when not set
+        self.AZURE_SEARCH_DIMENSIONS = os.getenv("AZURE_SEARCH_DIMENSIONS", "")
         self.AZURE_SEARCH_FILENAME_COLUMN = os.getenv(
             "AZURE_SEARCH_FILENAME_COLUMN", "filepath"
         )
@@ -82,6 +100,10 @@ class EnvHelper:
         self.AZURE_SEARCH_DOC_UPLOAD_BATCH_SIZE = os.getenv(
             "AZURE_SEARCH_DOC_UPLOAD_BATCH_SIZE", 100
         )
+        self.EMBEDDING_MAX_WORKERS = self.get_env_var_int("EMBEDDING_MAX_WORKERS", 4)
+        self.URL_FETCH_MAX_PER_HOST = self.get_env_var_int("URL_FETCH_MAX_PER_HOST", 4)
+        self.CRAWL_MAX_DEPTH = self.get_env_var_int("CRAWL_MAX_DEPTH", 2)
+        self.CRAWL_MAX_PAGES = self.get_env_var_int("CRAWL_MAX_PAGES", 100)
         # Integrated Vectorization
         self.AZURE_SEARCH_DATASOURCE_NAME = os.getenv(
             "AZURE_SEARCH_DATASOURCE_NAME", ""
@@ -90,6 +112,12 @@ class EnvHelper:
         self.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION = self.get_env_var_bool(
             "AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION", "False"
         )
+        self.AZURE_SEARCH_INDEXER_RUN_WINDOW = self.get_env_var_float(
+            "AZURE_SEARCH_INDEXER_RUN_WINDOW", 30
+        )
+        self.AZURE_SEARCH_INDEXER_SCHEDULE_MINUTES = self.get_env_var_int(
+            "AZURE_SEARCH_INDEXER_SCHEDULE_MINUTES", 5
+        )
 
         self.AZURE_AUTH_TYPE = os.getenv("AZURE_AUTH_TYPE", "keys")
         # Azure OpenAI
@@ -133,15 +161,24 @@ class EnvHelper:
             self.AZURE_OPENAI_EMBEDDING_MODEL = azure_openai_embedding_model_info.get(
                 "model", ""
             )
+            self.AZURE_OPENAI_EMBEDDING_MODEL_NAME = (
+                azure_openai_embedding_model_info.get("modelName", "")
+            )
         else:
-            # Otherwise, fallback to individual environment variable
+            # Otherwise, fallback to individual environment variables
             self.AZURE_OPENAI_EMBEDDING_MODEL = os.getenv(
                 "AZURE_OPENAI_EMBEDDING_MODEL", "text-embedding-ada-002"
             )
+            self.AZURE_OPENAI_EMBEDDING_MODEL_NAME = os.getenv(
+                "AZURE_OPENAI_EMBEDDING_MODEL_NAME", ""
+            )
 
         self.SHOULD_STREAM = (
             True if self.AZURE_OPENAI_STREAM.lower() == "true" else False
         )
+        self.AZURE_OPENAI_STREAM_PROTOCOL = os.getenv(
+            "AZURE_OPENAI_STREAM_PROTOCOL", "full"
+        )
 
         self.AZURE_TOKEN_PROVIDER = get_bearer_token_provider(
             DefaultAzureCredential(), "https://cognitiveservices.azure.com/.default"
@@ -243,6 +280,13 @@ class EnvHelper:
         self.ORCHESTRATION_STRATEGY = os.getenv(
             "ORCHESTRATION_STRATEGY", "openai_function"
         )
+        self.INTENT_ROUTER_ENABLED = self.get_env_var_bool(
+            "INTENT_ROUTER_ENABLED", "False"
+        )
+        self.INTENT_ROUTER_MODEL_PATH = os.getenv("INTENT_ROUTER_MODEL_PATH", "")
+        self.INTENT_ROUTER_CONFIDENCE_THRESHOLD = self.get_env_var_float(
+            "INTENT_ROUTER_CONFIDENCE_THRESHOLD", 0.9
+        )
         # Speech Service
         self.AZURE_SPEECH_SERVICE_NAME = os.getenv("AZURE_SPEECH_SERVICE_NAME", "")
         self.AZURE_SPEECH_SERVICE_REGION = os.getenv("AZURE_SPEECH_SERVICE_REGION")
@@ -280,6 +324,9 @@ class EnvHelper:
         self.CHAT_HISTORY_ENABLED = self.get_env_var_bool(
             "CHAT_HISTORY_ENABLED", "true"
         )
+        self.CHAT_HISTORY_MAX_TOKENS = self.get_env_var_int(
+            "CHAT_HISTORY_MAX_TOKENS", 4000
+        )
 
     def is_chat_model(self):
         if "gpt-4" in self.AZURE_OPENAI_MODEL_NAME.lower():
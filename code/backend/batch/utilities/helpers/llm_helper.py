@@ -11,6 +11,19 @@ from azure.identity import DefaultAzureCredential
 from .env_helper import EnvHelper
 
 
+def get_cached_prompt_tokens(usage) -> int:
+    """
+    Return the number of prompt tokens served from the Azure OpenAI prompt cache, as
+    reported in usage.prompt_tokens_details.cached_tokens (0 when not reported).
+    """
+    details = getattr(usage, "prompt_tokens_details", None)
+    if isinstance(details, dict):
+        cached_tokens = details.get("cached_tokens")
+    else:
+        cached_tokens = getattr(details, "cached_tokens", None)
+    return cached_tokens if isinstance(cached_tokens, int) else 0
+
+
 class LLMHelper:
     def __init__(self):
         self.env_helper: EnvHelper = EnvHelper()
@@ -109,14 +122,14 @@ class LLMHelper:
             .embedding
         )
 
-    def get_chat_completion_with_functions(
-        self, messages: list[dict], functions: list[dict], function_call: str = "auto"
+    def get_chat_completion_with_tools(
+        self, messages: list[dict], tools: list[dict], tool_choice: str = "auto"
     ):
         return self.openai_client.chat.completions.create(
             model=self.llm_model,
             messages=messages,
-            functions=functions,
-            function_call=function_call,
+            tools=tools,
+            tool_choice=tool_choice,
         )
 
     def get_chat_completion(
@@ -1,4 +1,4 @@
-from typing import List
+from typing import AsyncIterator, List, Optional
 
 from ..orchestrator.orchestration_strategy import OrchestrationStrategy
 from ..orchestrator import OrchestrationSettings
@@ -27,3 +27,26 @@ class Orchestrator:
         return await orchestrator.handle_message(
             user_message, chat_history, conversation_id
         )
+
+    def handle_message_stream(
+        self,
+        user_message: str,
+        chat_history: List[dict],
+        conversation_id: str,
+        orchestrator: OrchestrationSettings,
+        **kwargs: dict,
+    ) -> Optional[AsyncIterator[dict]]:
+        """
+        Return the stream of message deltas of the answer, or None when the orchestrator
+        does not stream and handle_message should be used instead.
+        """
+        orchestrator = get_orchestrator(orchestrator.strategy.value)
+        if orchestrator is None:
+            raise Exception(
+                f"Unknown orchestration strategy: {orchestrator.strategy.value}"
+            )
+        if not orchestrator.supports_streaming:
+            return None
+        return orchestrator.handle_message_stream(
+            user_message, chat_history, conversation_id
+        )
@@ -0,0 +1,45 @@
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Callable, List
+
+
+class QueryVectorCache:
+    """
+    Reuses the vectors computed for a question, e.g. when a user retries or the same
+    question is asked again once its search results expired.
+
+    The vector of a text only depends on the model computing it, so the vectors are
+    cached without ttl, the least recently used first evicted. They are stored as
+    arrays of doubles, which take a quarter of the memory of lists of floats.
+    """
+
+    _MAX_CACHED_VECTORS = 1000
+
+    # (model, text) -> vector, least recently used first
+    _vectors: "OrderedDict[tuple, array]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_or_compute(
+        cls, key: tuple, compute: Callable[[], List[float]]
+    ) -> List[float]:
+        with cls._lock:
+            vector = cls._vectors.get(key)
+            if vector is not None:
+                cls._vectors.move_to_end(key)
+                return vector.tolist()
+
+        # computed outside of the lock, so that the questions are vectorized in parallel
+        computed = compute()
+        with cls._lock:
+            cls._vectors[key] = array("d", computed)
+            cls._vectors.move_to_end(key)
+            while len(cls._vectors) > cls._MAX_CACHED_VECTORS:
+                cls._vectors.popitem(last=False)
+        return computed
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._vectors.clear()
@@ -0,0 +1,78 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from azure.core.exceptions import ResourceNotFoundError
+
+logger = logging.getLogger(__name__)
+
+
+class SearchIndexCache:
+    """
+    Remembers which search indexes exist, so that the existence check does not list all
+    the indexes of the search service before every search.
+
+    An existing index is remembered for ttl seconds. Missing indexes are not remembered,
+    so an index created by another process is found by the next check. An index that
+    turns out to be missing, e.g. deleted by another process, is forgotten through
+    invalidate_on_not_found.
+    """
+
+    # (search service endpoint, index name) -> expiry time
+    _existing: Dict[Tuple[str, str], float] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def is_known(cls, endpoint: str, index_name: str) -> bool:
+        with cls._lock:
+            expires_at = cls._existing.get((endpoint, index_name))
+        return expires_at is not None and expires_at > time.monotonic()
+
+    @classmethod
+    def index_exists(
+        cls,
+        endpoint: str,
+        index_name: str,
+        list_index_names: Callable[[], Iterable[str]],
+        ttl: float,
+    ) -> bool:
+        if cls.is_known(endpoint, index_name):
+            return True
+
+        exists = index_name in list_index_names()
+        if exists:
+            cls.mark_exists(endpoint, index_name, ttl)
+        return exists
+
+    @classmethod
+    def mark_exists(cls, endpoint: str, index_name: str, ttl: float):
+        if ttl <= 0:
+            return
+        with cls._lock:
+            cls._existing[(endpoint, index_name)] = time.monotonic() + ttl
+
+    @classmethod
+    def invalidate(cls, endpoint: str, index_name: Optional[str] = None):
+        """Forget an index, or all the indexes of a search service, e.g. after a delete."""
+        with cls._lock:
+            for key in list(cls._existing):
+                if key[0] == endpoint and index_name in (None, key[1]):
+                    del cls._existing[key]
+        logger.debug(f"Invalidated search index cache for {endpoint} {index_name}")
+
+    @classmethod
+    @contextmanager
+    def invalidate_on_not_found(cls, endpoint: str, index_name: str):
+        """Forget the index when a call made in the block finds that it does not exist."""
+        try:
+            yield
+        except ResourceNotFoundError:
+            cls.invalidate(endpoint, index_name)
+            raise
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._existing.clear()
@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, NamedTuple, Optional
+
+from .azure_blob_storage_client import AzureBlobStorageClient
+from ..common.source_document import SourceDocument
+
+logger = logging.getLogger(__name__)
+
+# metadata of the documents container holding the generation of the search index
+INDEX_GENERATION_METADATA_KEY = "search_index_generation"
+
+
+def read_index_generation(blob_client: AzureBlobStorageClient) -> str:
+    return blob_client.get_container_metadata().get(INDEX_GENERATION_METADATA_KEY, "0")
+
+
+def bump_index_generation(blob_client: AzureBlobStorageClient) -> None:
+    """
+    Start a new generation of the search index after documents were added to or deleted
+    from it, so that every process stops serving the search results it cached.
+
+    The generation is written without the container lease: any newer generation
+    invalidates the cached results, so concurrent bumps do not contend for it.
+    """
+    SearchResultCache.invalidate()
+    try:
+        blob_client.upsert_container_metadata(
+            {INDEX_GENERATION_METADATA_KEY: str(time.time_ns())}, exclusive=False
+        )
+    except Exception:
+        # the documents are indexed anyway, cached results expire after their ttl
+        logger.warning("Failed to bump the search index generation", exc_info=True)
+
+
+class _CachedResult(NamedTuple):
+    generation: str
+    expires_at: float
+    latency: float
+    documents: List[SourceDocument]
+
+
+class SearchResultCache:
+    """
+    Reuses the documents found for a question when the same question is searched again
+    with the same filter and search settings, e.g. when a user retries.
+
+    Results are cached for ttl seconds and only while the search index stays on the same
+    generation. The generation is read from the documents container at most every
+    _GENERATION_REFRESH_SECONDS, and bumped by every ingestion or deletion.
+    """
+
+    _MAX_CACHED_RESULTS = 1000
+    _GENERATION_REFRESH_SECONDS = 10
+
+    # cache key -> cached result, least recently used first
+    _results: "OrderedDict[tuple, _CachedResult]" = OrderedDict()
+    _generation: Optional[str] = None
+    _generation_read_at = float("-inf")
+    _hits = 0
+    _misses = 0
+    _saved_latency = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_or_search(
+        cls,
+        key: tuple,
+        search: Callable[[], List[SourceDocument]],
+        read_generation: Callable[[], str],
+        ttl: float,
+    ) -> List[SourceDocument]:
+        generation = cls._current_generation(read_generation)
+        if generation is None:
+            return search()
+
+        with cls._lock:
+            cached = cls._results.get(key)
+            if (
+                cached is not None
+                and cached.generation == generation
+                and cached.expires_at > time.monotonic()
+            ):
+                cls._results.move_to_end(key)
+                cls._hits += 1
+                cls._saved_latency += cached.latency
+                hit_ratio = cls._hits / (cls._hits + cls._misses)
+            else:
+                cached = None
+
+        if cached is not None:
+            logger.info(
+                "Search result cache hit",
+                extra={
+                    "search_result_cache_hit_ratio": hit_ratio,
+                    "search_result_cache_saved_latency_ms": cached.latency * 1000,
+                },
+            )
+            return list(cached.documents)
+
+        start = time.perf_counter()
+        documents = search()
+        latency = time.perf_counter() - start
+
+        with cls._lock:
+            cls._misses += 1
+            cls._results[key] = _CachedResult(
+                generation, time.monotonic() + ttl, latency, list(documents)
+            )
+            cls._results.move_to_end(key)
+            while len(cls._results) > cls._MAX_CACHED_RESULTS:
+                cls._results.popitem(last=False)
+
+        return documents
+
+    @classmethod
+    def _current_generation(cls, read_generation: Callable[[], str]) -> Optional[str]:
+        with cls._lock:
+            if (
+                time.monotonic() - cls._generation_read_at
+                < cls._GENERATION_REFRESH_SECONDS
+            ):
+                return cls._generation
+
+        try:
+            generation = read_generation()
+        except Exception:
+            # without the generation, a deletion could go unnoticed: do not use the cache
+            logger.warning("Failed to read the search index generation", exc_info=True)
+            generation = None
+
+        with cls._lock:
+            cls._generation = generation
+            cls._generation_read_at = time.monotonic()
+        return generation
+
+    @classmethod
+    def stats(cls) -> dict:
+        with cls._lock:
+            lookups = cls._hits + cls._misses
+            return {
+                "hits": cls._hits,
+                "misses": cls._misses,
+                "hit_ratio": cls._hits / lookups if lookups else 0.0,
+                "saved_latency_seconds": cls._saved_latency,
+            }
+
+    @classmethod
+    def invalidate(cls):
+        """Drop the cached results, and read the generation again on the next search."""
+        with cls._lock:
+            cls._results.clear()
+            cls._generation = None
+            cls._generation_read_at = float("-inf")
+
+    @classmethod
+    def clear(cls):
+        cls.invalidate()
+        with cls._lock:
+            cls._hits = 0
+            cls._misses = 0
+            cls._saved_latency = 0.0
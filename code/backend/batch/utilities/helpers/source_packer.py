@@ -0,0 +1,182 @@
+import logging
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import tiktoken
+
+from ..common.source_document import SourceDocument
+
+logger = logging.getLogger(__name__)
+
+_TRAILING_NUMBER = re.compile(r"\d+$")
+
+
+class SourcePacker:
+    """
+    Packs the retrieved source documents into the answering prompt.
+
+    Source documents are expected in ranking order (best first). Near-duplicate chunks
+    are dropped, adjacent chunks of the same document are merged into a single source,
+    and sources are then added by rank while they fit in the token budget.
+    """
+
+    _ENCODER_NAME = "cl100k_base"
+    _SHINGLE_SIZE = 5
+    # maximum number of words looked at when stitching the overlap of adjacent chunks
+    _MAX_OVERLAP_WORDS = 200
+
+    def __init__(self, max_tokens: int = 0, similarity_threshold: float = 0.8):
+        self.max_tokens = max_tokens
+        self.similarity_threshold = similarity_threshold
+
+    def pack(self, source_documents: List[SourceDocument]) -> List[SourceDocument]:
+        packed = self.fill_budget(
+            self.merge_adjacent(self.deduplicate(source_documents))
+        )
+        logger.debug(
+            f"Packed {len(source_documents)} source documents into {len(packed)}"
+        )
+        return packed
+
+    def count_tokens(self, source_document: SourceDocument) -> int:
+        encoding = tiktoken.get_encoding(self._ENCODER_NAME)
+        return len(encoding.encode(source_document.content or ""))
+
+    def _shingles(self, content: str) -> set[int]:
+        words = re.findall(r"\w+", content.lower())
+        if len(words) <= self._SHINGLE_SIZE:
+            return {zlib.crc32(" ".join(words).encode("utf-8"))}
+        return {
+            zlib.crc32(" ".join(words[i : i + self._SHINGLE_SIZE]).encode("utf-8"))
+            for i in range(len(words) - self._SHINGLE_SIZE + 1)
+        }
+
+    def deduplicate(
+        self, source_documents: List[SourceDocument]
+    ) -> List[SourceDocument]:
+        """
+        Drop documents already retrieved with a better rank, and documents whose
+        shingles are mostly contained in a better ranked document.
+        """
+        kept: List[SourceDocument] = []
+        kept_shingles: List[set[int]] = []
+        seen_ids = set()
+        for source_document in source_documents:
+            if source_document.id is not None and source_document.id in seen_ids:
+                continue
+
+            shingles = self._shingles(source_document.content or "")
+            if any(
+                len(shingles & other) / (min(len(shingles), len(other)) or 1)
+                >= self.similarity_threshold
+                for other in kept_shingles
+            ):
+                continue
+
+            seen_ids.add(source_document.id)
+            kept.append(source_document)
+            kept_shingles.append(shingles)
+        return kept
+
+    def merge_adjacent(
+        self, source_documents: List[SourceDocument]
+    ) -> List[SourceDocument]:
+        """
+        Merge the runs of chunks of the same document with consecutive chunk numbers,
+        whatever their ranks. A merged document takes the rank of its best ranked chunk.
+        """
+        # (best rank, chunks) of the merged documents
+        runs: List[Tuple[int, List[SourceDocument]]] = []
+        # source -> (chunk number, rank, chunk) of the numbered chunks
+        by_source: Dict[Optional[str], List[Tuple[int, int, SourceDocument]]] = {}
+        for rank, source_document in enumerate(source_documents):
+            number = self._chunk_number(source_document)
+            if number is None:
+                runs.append((rank, [source_document]))
+            else:
+                by_source.setdefault(source_document.source, []).append(
+                    (number, rank, source_document)
+                )
+
+        for chunks in by_source.values():
+            chunks.sort(key=lambda chunk: chunk[:2])
+            run = [chunks[0]]
+            for chunk in chunks[1:]:
+                if chunk[0] != run[-1][0] + 1:
+                    runs.append(self._ranked_run(run))
+                    run = []
+                run.append(chunk)
+            runs.append(self._ranked_run(run))
+
+        runs.sort(key=lambda run: run[0])
+        return [self._merge(run) for _, run in runs]
+
+    @staticmethod
+    def _chunk_number(source_document: SourceDocument) -> Optional[int]:
+        """
+        The chunk number of the document, else the number ending its chunk_id, as the
+        chunks of integrated vectorization ("<parent id>_pages_<number>").
+        """
+        if source_document.chunk is not None:
+            return source_document.chunk
+        if source_document.chunk_id is not None:
+            if match := _TRAILING_NUMBER.search(source_document.chunk_id):
+                return int(match.group())
+        return None
+
+    @staticmethod
+    def _ranked_run(
+        run: List[Tuple[int, int, SourceDocument]]
+    ) -> Tuple[int, List[SourceDocument]]:
+        return min(rank for _, rank, _ in run), [chunk for _, _, chunk in run]
+
+    def _merge(self, group: List[SourceDocument]) -> SourceDocument:
+        if len(group) == 1:
+            return group[0]
+
+        content = group[0].content
+        for source_document in group[1:]:
+            content = self._stitch(content, source_document.content)
+
+        first = group[0]
+        return SourceDocument(
+            id=first.id,
+            content=content,
+            source=first.source,
+            title=first.title,
+            chunk=first.chunk,
+            offset=first.offset,
+            page_number=first.page_number,
+            chunk_id=first.chunk_id,
+        )
+
+    def _stitch(self, left: str, right: str) -> str:
+        """Join two consecutive chunks, removing the text they overlap on."""
+        left_words = left.split()
+        right_spans = [match.span() for match in re.finditer(r"\S+", right)]
+        right_words = [right[start:end] for start, end in right_spans]
+        for size in range(
+            min(len(left_words), len(right_words), self._MAX_OVERLAP_WORDS), 0, -1
+        ):
+            if left_words[-size:] == right_words[:size]:
+                return left + right[right_spans[size - 1][1] :]
+        return f"{left}\n{right}"
+
+    def fill_budget(
+        self, source_documents: List[SourceDocument]
+    ) -> List[SourceDocument]:
+        if self.max_tokens <= 0 or not source_documents:
+            return source_documents
+
+        packed = []
+        used_tokens = 0
+        for source_document in source_documents:
+            tokens = self.count_tokens(source_document)
+            if used_tokens + tokens > self.max_tokens:
+                continue
+            packed.append(source_document)
+            used_tokens += tokens
+
+        # always answer with at least the best ranked source
+        return packed or source_documents[:1]
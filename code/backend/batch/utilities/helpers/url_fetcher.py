@@ -0,0 +1,122 @@
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .env_helper import EnvHelper
+
+logger = logging.getLogger(__name__)
+
+# metadata keys of the validators of a fetched page, stored with the ingested page
+ETAG_METADATA_KEY = "source_etag"
+LAST_MODIFIED_METADATA_KEY = "source_last_modified"
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    # None when the page is not modified since the validators it was fetched with
+    content: Optional[bytes]
+    validators: Dict[str, str] = field(default_factory=dict)
+    content_type: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.content is None
+
+
+class UrlFetcher:
+    """
+    Fetches web pages with a session shared by the fetchers of the process, which keeps
+    the connections alive, with at most URL_FETCH_MAX_PER_HOST requests in flight to
+    the same host, and conditionally when the ETag or Last-Modified of the page
+    ingested before are known.
+    """
+
+    __MAX_RETRIES = 2
+    __POOL_SIZE = 10
+    __TIMEOUT = 30
+
+    _session: Optional[requests.Session] = None
+    # host -> semaphore bounding the requests in flight to the host
+    _host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, env_helper: EnvHelper) -> None:
+        self.max_per_host = env_helper.URL_FETCH_MAX_PER_HOST
+
+    def fetch(
+        self, url: str, validators: Optional[Dict[str, str]] = None
+    ) -> FetchedPage:
+        validators = validators or {}
+        headers = {}
+        if validators.get(ETAG_METADATA_KEY):
+            headers["If-None-Match"] = validators[ETAG_METADATA_KEY]
+        if validators.get(LAST_MODIFIED_METADATA_KEY):
+            headers["If-Modified-Since"] = validators[LAST_MODIFIED_METADATA_KEY]
+
+        with self._get_host_semaphore(urlparse(url).netloc):
+            response = self._get_session().get(
+                url, headers=headers, timeout=self.__TIMEOUT
+            )
+
+        if response.status_code == 304:
+            logger.debug(f"{url} not modified")
+            return FetchedPage(url=url, content=None, validators=validators)
+        response.raise_for_status()
+        fetched_validators = {}
+        if response.headers.get("ETag"):
+            fetched_validators[ETAG_METADATA_KEY] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            fetched_validators[LAST_MODIFIED_METADATA_KEY] = response.headers[
+                "Last-Modified"
+            ]
+        return FetchedPage(
+            url=url,
+            content=response.content,
+            validators=fetched_validators,
+            content_type=response.headers.get("Content-Type"),
+        )
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            if cls._session is not None:
+                cls._session.close()
+            cls._session = None
+            cls._host_semaphores = {}
+
+    def _get_host_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = UrlFetcher._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_per_host)
+                UrlFetcher._host_semaphores[host] = semaphore
+            return semaphore
+
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        with cls._lock:
+            if cls._session is None:
+                retry = Retry(
+                    total=cls.__MAX_RETRIES,
+                    status_forcelist=[429, 502, 503, 504],
+                    allowed_methods=["GET"],
+                    backoff_factor=0.5,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=cls.__POOL_SIZE,
+                    pool_maxsize=cls.__POOL_SIZE,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                cls._session = session
+            return cls._session
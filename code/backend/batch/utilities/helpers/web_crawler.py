@@ -0,0 +1,215 @@
+import hashlib
+import logging
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Set
+from urllib.parse import urljoin, urldefrag, urlparse
+from urllib.robotparser import RobotFileParser
+
+from bs4 import BeautifulSoup
+from requests import HTTPError
+
+from .env_helper import EnvHelper
+from ..document_loading.web import WebDocumentLoading
+from .url_fetcher import FetchedPage, UrlFetcher
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "*"
+# sitemaps listed in a sitemap index that are read, to not recurse indefinitely
+_MAX_SITEMAPS = 50
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalizes the URL so that the URLs of the same page compare equal: without
+    fragment, with the scheme and host lower-cased and without default port.
+    """
+    url, _ = urldefrag(url.strip())
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    netloc = parsed.hostname or ""
+    if parsed.port and parsed.port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{parsed.port}"
+    return parsed._replace(
+        scheme=scheme, netloc=netloc, path=parsed.path or "/"
+    ).geturl()
+
+
+class WebCrawler:
+    """
+    Crawls a site from a page or a sitemap, following the links to the pages of the
+    same host up to max_depth links away from the seed, until max_pages pages are
+    fetched.
+
+    The pages are fetched concurrently, level by level, with the UrlFetcher, and
+    streamed as they are fetched. The pages disallowed by the robots.txt of the site,
+    or by their robots meta tag, are skipped, as are the pages whose canonical URL or
+    text were already crawled. The pages that fail to be fetched are listed in
+    failed.
+    """
+
+    def __init__(
+        self,
+        env_helper: EnvHelper,
+        max_depth: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        fetcher: Optional[UrlFetcher] = None,
+    ) -> None:
+        self.max_depth = env_helper.CRAWL_MAX_DEPTH if max_depth is None else max_depth
+        self.max_pages = env_helper.CRAWL_MAX_PAGES if max_pages is None else max_pages
+        self.max_workers = env_helper.EMBEDDING_MAX_WORKERS
+        self.fetcher = fetcher or UrlFetcher(env_helper)
+        # url -> error of the pages that failed to be fetched
+        self.failed: Dict[str, str] = {}
+
+    def crawl(self, seed_url: str) -> Iterator[FetchedPage]:
+        seed_url = canonicalize_url(seed_url)
+        self.host = urlparse(seed_url).netloc
+        self.robots = self._read_robots(seed_url)
+        self.seen_urls: Set[str] = set()
+        self.seen_hashes: Set[str] = set()
+        self.failed = {}
+
+        frontier = self._read_sitemap(seed_url) if _is_sitemap(seed_url) else None
+        frontier = self._schedule(frontier if frontier is not None else [seed_url])
+        fetched = 0
+        depth = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while frontier:
+                frontier = frontier[: self.max_pages - fetched]
+                fetched += len(frontier)
+                futures = {
+                    executor.submit(self.fetcher.fetch, url): url for url in frontier
+                }
+                next_frontier: List[str] = []
+                for future in as_completed(futures):
+                    url = futures[future]
+                    try:
+                        page = future.result()
+                    except Exception as e:
+                        logger.warning(f"Failed to crawl {url}: {e}")
+                        self.failed[url] = str(e)
+                        continue
+                    page, links = self._parse(page)
+                    if depth < self.max_depth:
+                        next_frontier.extend(self._schedule(links))
+                    if page is not None:
+                        yield page
+                frontier = next_frontier
+                depth += 1
+                if fetched >= self.max_pages:
+                    break
+
+    def _schedule(self, urls: List[str]) -> List[str]:
+        """Returns the urls of the host, allowed and not yet seen, marking them seen."""
+        scheduled = []
+        for url in urls:
+            url = canonicalize_url(url)
+            if (
+                urlparse(url).scheme not in _DEFAULT_PORTS
+                or urlparse(url).netloc != self.host
+                or url in self.seen_urls
+            ):
+                continue
+            self.seen_urls.add(url)
+            if not self.robots.can_fetch(USER_AGENT, url):
+                logger.debug(f"{url} disallowed by robots.txt")
+                continue
+            scheduled.append(url)
+        return scheduled
+
+    def _parse(self, page: FetchedPage):
+        """
+        Returns the page to ingest, None if it is not, and the links to follow.
+        """
+        if "html" not in (page.content_type or "text/html"):
+            return None, []
+        soup = BeautifulSoup(page.content, "html.parser")
+        robots_meta = soup.find("meta", attrs={"name": "robots"})
+        directives = (
+            robots_meta.get("content", "").lower() if robots_meta is not None else ""
+        )
+        links = (
+            []
+            if "nofollow" in directives
+            else [urljoin(page.url, a["href"]) for a in soup.find_all("a", href=True)]
+        )
+        if "noindex" in directives:
+            return None, links
+
+        canonical = soup.find("link", rel="canonical", href=True)
+        if canonical is not None:
+            canonical_url = canonicalize_url(urljoin(page.url, canonical["href"]))
+            if (
+                canonical_url != page.url
+                and urlparse(canonical_url).netloc == self.host
+            ):
+                if canonical_url in self.seen_urls:
+                    return None, links
+                self.seen_urls.add(canonical_url)
+                page.url = canonical_url
+
+        # the pages only differing by their boilerplate are duplicates
+        text = WebDocumentLoading.get_text(soup)
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if text_hash in self.seen_hashes:
+            logger.debug(f"{page.url} is a duplicate of a crawled page")
+            return None, links
+        self.seen_hashes.add(text_hash)
+        return page, links
+
+    def _read_robots(self, seed_url: str) -> RobotFileParser:
+        robots_url = urljoin(seed_url, "/robots.txt")
+        robots = RobotFileParser(robots_url)
+        try:
+            page = self.fetcher.fetch(robots_url)
+            robots.parse(page.content.decode("utf-8", errors="ignore").splitlines())
+        except HTTPError as e:
+            # as RobotFileParser.read: all disallowed when unauthorized, else allowed
+            if e.response is not None and e.response.status_code in (401, 403):
+                robots.disallow_all = True
+            else:
+                robots.allow_all = True
+        except Exception:
+            logger.warning(f"Failed to read {robots_url}", exc_info=True)
+            robots.allow_all = True
+        return robots
+
+    def _read_sitemap(self, sitemap_url: str) -> Optional[List[str]]:
+        """
+        Returns the URLs listed in the sitemap, following the sitemaps of a sitemap
+        index, None if it is not a sitemap.
+        """
+        urls: List[str] = []
+        sitemaps = [sitemap_url]
+        read = 0
+        while sitemaps and read < _MAX_SITEMAPS:
+            url = sitemaps.pop(0)
+            read += 1
+            try:
+                root = ElementTree.fromstring(self.fetcher.fetch(url).content)
+            except ElementTree.ParseError:
+                if url == sitemap_url:
+                    return None
+                logger.warning(f"Failed to parse the sitemap {url}")
+                continue
+            except Exception as e:
+                logger.warning(f"Failed to read the sitemap {url}: {e}")
+                self.failed[url] = str(e)
+                continue
+            locations = [
+                element.text.strip()
+                for element in root.iter()
+                if element.tag.endswith("loc") and element.text
+            ]
+            if root.tag.endswith("sitemapindex"):
+                sitemaps.extend(locations)
+            else:
+                urls.extend(locations)
+        return urls
+
+
+def _is_sitemap(url: str) -> bool:
+    return urlparse(url).path.lower().endswith(".xml")
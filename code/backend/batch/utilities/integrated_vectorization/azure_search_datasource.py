@@ -24,21 +24,22 @@ class AzureSearchDatasource:
         )
 
     def create_or_update_datasource(self):
+        self.indexer_client.create_or_update_data_source_connection(
+            self.get_datasource()
+        )
+
+    def get_datasource(self) -> SearchIndexerDataSourceConnection:
         connection_string = self.generate_datasource_connection_string()
-        # Create Datasource
         container = SearchIndexerDataContainer(
             name=self.env_helper.AZURE_BLOB_CONTAINER_NAME
         )
-        data_source_connection = SearchIndexerDataSourceConnection(
+        return SearchIndexerDataSourceConnection(
             name=self.env_helper.AZURE_SEARCH_DATASOURCE_NAME,
             type="azureblob",
             connection_string=connection_string,
             container=container,
             data_deletion_detection_policy=NativeBlobSoftDeleteDeletionDetectionPolicy(),
         )
-        self.indexer_client.create_or_update_data_source_connection(
-            data_source_connection
-        )
 
     def generate_datasource_connection_string(self):
         if self.env_helper.is_auth_type_keys():
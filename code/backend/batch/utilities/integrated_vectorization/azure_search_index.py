@@ -24,6 +24,12 @@ from ..helpers.env_helper import EnvHelper
 from azure.identity import DefaultAzureCredential
 from azure.core.credentials import AzureKeyCredential
 from ..helpers.llm_helper import LLMHelper
+from ..helpers.search_index_cache import SearchIndexCache
+from ..helpers.embedding_dimensions import (
+    EMBEDDING_MODEL_DIMENSIONS,
+    get_index_field_dimensions,
+    resolve_dimensions,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -46,13 +52,32 @@ class AzureSearchIndex:
     @property
     def search_dimensions(self) -> int:
         if AzureSearchIndex._search_dimension is None:
-            AzureSearchIndex._search_dimension = len(
-                self.llm_helper.get_embedding_model().embed_query("Text")
+            AzureSearchIndex._search_dimension = resolve_dimensions(
+                "text",
+                self.env_helper.AZURE_SEARCH_DIMENSIONS,
+                EMBEDDING_MODEL_DIMENSIONS.get(
+                    self.env_helper.AZURE_OPENAI_EMBEDDING_MODEL_NAME
+                ),
+                lambda: get_index_field_dimensions(
+                    self.index_client,
+                    self.env_helper.AZURE_SEARCH_INDEX,
+                    "content_vector",
+                ),
+                lambda: len(self.llm_helper.get_embedding_model().embed_query("Text")),
             )
         return AzureSearchIndex._search_dimension
 
     def create_or_update_index(self):
-        # Create a search index
+        result = self.index_client.create_or_update_index(self.get_index())
+        logger.info(f"{result.name} index created successfully.")
+        SearchIndexCache.mark_exists(
+            self.env_helper.AZURE_SEARCH_SERVICE,
+            self.env_helper.AZURE_SEARCH_INDEX,
+            self.env_helper.AZURE_SEARCH_INDEX_CACHE_TTL,
+        )
+        return result
+
+    def get_index(self) -> SearchIndex:
         fields = [
             SimpleField(
                 name="id",
@@ -103,15 +128,12 @@ class AzureSearchIndex:
 
         semantic_search = self.get_semantic_search_config()
 
-        index = SearchIndex(
+        return SearchIndex(
             name=self.env_helper.AZURE_SEARCH_INDEX,
             fields=fields,
             vector_search=vector_search,
             semantic_search=semantic_search,
         )
-        result = self.index_client.create_or_update_index(index)
-        logger.info(f"{result.name} index created successfully.")
-        return result
 
     def get_vector_search_config(self):
         if self.env_helper.is_auth_type_keys():
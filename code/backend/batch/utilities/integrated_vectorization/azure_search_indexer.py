@@ -1,5 +1,14 @@
 import logging
-from azure.search.documents.indexes.models import SearchIndexer, FieldMapping
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from azure.core.exceptions import ResourceExistsError
+from azure.search.documents.indexes.models import (
+    SearchIndexer,
+    FieldMapping,
+    IndexingSchedule,
+)
 from azure.search.documents.indexes import SearchIndexerClient
 from ..helpers.env_helper import EnvHelper
 from azure.identity import DefaultAzureCredential
@@ -9,6 +18,16 @@ logger = logging.getLogger(__name__)
 
 
 class AzureSearchIndexer:
+    _MAX_REPORTED_ERRORS = 5
+    # seconds before a trailing run checks again whether the indexer is running
+    _MIN_TRAILING_RUN_DELAY = 10
+
+    # indexer name -> time a run was last requested by this process
+    _run_requested_at: Dict[str, float] = {}
+    # indexer name -> trailing run scheduled by this process
+    _trailing_runs: Dict[str, threading.Timer] = {}
+    _lock = threading.Lock()
+
     def __init__(self, env_helper: EnvHelper):
         self.env_helper = env_helper
         self.indexer_client = SearchIndexerClient(
@@ -21,10 +40,22 @@ class AzureSearchIndexer:
         )
 
     def create_or_update_indexer(self, indexer_name: str, skillset_name: str):
-        indexer = SearchIndexer(
+        indexer_result = self.indexer_client.create_or_update_indexer(
+            self.get_indexer(indexer_name, skillset_name)
+        )
+        # Run the indexer
+        self.indexer_client.run_indexer(indexer_name)
+        logger.info(
+            f" {indexer_name} is created and running. If queries return no results, please wait a bit and try again."
+        )
+        return indexer_result
+
+    def get_indexer(self, indexer_name: str, skillset_name: str) -> SearchIndexer:
+        return SearchIndexer(
             name=indexer_name,
             description="Indexer to index documents and generate embeddings",
             skillset_name=skillset_name,
+            schedule=self.get_schedule(),
             target_index_name=self.env_helper.AZURE_SEARCH_INDEX,
             data_source_name=self.env_helper.AZURE_SEARCH_DATASOURCE_NAME,
             parameters={
@@ -49,16 +80,127 @@ class AzureSearchIndexer:
                 ),
             ],
         )
-        indexer_result = self.indexer_client.create_or_update_indexer(indexer)
-        # Run the indexer
-        self.indexer_client.run_indexer(indexer_name)
-        logger.info(
-            f" {indexer_name} is created and running. If queries return no results, please wait a bit and try again."
+
+    def get_schedule(self) -> IndexingSchedule | None:
+        # picks up the documents whose trailing run was lost, e.g. when the process
+        # stopped before it
+        minutes = self.env_helper.AZURE_SEARCH_INDEXER_SCHEDULE_MINUTES
+        return (
+            IndexingSchedule(interval=timedelta(minutes=minutes)) if minutes else None
         )
-        return indexer_result
 
-    def run_indexer(self, indexer_name: str):
-        self.indexer_client.reset_indexer(indexer_name)
+    def request_run(self, indexer_name: str, window: float) -> bool:
+        """
+        Runs the indexer for new or changed documents, unless a run was already
+        requested by this process in the last window seconds or the indexer is running,
+        so that a burst of uploads results in a single run. Returns whether it was run.
+
+        When it is not run, a trailing run is scheduled for the end of the window, or
+        of the current run, so that the documents of the request are still indexed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            requested_at = self._run_requested_at.get(indexer_name, float("-inf"))
+            coalesced = now - requested_at < window
+            if not coalesced:
+                AzureSearchIndexer._run_requested_at[indexer_name] = now
+        if coalesced:
+            logger.debug(f"Run of {indexer_name} coalesced with a recent run")
+            self._schedule_trailing_run(
+                indexer_name, window, requested_at + window - now
+            )
+            return False
+
+        last_result = self.indexer_client.get_indexer_status(indexer_name).last_result
+        if last_result is not None and last_result.status == "inProgress":
+            logger.info(f"{indexer_name} is already running")
+            self._schedule_trailing_run(indexer_name, window)
+            return False
+        try:
+            self.indexer_client.run_indexer(indexer_name)
+        except ResourceExistsError:
+            # another process started a run since the status was read
+            logger.info(f"{indexer_name} is already running")
+            self._schedule_trailing_run(indexer_name, window)
+            return False
+        logger.info(f"{indexer_name} is running")
+        return True
+
+    def _schedule_trailing_run(
+        self, indexer_name: str, window: float, delay: Optional[float] = None
+    ):
+        """
+        Requests a run of the indexer after delay seconds, by default once a running
+        indexer may have completed, unless a trailing run is already scheduled.
+        """
+        if delay is None:
+            delay = max(window, self._MIN_TRAILING_RUN_DELAY)
+        with self._lock:
+            if indexer_name in self._trailing_runs:
+                return
+            timer = threading.Timer(
+                delay, self._run_trailing_run, args=(indexer_name, window)
+            )
+            timer.daemon = True
+            AzureSearchIndexer._trailing_runs[indexer_name] = timer
+        timer.start()
+
+    def _run_trailing_run(self, indexer_name: str, window: float):
+        with self._lock:
+            AzureSearchIndexer._trailing_runs.pop(indexer_name, None)
+        try:
+            self.request_run(indexer_name, window)
+        except Exception:
+            logger.warning(f"Trailing run of {indexer_name} failed", exc_info=True)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._run_requested_at.clear()
+            for timer in cls._trailing_runs.values():
+                timer.cancel()
+            cls._trailing_runs.clear()
+
+    def get_indexer_status(self, indexer_name: str) -> dict:
+        status = self.indexer_client.get_indexer_status(indexer_name)
+        last_result = status.last_result
+        if last_result is None:
+            return {"status": status.status, "last_run": None}
+
+        end_time = last_result.end_time or datetime.now(timezone.utc)
+        elapsed = (
+            (end_time - last_result.start_time).total_seconds()
+            if last_result.start_time
+            else 0
+        )
+        return {
+            "status": status.status,
+            "last_run": {
+                "status": last_result.status,
+                "start_time": (
+                    last_result.start_time.isoformat()
+                    if last_result.start_time
+                    else None
+                ),
+                "end_time": (
+                    last_result.end_time.isoformat() if last_result.end_time else None
+                ),
+                "documents_processed": last_result.item_count,
+                "documents_failed": last_result.failed_item_count,
+                "documents_per_second": (
+                    last_result.item_count / elapsed if elapsed > 0 else 0.0
+                ),
+                "errors": [
+                    error.error_message
+                    for error in (last_result.errors or [])[: self._MAX_REPORTED_ERRORS]
+                ],
+            },
+        }
+
+    def run_indexer(self, indexer_name: str, reset: bool = True):
+        # resetting makes the indexer process every document again, not only new ones
+        if reset:
+            self.indexer_client.reset_indexer(indexer_name)
         self.indexer_client.run_indexer(indexer_name)
         logger.info(
             f" {indexer_name} is created and running. If queries return no results, please wait a bit and try again."
@@ -39,6 +39,12 @@ class AzureSearchSkillset:
         self.integrated_vectorization_config = integrated_vectorization_config
 
     def create_skillset(self):
+        skillset = self.get_skillset()
+        skillset_result = self.indexer_client.create_or_update_skillset(skillset)
+        logger.info(f"{skillset.name} created")
+        return skillset_result
+
+    def get_skillset(self) -> SearchIndexerSkillset:
         skillset_name = f"{self.env_helper.AZURE_SEARCH_INDEX}-skillset"
 
         ocr_skill = OcrSkill(
@@ -129,13 +135,9 @@ class AzureSearchSkillset:
             ),
         )
 
-        skillset = SearchIndexerSkillset(
+        return SearchIndexerSkillset(
             name=skillset_name,
             description="Skillset to chunk documents and generating embeddings",
             skills=[ocr_skill, merge_skill, split_skill, embedding_skill],
             index_projections=index_projections,
         )
-
-        skillset_result = self.indexer_client.create_or_update_skillset(skillset)
-        logger.info(f"{skillset.name} created")
-        return skillset_result
@@ -1,9 +1,9 @@
+import asyncio
 import logging
-from typing import List
+from typing import AsyncIterator, List
 import json
 from openai import Stream
 from openai.types.chat import ChatCompletionChunk, ChatCompletion
-from flask import Response
 
 from .orchestrator_base import OrchestratorBase
 from ..helpers.llm_helper import LLMHelper
@@ -23,6 +23,10 @@ class ByodOrchestrator(OrchestratorBase):
         #self.config = ConfigHelper.get_active_config_or_default()
 
 
+    @property
+    def supports_streaming(self) -> bool:
+        return self.env_helper.SHOULD_STREAM
+
     async def orchestrate(
         self,
         user_message: str,
@@ -35,6 +39,125 @@ class ByodOrchestrator(OrchestratorBase):
             if response := self.call_content_safety_input(user_message):
                 return response
 
+        response = self._create_chat_completion(user_message, chat_history, stream=False)
+
+        # update chat history with response
+        #chat_history = self._update_chat_history_with_llm_response(chat_history, response.choices[0].message)
+
+        citations = self.get_citations(citation_list=response.choices[0].message.model_extra["context"])
+#            response_obj = {
+#                "id": response.id,
+#                "model": response.model,
+#                "created": response.created,
+#                "object": response.object,
+#                "choices": [
+#                    {
+#                        "messages": [
+#                            {
+#                                "content": json.dumps(
+#                                    citations,
+#                                    ensure_ascii=False,
+#                                ),
+#                                "end_turn": False,
+#                                "role": "tool",
+#                            },
+#                            {
+#                                "end_turn": True,
+#                                "content": response.choices[0].message.content,
+#                                "role": "assistant",
+#                            },
+#                        ]
+#                    }
+#                ],
+#            }
+
+        ##format answer
+        #answer = Answer(
+        #    question=user_message,
+        #    answer=response_obj.choices[0].messages[1].content
+        #)
+#
+        #if answer.answer is None:
+        #    answer.answer = "The requested information is not available in the retrieved data. Please try another query or topic."
+#
+        ## Call Content Safety tool with answers
+        #if self.config.prompts.enable_content_safety:
+        #    if response := self.call_content_safety_output(user_message, answer.answer):
+        #        return response
+#
+        #citations_array = response.choices[0].message.model_extra["context"].get("citations")
+#
+        ## Format the output for the UI
+        #answer = Answer.from_json(json.dumps(response.choices[0]. )
+        #answer = Answer.from_json( {"question": , answer, citations})
+
+        list_source_docs = [SourceDocument.from_dict(c) for c in citations['citations']]
+
+
+
+        #answer = Answer(
+        #    question=user_message,
+        #    answer=response.choices[0].message.content,
+        #    source_documents=[SourceDocument.from_json(c) for c in citations]
+        #    #[SourceDocument.from_json(doc['url']) for doc in citations_array]
+        #    #source_documents = response.choices[0].message.model_extra["context"].get("citations")
+        #)
+
+        #q = Answer.from_json
+
+        parsed_messages = self.output_parser.parse(
+            question=user_message,
+            answer=response.choices[0].message.content,
+            source_documents=list_source_docs
+        )
+        return parsed_messages
+
+        #return response_obj
+
+    async def orchestrate_stream(
+        self,
+        user_message: str,
+        chat_history: List[dict],
+        **kwargs: dict
+    ) -> AsyncIterator[dict]:
+        """
+        Stream the answer as message deltas: the citations as a tool message, then the
+        assistant content chunk by chunk, and an empty assistant delta ending the turn.
+        """
+        if self.config.prompts.enable_content_safety:
+            if response := self.call_content_safety_input(user_message):
+                for message in response:
+                    yield message
+                return
+
+        response = self._create_chat_completion(user_message, chat_history, stream=True)
+        chunks = iter(response)
+
+        # the OpenAI stream is blocking, read it off the event loop
+        while (line := await asyncio.to_thread(next, chunks, None)) is not None:
+            if not line.choices:
+                continue
+            choice = line.choices[0]
+
+            if choice.model_extra.get("end_turn"):
+                yield {"role": "assistant", "content": "", "end_turn": True}
+                return
+
+            if choice.delta.role == "assistant":
+                yield {
+                    "role": "tool",
+                    "content": json.dumps(
+                        self.get_citations(choice.delta.model_extra["context"]),
+                        ensure_ascii=False,
+                    ),
+                    "end_turn": False,
+                }
+            elif choice.delta.content:
+                yield {"role": "assistant", "content": choice.delta.content, "end_turn": False}
+
+    def _create_chat_completion(
+        self, user_message: str, chat_history: List[dict], stream: bool
+    ) -> ChatCompletion | Stream[ChatCompletionChunk]:
         # should use data func - checks index config but I think it should be handled as an exception rather than generate an option for an API call with no index reference
         # I don't think there should be a distinction between should use data and should not use data - let's just leave the without data func but default to the other one
         # - in_scope: it's a parameter in the payload so it's implied and managed by the server if optional or mandatory
@@ -95,7 +218,7 @@ class ByodOrchestrator(OrchestratorBase):
                 if self.env_helper.AZURE_OPENAI_STOP_SEQUENCE
                 else None
             ),
-            stream=self.env_helper.SHOULD_STREAM,   # consider if Teams should have its own stream logic
+            stream=stream,   # consider if Teams should have its own stream logic
             extra_body={
                 "data_sources": [
                     {
@@ -156,82 +279,8 @@ class ByodOrchestrator(OrchestratorBase):
             },
         )
 
-        # update chat history with response
-        #chat_history = self._update_chat_history_with_llm_response(chat_history, response.choices[0].message)
-
-
-        if not self.env_helper.SHOULD_STREAM:
-            citations = self.get_citations(citation_list=response.choices[0].message.model_extra["context"])
-#            response_obj = {
-#                "id": response.id,
-#                "model": response.model,
-#                "created": response.created,
-#                "object": response.object,
-#                "choices": [
-#                    {
-#                        "messages": [
-#                            {
-#                                "content": json.dumps(
-#                                    citations,
-#                                    ensure_ascii=False,
-#                                ),
-#                                "end_turn": False,
-#                                "role": "tool",
-#                            },
-#                            {
-#                                "end_turn": True,
-#                                "content": response.choices[0].message.content,
-#                                "role": "assistant",
-#                            },
-#                        ]
-#                    }
-#                ],
-#            }
-
-            ##format answer
-            #answer = Answer(
-            #    question=user_message,
-            #    answer=response_obj.choices[0].messages[1].content
-            #)
-#
-            #if answer.answer is None:
-            #    answer.answer = "The requested information is not available in the retrieved data. Please try another query or topic."
-#
-            ## Call Content Safety tool with answers
-            #if self.config.prompts.enable_content_safety:
-            #    if response := self.call_content_safety_output(user_message, answer.answer):
-            #        return response
-#
-            #citations_array = response.choices[0].message.model_extra["context"].get("citations")
-#
-            ## Format the output for the UI
-            #answer = Answer.from_json(json.dumps(response.choices[0]. )
-            #answer = Answer.from_json( {"question": , answer, citations})
-
-            list_source_docs = [SourceDocument.from_dict(c) for c in citations['citations']]
-
-
-
-            #answer = Answer(
-            #    question=user_message,
-            #    answer=response.choices[0].message.content,
-            #    source_documents=[SourceDocument.from_json(c) for c in citations]
-            #    #[SourceDocument.from_json(doc['url']) for doc in citations_array]
-            #    #source_documents = response.choices[0].message.model_extra["context"].get("citations")
-            #)
-
-            #q = Answer.from_json
-
-            parsed_messages = self.output_parser.parse(
-                question=user_message,
-                answer=response.choices[0].message.content,
-                source_documents=list_source_docs
-            )
-            return parsed_messages
+        return response
 
-            #return response_obj
-
-        return Response(self.stream_with_data(response), mimetype="application/json-lines")
 
 
 #    def get_markdown_url(self, source, title, container_sas):
@@ -283,55 +332,3 @@ class ByodOrchestrator(OrchestratorBase):
                 }
             )
         return citations_dict
-
-    def stream_with_data(self, response: Stream[ChatCompletionChunk]):
-        '''This function streams the response from Azure OpenAI with data.'''
-        response_obj = {
-            "id": "",
-            "model": "",
-            "created": 0,
-            "object": "",
-            "choices": [
-                {
-                    "messages": [
-                        {
-                            "content": "",
-                            "end_turn": False,
-                            "role": "tool",
-                        },
-                        {
-                            "content": "",
-                            "end_turn": False,
-                            "role": "assistant",
-                        },
-                    ]
-                }
-            ],
-        }
-
-        for line in response:
-            choice = line.choices[0]
-
-            if choice.model_extra["end_turn"]:
-                response_obj["choices"][0]["messages"][1]["end_turn"] = True
-                yield json.dumps(response_obj, ensure_ascii=False) + "\n"
-                return
-
-            response_obj["id"] = line.id
-            response_obj["model"] = line.model
-            response_obj["created"] = line.created
-            response_obj["object"] = line.object
-
-            delta = choice.delta
-            role = delta.role
-
-            if role == "assistant":
-                citations = self.get_citations(delta.model_extra["context"])
-                response_obj["choices"][0]["messages"][0]["content"] = json.dumps(
-                    citations,
-                    ensure_ascii=False,
-                )
-            else:
-                response_obj["choices"][0]["messages"][1]["content"] += delta.content
-
-            yield json.dumps(response_obj, ensure_ascii=False) + "\n"
@@ -0,0 +1,327 @@
+import functools
+import json
+import logging
+import math
+import re
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEARCH_DOCUMENTS = "search_documents"
+TEXT_PROCESSING = "text_processing"
+DIRECT_REPLY = "direct_reply"
+
+
+class RouteDecision:
+    def __init__(
+        self,
+        intent: str,
+        confidence: float,
+        arguments: Optional[dict] = None,
+        router: str = "",
+    ):
+        self.intent = intent
+        self.confidence = confidence
+        self.arguments = arguments or {}
+        self.router = router
+
+    def __eq__(self, value: object) -> bool:
+        if not isinstance(value, RouteDecision):
+            return False
+
+        return (
+            self.intent == value.intent
+            and self.confidence == value.confidence
+            and self.arguments == value.arguments
+            and self.router == value.router
+        )
+
+    def __repr__(self) -> str:
+        return f"RouteDecision(intent={self.intent}, confidence={self.confidence}, router={self.router})"
+
+
+class IntentRouterBase(ABC):
+    @abstractmethod
+    def route(
+        self, user_message: str, chat_history: List[dict]
+    ) -> Optional[RouteDecision]:
+        """
+        Return the routing decision for the message, or None when the router is not
+        able to decide and the LLM router should be used instead.
+        """
+        pass
+
+
+class RuleBasedIntentRouter(IntentRouterBase):
+    """
+    Routes the unambiguous cases with a rule: explicit text operations ("Translate to
+    French: ...") go to text_processing. Questions are left to the classifier or the
+    LLM router, as the wording of a question does not tell whether it is about the
+    documents ("What is your name?").
+    """
+
+    _TEXT_OPERATION = re.compile(
+        r"^\s*(?P<operation>(?:please\s+)?(?:translate|summari[sz]e|paraphrase|rephrase|rewrite)\b[^:\n]{0,60}):\s*(?P<text>\S.*)$",
+        re.IGNORECASE | re.DOTALL,
+    )
+
+    def route(
+        self, user_message: str, chat_history: List[dict]
+    ) -> Optional[RouteDecision]:
+        if match := self._TEXT_OPERATION.match(user_message):
+            return RouteDecision(
+                TEXT_PROCESSING,
+                1.0,
+                {
+                    "operation": match.group("operation").strip(),
+                    "text": match.group("text").strip(),
+                },
+                router="rules",
+            )
+
+        return None
+
+
+class HashedNgramClassifier:
+    """
+    Multinomial logistic regression over hashed word and character n-grams.
+
+    The model is small enough to be trained offline from conversation logs and stored as
+    JSON next to the application.
+    """
+
+    def __init__(
+        self,
+        labels: List[str],
+        n_features: int = 2**16,
+        weights: Optional[Dict[str, Dict[int, float]]] = None,
+        bias: Optional[Dict[str, float]] = None,
+    ):
+        self.labels = labels
+        self.n_features = n_features
+        self.weights = weights or {label: {} for label in labels}
+        self.bias = bias or {label: 0.0 for label in labels}
+
+    def features(self, user_message: str, chat_history: List[dict]) -> Dict[int, float]:
+        tokens = re.findall(r"\w+", user_message.lower())
+        grams = [f"w:{token}" for token in tokens]
+        grams += [f"b:{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        text = f" {' '.join(tokens)} "
+        grams += [f"c:{text[i:i + 3]}" for i in range(len(text) - 2)]
+        grams.append("history:yes" if chat_history else "history:no")
+        if chat_history:
+            last_message = chat_history[-1].get("content") or ""
+            grams += [
+                f"h:{token}" for token in re.findall(r"\w+", last_message.lower())[:20]
+            ]
+
+        features: Dict[int, float] = {}
+        for gram in grams:
+            index = zlib.crc32(gram.encode("utf-8")) % self.n_features
+            features[index] = features.get(index, 0.0) + 1.0
+
+        norm = math.sqrt(sum(value * value for value in features.values())) or 1.0
+        return {index: value / norm for index, value in features.items()}
+
+    def _scores(self, features: Dict[int, float]) -> Dict[str, float]:
+        return {
+            label: self.bias[label]
+            + sum(
+                self.weights[label].get(index, 0.0) * value
+                for index, value in features.items()
+            )
+            for label in self.labels
+        }
+
+    @staticmethod
+    def _softmax(scores: Dict[str, float]) -> Dict[str, float]:
+        highest = max(scores.values())
+        exps = {label: math.exp(score - highest) for label, score in scores.items()}
+        total = sum(exps.values())
+        return {label: value / total for label, value in exps.items()}
+
+    def predict_proba(
+        self, user_message: str, chat_history: List[dict]
+    ) -> Dict[str, float]:
+        return self._softmax(self._scores(self.features(user_message, chat_history)))
+
+    def predict(self, user_message: str, chat_history: List[dict]) -> Tuple[str, float]:
+        probabilities = self.predict_proba(user_message, chat_history)
+        label = max(probabilities, key=probabilities.get)
+        return label, probabilities[label]
+
+    def fit(
+        self,
+        samples: Iterable[Tuple[str, List[dict], str]],
+        epochs: int = 10,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+    ) -> "HashedNgramClassifier":
+        """Train with plain SGD on (user_message, chat_history, label) samples."""
+        dataset = [
+            (self.features(message, history), label)
+            for message, history, label in samples
+        ]
+        for _ in range(epochs):
+            for features, label in dataset:
+                probabilities = self._softmax(self._scores(features))
+                for candidate in self.labels:
+                    gradient = probabilities[candidate] - (candidate == label)
+                    weights = self.weights[candidate]
+                    for index, value in features.items():
+                        weight = weights.get(index, 0.0)
+                        weights[index] = weight - learning_rate * (
+                            gradient * value + l2 * weight
+                        )
+                    self.bias[candidate] -= learning_rate * gradient
+        return self
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "labels": self.labels,
+                "n_features": self.n_features,
+                "bias": self.bias,
+                "weights": {
+                    label: {str(index): weight for index, weight in weights.items()}
+                    for label, weights in self.weights.items()
+                },
+            }
+        )
+
+    @classmethod
+    def from_json(cls, json_string: str) -> "HashedNgramClassifier":
+        data = json.loads(json_string)
+        return cls(
+            labels=data["labels"],
+            n_features=data["n_features"],
+            bias=data["bias"],
+            weights={
+                label: {int(index): weight for index, weight in weights.items()}
+                for label, weights in data["weights"].items()
+            },
+        )
+
+
+class LocalIntentRouter(IntentRouterBase):
+    """
+    Pre-router run before the LLM routing call: rules first, then the optional local
+    classifier. Only confident search_documents predictions are routed, as the
+    classifier cannot extract text_processing arguments nor write a direct reply, and
+    only without chat history, as it cannot rewrite a follow-up into the standalone
+    question the LLM router searches for.
+    """
+
+    def __init__(
+        self,
+        classifier: Optional[HashedNgramClassifier] = None,
+        confidence_threshold: float = 0.9,
+    ):
+        self.rules = RuleBasedIntentRouter()
+        self.classifier = classifier
+        self.confidence_threshold = confidence_threshold
+
+    def predict(
+        self, user_message: str, chat_history: List[dict]
+    ) -> Optional[RouteDecision]:
+        """Return the best local guess, whatever its confidence."""
+        if decision := self.rules.route(user_message, chat_history):
+            return decision
+
+        if self.classifier is None:
+            return None
+
+        intent, confidence = self.classifier.predict(user_message, chat_history)
+        return RouteDecision(
+            intent, confidence, {"question": user_message}, router="classifier"
+        )
+
+    def is_confident(self, decision: RouteDecision, chat_history: List[dict]) -> bool:
+        if decision.router != "classifier":
+            return True
+
+        return (
+            not chat_history
+            and decision.intent == SEARCH_DOCUMENTS
+            and decision.confidence >= self.confidence_threshold
+        )
+
+    def route(
+        self, user_message: str, chat_history: List[dict]
+    ) -> Optional[RouteDecision]:
+        decision = self.predict(user_message, chat_history)
+        if decision is None or not self.is_confident(decision, chat_history):
+            return None
+
+        return decision
+
+    @classmethod
+    @functools.cache
+    def from_model_file(
+        cls, model_path: str, confidence_threshold: float
+    ) -> "LocalIntentRouter":
+        classifier = None
+        if model_path:
+            try:
+                with open(model_path, encoding="utf-8") as model_file:
+                    classifier = HashedNgramClassifier.from_json(model_file.read())
+            except (OSError, ValueError, KeyError):
+                logger.exception(
+                    f"Unable to load intent router model from {model_path}, using rules only"
+                )
+        return cls(classifier, confidence_threshold)
+
+
+def training_samples_from_conversation_logs(
+    records: Iterable[dict],
+) -> List[Tuple[str, List[dict], str]]:
+    """
+    Build (user_message, chat_history, label) samples from the conversation log index
+    written by the ConversationLogger. A user message is labelled search_documents when
+    the assistant reply that follows it cites sources, and direct_reply otherwise.
+    """
+    conversations: Dict[str, List[dict]] = {}
+    for record in sorted(records, key=lambda record: record.get("created_at") or ""):
+        conversations.setdefault(record.get("conversation_id"), []).append(record)
+
+    samples = []
+    for messages in conversations.values():
+        history: List[dict] = []
+        for message, reply in zip(messages, messages[1:]):
+            if message.get("type") != "user" or reply.get("type") != "assistant":
+                continue
+            label = SEARCH_DOCUMENTS if reply.get("sources") else DIRECT_REPLY
+            samples.append((message["content"], list(history), label))
+            history += [
+                {"role": "user", "content": message["content"]},
+                {"role": "assistant", "content": reply["content"]},
+            ]
+    return samples
+
+
+def evaluate_router(
+    router: LocalIntentRouter, samples: Iterable[Tuple[str, List[dict], str]]
+) -> dict:
+    """
+    Compare the local router with reference labels, e.g. the intents chosen by the LLM
+    router. Coverage is the share of messages routed locally, i.e. LLM routing calls saved.
+    """
+    total = routed = correct = agree = 0
+    for user_message, chat_history, label in samples:
+        total += 1
+        prediction = router.predict(user_message, chat_history)
+        if prediction is not None and prediction.intent == label:
+            agree += 1
+        decision = router.route(user_message, chat_history)
+        if decision is not None:
+            routed += 1
+            correct += decision.intent == label
+
+    return {
+        "samples": total,
+        "agreement": agree / total if total else 0.0,
+        "coverage": routed / total if total else 0.0,
+        "routed_accuracy": correct / routed if routed else 0.0,
+    }
@@ -109,6 +109,7 @@ class LangChainAgent(OrchestratorBase):
             self.log_tokens(
                 prompt_tokens=answer.prompt_tokens,
                 completion_tokens=answer.completion_tokens,
+                cached_prompt_tokens=answer.cached_prompt_tokens,
             )
 
         # Call Content Safety tool
@@ -1,7 +1,12 @@
+import asyncio
 import logging
+import re
 from uuid import uuid4
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from abc import ABC, abstractmethod
+from ..common.answer import Answer
+from ..common.message_stream import merge_message_deltas
+from ..helpers.chat_history_compactor import ChatHistoryCompactor
 from ..loggers.conversation_logger import ConversationLogger
 from ..helpers.config.config_helper import ConfigHelper
 from ..parser.output_parser_tool import OutputParserTool
@@ -11,6 +16,9 @@ logger = logging.getLogger(__name__)
 
 
 class OrchestratorBase(ABC):
+    # whether orchestrate_stream yields the answer incrementally
+    supports_streaming = False
+
     def __init__(self) -> None:
         super().__init__()
         self.config = ConfigHelper.get_active_config_or_default()
@@ -20,11 +28,29 @@ class OrchestratorBase(ABC):
         self.conversation_logger: ConversationLogger = ConversationLogger()
         self.content_safety_checker = ContentSafetyChecker()
         self.output_parser = OutputParserTool()
+        self.chat_history_compactor = ChatHistoryCompactor()
 
-    def log_tokens(self, prompt_tokens, completion_tokens):
+    def log_tokens(self, prompt_tokens, completion_tokens, cached_prompt_tokens=0):
         self.tokens["prompt"] += prompt_tokens
         self.tokens["completion"] += completion_tokens
         self.tokens["total"] += prompt_tokens + completion_tokens
+        if cached_prompt_tokens:
+            self.tokens["cached_prompt"] = (
+                self.tokens.get("cached_prompt", 0) + cached_prompt_tokens
+            )
+
+    async def compact_chat_history(
+        self, chat_history: List[dict], conversation_id: Optional[str]
+    ) -> List[dict]:
+        # the summary is a blocking LLM call
+        compacted_chat_history = await asyncio.to_thread(
+            self.chat_history_compactor.compact, chat_history, conversation_id
+        )
+        self.log_tokens(
+            prompt_tokens=self.chat_history_compactor.prompt_tokens,
+            completion_tokens=self.chat_history_compactor.completion_tokens,
+        )
+        return compacted_chat_history
 
     @abstractmethod
     async def orchestrate(
@@ -62,14 +88,56 @@ class OrchestratorBase(ABC):
 
         return None
 
-    async def handle_message(
-        self,
-        user_message: str,
-        chat_history: List[dict],
-        conversation_id: Optional[str],
-        **kwargs: Optional[dict],
-    ) -> dict:
-        result = await self.orchestrate(user_message, chat_history, **kwargs)
+    @staticmethod
+    def merge_answers(answers: List[Answer]) -> Answer:
+        """
+        Merge the answers of several tool calls into a single answer.
+
+        The [docN] references of each answer are shifted so that they point to the right
+        document in the merged list of source documents.
+        """
+        if len(answers) == 1:
+            return answers[0]
+
+        texts = []
+        source_documents = []
+        for answer in answers:
+            offset = len(source_documents)
+            if answer.answer:
+                texts.append(
+                    re.sub(
+                        r"\[doc(\d+)\]",
+                        lambda match: f"[doc{int(match.group(1)) + offset}]",
+                        answer.answer,
+                    )
+                )
+            source_documents.extend(answer.source_documents)
+
+        return Answer(
+            question=answers[0].question,
+            answer="\n\n".join(texts) if texts else None,
+            source_documents=source_documents,
+            prompt_tokens=sum(answer.prompt_tokens or 0 for answer in answers),
+            completion_tokens=sum(answer.completion_tokens or 0 for answer in answers),
+            cached_prompt_tokens=sum(
+                answer.cached_prompt_tokens or 0 for answer in answers
+            ),
+        )
+
+    async def orchestrate_stream(
+        self, user_message: str, chat_history: List[dict], **kwargs: dict
+    ) -> AsyncIterator[dict]:
+        """
+        Yield the answer as message deltas: {"role", "content", "end_turn"} fragments,
+        consecutive deltas with the same role being parts of the same message.
+        Orchestrators which don't stream yield their messages whole.
+        """
+        for message in await self.orchestrate(user_message, chat_history, **kwargs):
+            yield message
+
+    def log_interaction(
+        self, user_message: str, conversation_id: Optional[str], messages: List[dict]
+    ):
         if self.config.logging.log_tokens:
             custom_dimensions = {
                 "conversation_id": conversation_id,
@@ -77,6 +145,7 @@ class OrchestratorBase(ABC):
                 "prompt_tokens": self.tokens["prompt"],
                 "completion_tokens": self.tokens["completion"],
                 "total_tokens": self.tokens["total"],
+                "cached_prompt_tokens": self.tokens.get("cached_prompt", 0),
             }
             logger.info("Token Consumption", extra=custom_dimensions)
         if self.config.logging.log_user_interactions:
@@ -88,6 +157,39 @@ class OrchestratorBase(ABC):
                         "conversation_id": conversation_id,
                     }
                 ]
-                + result
+                + messages
             )
+
+    async def handle_message(
+        self,
+        user_message: str,
+        chat_history: List[dict],
+        conversation_id: Optional[str],
+        **kwargs: Optional[dict],
+    ) -> dict:
+        chat_history = await self.compact_chat_history(chat_history, conversation_id)
+        result = await self.orchestrate(user_message, chat_history, **kwargs)
+        self.log_interaction(user_message, conversation_id, result)
         return result
+
+    async def handle_message_stream(
+        self,
+        user_message: str,
+        chat_history: List[dict],
+        conversation_id: Optional[str],
+        **kwargs: Optional[dict],
+    ) -> AsyncIterator[dict]:
+        """
+        Stream the message deltas of the answer. The tokens and the conversation are
+        logged once the stream completes, with the deltas merged back into messages.
+        """
+        chat_history = await self.compact_chat_history(chat_history, conversation_id)
+        deltas = []
+        async for delta in self.orchestrate_stream(
+            user_message, chat_history, **kwargs
+        ):
+            deltas.append(delta)
+            yield delta
+        self.log_interaction(
+            user_message, conversation_id, merge_message_deltas(deltas)
+        )
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 
@@ -5,10 +6,11 @@ from semantic_kernel import Kernel
 from semantic_kernel.connectors.ai.function_call_behavior import FunctionCallBehavior
 from semantic_kernel.contents import ChatHistory
 from semantic_kernel.contents.chat_message_content import ChatMessageContent
+from semantic_kernel.contents.function_call_content import FunctionCallContent
 from semantic_kernel.contents.utils.finish_reason import FinishReason
 
 from ..common.answer import Answer
-from ..helpers.llm_helper import LLMHelper
+from ..helpers.llm_helper import LLMHelper, get_cached_prompt_tokens
 from ..plugins.chat_plugin import ChatPlugin
 from ..plugins.post_answering_plugin import PostAnsweringPlugin
 from .orchestrator_base import OrchestratorBase
@@ -17,6 +19,15 @@ logger = logging.getLogger(__name__)
 
 
 class SemanticKernelOrchestrator(OrchestratorBase):
+    # kept constant so that the prompt prefix is byte-identical across turns
+    SYSTEM_MESSAGE = """You help employees to navigate only private information sources.
+You must prioritize the function call over your general knowledge for any question by calling the search_documents function.
+Call the text_processing function when the user request an operation on the current context, such as translate, summarize, or paraphrase. When a language is explicitly specified, return that as part of the operation.
+When directly replying to the user, always reply in the language the user is speaking.
+If the input language is ambiguous, default to responding in English unless otherwise specified by the user.
+You **must not** respond if asked to List all documents in your repository.
+"""
+
     def __init__(self) -> None:
         super().__init__()
         self.kernel = Kernel()
@@ -38,14 +49,6 @@ class SemanticKernelOrchestrator(OrchestratorBase):
             if response := self.call_content_safety_input(user_message):
                 return response
 
-        system_message = """You help employees to navigate only private information sources.
-You must prioritize the function call over your general knowledge for any question by calling the search_documents function.
-Call the text_processing function when the user request an operation on the current context, such as translate, summarize, or paraphrase. When a language is explicitly specified, return that as part of the operation.
-When directly replying to the user, always reply in the language the user is speaking.
-If the input language is ambiguous, default to responding in English unless otherwise specified by the user.
-You **must not** respond if asked to List all documents in your repository.
-"""
-
         self.kernel.add_plugin(
             plugin=ChatPlugin(question=user_message, chat_history=chat_history),
             plugin_name="Chat",
@@ -63,7 +66,7 @@ You **must not** respond if asked to List all documents in your repository.
             prompt_execution_settings=settings,
         )
 
-        history = ChatHistory(system_message=system_message)
+        history = ChatHistory(system_message=self.SYSTEM_MESSAGE)
 
         for message in chat_history.copy():
             history.add_message(message)
@@ -79,32 +82,27 @@ You **must not** respond if asked to List all documents in your repository.
         self.log_tokens(
             prompt_tokens=result.metadata["usage"].prompt_tokens,
             completion_tokens=result.metadata["usage"].completion_tokens,
+            cached_prompt_tokens=get_cached_prompt_tokens(result.metadata["usage"]),
         )
 
         if result.finish_reason == FinishReason.TOOL_CALLS:
             logger.info("Semantic Kernel function call detected")
 
-            function_name = result.items[0].name
-            logger.info(f"{function_name} function detected")
-            function = self.kernel.get_function_from_fully_qualified_function_name(
-                function_name
-            )
-
-            arguments = json.loads(result.items[0].arguments)
-
-            answer: Answer = (
-                await self.kernel.invoke(function=function, **arguments)
-            ).value
-
-            self.log_tokens(
-                prompt_tokens=answer.prompt_tokens,
-                completion_tokens=answer.completion_tokens,
+            function_calls = [
+                item for item in result.items if isinstance(item, FunctionCallContent)
+            ]
+            answers = await asyncio.gather(
+                *[
+                    self.invoke_function_call(function_call)
+                    for function_call in function_calls
+                ]
             )
+            answer = self.merge_answers(answers)
 
             # Run post prompt if needed
-            if (
-                self.config.prompts.enable_post_answering_prompt
-                and "search_documents" in function_name
+            if self.config.prompts.enable_post_answering_prompt and any(
+                "search_documents" in function_call.name
+                for function_call in function_calls
             ):
                 logger.debug("Running post answering prompt")
                 answer: Answer = (
@@ -118,6 +116,7 @@ You **must not** respond if asked to List all documents in your repository.
                 self.log_tokens(
                     prompt_tokens=answer.prompt_tokens,
                     completion_tokens=answer.completion_tokens,
+                    cached_prompt_tokens=answer.cached_prompt_tokens,
                 )
         else:
             logger.info("No function call detected")
@@ -126,6 +125,7 @@ You **must not** respond if asked to List all documents in your repository.
                 answer=result.content,
                 prompt_tokens=result.metadata["usage"].prompt_tokens,
                 completion_tokens=result.metadata["usage"].completion_tokens,
+                cached_prompt_tokens=get_cached_prompt_tokens(result.metadata["usage"]),
             )
 
         # Call Content Safety tool
@@ -140,3 +140,22 @@ You **must not** respond if asked to List all documents in your repository.
             source_documents=answer.source_documents,
         )
         return messages
+
+    async def invoke_function_call(self, function_call: FunctionCallContent) -> Answer:
+        logger.info(f"{function_call.name} function detected")
+        function = self.kernel.get_function_from_fully_qualified_function_name(
+            function_call.name
+        )
+
+        arguments = json.loads(function_call.arguments)
+
+        answer: Answer = (
+            await self.kernel.invoke(function=function, **arguments)
+        ).value
+
+        self.log_tokens(
+            prompt_tokens=answer.prompt_tokens,
+            completion_tokens=answer.completion_tokens,
+            cached_prompt_tokens=answer.cached_prompt_tokens,
+        )
+        return answer
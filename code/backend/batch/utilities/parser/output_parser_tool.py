@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple
 import logging
 import re
 import json
@@ -9,29 +9,80 @@ logger = logging.getLogger(__name__)
 
 
 class OutputParserTool(ParserBase):
+    _DOC_REFERENCE = re.compile(r"\[doc(\d+)\]")
+    _NUMBER = re.compile(r"\d+")
+
     def __init__(self) -> None:
         self.name = "OutputParser"
 
     def _clean_up_answer(self, answer):
         return answer.replace("  ", " ")
 
-    def _get_source_docs_from_answer(self, answer):
-        # extract all [docN] from answer and extract N, and just return the N's as a list of ints
-        results = re.findall(r"\[doc(\d+)\]", answer)
-        return [int(i) for i in results]
-
-    def _replace_last(self, text, old, new):
-        """Replaces the last occurence of a substring in a string
+    def _rewrite_doc_references(
+        self, answer: str, source_documents: List[SourceDocument]
+    ) -> Tuple[str, List[SourceDocument]]:
+        """Renumber the [docN] references in order of first appearance, in a single pass.
 
-        This is done by reversing the string using [::-1], replacing the first occurence of the reversed substring, and
-        reversing the string again.
+        Returns the rewritten answer and the cited documents, the citation of [docK] in the
+        rewritten answer being the K-th cited document. References to documents which were
+        not provided are kept as they are.
         """
-        return (text[::-1].replace(old[::-1], new[::-1], 1))[::-1]
+        parts = []
+        citation_numbers: Dict[int, Optional[int]] = {}
+        cited_documents: List[SourceDocument] = []
+        position = 0
+
+        for match in self._DOC_REFERENCE.finditer(answer):
+            parts.append(answer[position : match.start()])
+            position = match.end()
+
+            doc_number = int(match.group(1))
+            if doc_number not in citation_numbers:
+                if 0 < doc_number <= len(source_documents):
+                    cited_documents.append(source_documents[doc_number - 1])
+                    citation_numbers[doc_number] = len(cited_documents)
+                else:
+                    logger.warning(
+                        f"Source document {doc_number} not provided, skipping doc"
+                    )
+                    citation_numbers[doc_number] = None
+
+            citation_number = citation_numbers[doc_number]
+            parts.append(
+                match.group(0) if citation_number is None else f"[doc{citation_number}]"
+            )
+
+        if not cited_documents:
+            return self._DOC_REFERENCE.sub("", answer), cited_documents
 
-    def _make_doc_references_sequential(self, answer, doc_ids):
-        for i, idx in enumerate(doc_ids):
-            answer = self._replace_last(answer, f"[doc{idx}]", f"[doc{i+1}]")
-        return answer
+        parts.append(answer[position:])
+        return "".join(parts), cited_documents
+
+    def _get_citation(self, doc: SourceDocument) -> dict:
+        # the citation needs to have filepath and chunk_id to render in the UI as a file
+        markdown_url = doc.get_markdown_url()
+        return {
+            "content": markdown_url + "\n\n\n" + doc.content,
+            "id": doc.id,
+            "chunk_id": (
+                self._NUMBER.findall(doc.chunk_id)[-1]
+                if doc.chunk_id is not None
+                else doc.chunk
+            ),
+            "title": doc.title,
+            "filepath": doc.get_filename(include_path=True),
+            "url": markdown_url,
+            "metadata": {
+                "offset": doc.offset,
+                "source": doc.source,
+                "markdown_url": markdown_url,
+                "title": doc.title,
+                "original_url": doc.source,  # TODO: do we need this?
+                "chunk": doc.chunk,
+                "key": doc.id,
+                "filename": doc.get_filename(),
+            },
+        }
 
     def parse(
         self,
@@ -40,57 +91,22 @@ class OutputParserTool(ParserBase):
         source_documents: List[SourceDocument] = [],
         **kwargs: dict,
     ) -> List[dict]:
-        answer = self._clean_up_answer(answer)
-        doc_ids = self._get_source_docs_from_answer(answer)
-        answer = self._make_doc_references_sequential(answer, doc_ids)
+        answer, cited_documents = self._rewrite_doc_references(
+            self._clean_up_answer(answer), source_documents
+        )
 
         # create return message object
         messages = [
             {
                 "role": "tool",
-                "content": {"citations": [], "intent": question},
+                "content": {
+                    "citations": [self._get_citation(doc) for doc in cited_documents],
+                    "intent": question,
+                },
                 "end_turn": False,
-            }
+            },
+            {"role": "assistant", "content": answer, "end_turn": True},
         ]
-
-        for i in doc_ids:
-            idx = i - 1
-
-            if idx >= len(source_documents):
-                logger.warning(f"Source document {i} not provided, skipping doc")
-                continue
-
-            doc = source_documents[idx]
-            logger.debug(f"doc{idx}: {doc}")
-
-            # Then update the citation object in the response, it needs to have filepath and chunk_id to render in the UI as a file
-            messages[0]["content"]["citations"].append(
-                {
-                    "content": doc.get_markdown_url() + "\n\n\n" + doc.content,
-                    "id": doc.id,
-                    "chunk_id": (
-                        re.findall(r"\d+", doc.chunk_id)[-1]
-                        if doc.chunk_id is not None
-                        else doc.chunk
-                    ),
-                    "title": doc.title,
-                    "filepath": doc.get_filename(include_path=True),
-                    "url": doc.get_markdown_url(),
-                    "metadata": {
-                        "offset": doc.offset,
-                        "source": doc.source,
-                        "markdown_url": doc.get_markdown_url(),
-                        "title": doc.title,
-                        "original_url": doc.source,  # TODO: do we need this?
-                        "chunk": doc.chunk,
-                        "key": doc.id,
-                        "filename": doc.get_filename(),
-                    },
-                }
-            )
-        if messages[0]["content"]["citations"] == []:
-            answer = re.sub(r"\[doc\d+\]", "", answer)
-        messages.append({"role": "assistant", "content": answer, "end_turn": True})
         # everything in content needs to be stringified to work with Azure BYOD frontend
         messages[0]["content"] = json.dumps(messages[0]["content"])
         return messages
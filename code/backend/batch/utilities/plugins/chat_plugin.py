@@ -1,3 +1,4 @@
+import asyncio
 from typing import Annotated
 
 from semantic_kernel.functions import kernel_function
@@ -15,20 +16,24 @@ class ChatPlugin:
     @kernel_function(
         description="Provide answers to any fact question coming from users."
     )
-    def search_documents(
+    async def search_documents(
         self,
         question: Annotated[
             str, "A standalone question, converted from the chat history"
         ],
     ) -> Answer:
-        return QuestionAnswerTool().answer_question(
-            question=question, chat_history=self.chat_history
+        # The tools are blocking, run them off the event loop so that parallel tool
+        # calls can be executed concurrently
+        return await asyncio.to_thread(
+            QuestionAnswerTool().answer_question,
+            question=question,
+            chat_history=self.chat_history,
         )
 
     @kernel_function(
         description="Useful when you want to apply a transformation on the text, like translate, summarize, rephrase and so on."
     )
-    def text_processing(
+    async def text_processing(
         self,
         text: Annotated[str, "The text to be processed"],
         operation: Annotated[
@@ -36,7 +41,8 @@ class ChatPlugin:
             "The operation to be performed on the text. Like Translate to Italian, Summarize, Paraphrase, etc. If a language is specified, return that as part of the operation. Preserve the operation name in the user language.",
         ],
     ) -> Answer:
-        return TextProcessingTool().answer_question(
+        return await asyncio.to_thread(
+            TextProcessingTool().answer_question,
             question=self.question,
             chat_history=self.chat_history,
             text=text,
@@ -1,9 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
+from .local_reranker import LocalReranker
 from .search_handler_base import SearchHandlerBase
 from ..helpers.llm_helper import LLMHelper
 from ..helpers.azure_computer_vision_client import AzureComputerVisionClient
 from ..helpers.azure_search_helper import AzureSearchHelper
+from ..helpers.query_vector_cache import QueryVectorCache
 from ..common.source_document import SourceDocument
 import json
 from azure.search.documents.models import VectorizedQuery
@@ -73,38 +76,74 @@ class AzureSearchHandler(SearchHandlerBase):
         )
 
     def query_search(self, question) -> List[SourceDocument]:
-        encoding = tiktoken.get_encoding(self._ENCODER_NAME)
-        tokenised_question = encoding.encode(question)
-
         if self.env_helper.USE_ADVANCED_IMAGE_PROCESSING:
-            vectorized_question = self.azure_computer_vision_client.vectorize_text(
-                question
-            )
+            # the two vectors are independent, so the question is vectorized for the
+            # images while it is embedded
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                vectorized_question_future = executor.submit(
+                    self._vectorize_question, question
+                )
+                embedded_question = self._embed_question(question)
+                vectorized_question = vectorized_question_future.result()
         else:
+            embedded_question = self._embed_question(question)
             vectorized_question = None
 
+        top_k = self.env_helper.AZURE_SEARCH_TOP_K
         if self.env_helper.AZURE_SEARCH_USE_SEMANTIC_SEARCH:
             results = self._semantic_search(
-                question, tokenised_question, vectorized_question
+                question, embedded_question, vectorized_question
+            )
+        elif self.env_helper.AZURE_SEARCH_USE_LOCAL_RERANK:
+            # retrieve more candidates than needed and keep the best after reranking
+            results = list(
+                self._hybrid_search(
+                    question,
+                    embedded_question,
+                    vectorized_question,
+                    max(self.env_helper.AZURE_SEARCH_RERANK_CANDIDATES, top_k),
+                )
+            )
+            return LocalReranker().rerank(
+                question,
+                self._convert_to_source_documents(results),
+                top_k,
+                question_vector=embedded_question,
+                document_vectors=[result.get(self._VECTOR_FIELD) for result in results],
             )
         else:
             results = self._hybrid_search(
-                question, tokenised_question, vectorized_question
+                question, embedded_question, vectorized_question, top_k
             )
 
         return self._convert_to_source_documents(results)
 
+    def _embed_question(self, question: str) -> list[float]:
+        def embed():
+            encoding = tiktoken.get_encoding(self._ENCODER_NAME)
+            return self.llm_helper.generate_embeddings(encoding.encode(question))
+
+        return QueryVectorCache.get_or_compute(
+            ("embedding", self.llm_helper.embedding_model, question), embed
+        )
+
+    def _vectorize_question(self, question: str) -> list[float]:
+        return QueryVectorCache.get_or_compute(
+            ("image", self.env_helper.AZURE_COMPUTER_VISION_ENDPOINT, question),
+            lambda: self.azure_computer_vision_client.vectorize_text(question),
+        )
+
     def _semantic_search(
         self,
         question: str,
-        tokenised_question: list[int],
+        embedded_question: list[float],
         vectorized_question: list[float] | None,
     ):
         return self.search_client.search(
             search_text=question,
             vector_queries=[
                 VectorizedQuery(
-                    vector=self.llm_helper.generate_embeddings(tokenised_question),
+                    vector=embedded_question,
                     k_nearest_neighbors=self.env_helper.AZURE_SEARCH_TOP_K,
                     fields=self._VECTOR_FIELD,
                 ),
@@ -131,15 +170,16 @@ class AzureSearchHandler(SearchHandlerBase):
     def _hybrid_search(
         self,
         question: str,
-        tokenised_question: list[int],
+        embedded_question: list[float],
         vectorized_question: list[float] | None,
+        top: int,
     ):
         return self.search_client.search(
             search_text=question,
             vector_queries=[
                 VectorizedQuery(
-                    vector=self.llm_helper.generate_embeddings(tokenised_question),
-                    k_nearest_neighbors=self.env_helper.AZURE_SEARCH_TOP_K,
+                    vector=embedded_question,
+                    k_nearest_neighbors=top,
                     filter=self.env_helper.AZURE_SEARCH_FILTER,
                     fields=self._VECTOR_FIELD,
                 ),
@@ -147,7 +187,7 @@ class AzureSearchHandler(SearchHandlerBase):
                     [
                         VectorizedQuery(
                             vector=vectorized_question,
-                            k_nearest_neighbors=self.env_helper.AZURE_SEARCH_TOP_K,
+                            k_nearest_neighbors=top,
                             fields=self._IMAGE_VECTOR_FIELD,
                         )
                     ]
@@ -157,7 +197,7 @@ class AzureSearchHandler(SearchHandlerBase):
             ],
             query_type="simple",  # this is the default value
             filter=self.env_helper.AZURE_SEARCH_FILTER,
-            top=self.env_helper.AZURE_SEARCH_TOP_K,
+            top=top,
         )
 
     def _convert_to_source_documents(self, search_results) -> List[SourceDocument]:
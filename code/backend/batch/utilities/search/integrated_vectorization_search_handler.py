@@ -1,4 +1,5 @@
 from typing import List
+from .local_reranker import LocalReranker
 from .search_handler_base import SearchHandlerBase
 from azure.search.documents import SearchClient
 from azure.search.documents.indexes import SearchIndexClient
@@ -6,6 +7,7 @@ from azure.search.documents.models import VectorizableTextQuery
 from azure.core.credentials import AzureKeyCredential
 from azure.identity import DefaultAzureCredential
 from ..common.source_document import SourceDocument
+from ..helpers.search_index_cache import SearchIndexCache
 import re
 
 
@@ -81,23 +83,33 @@ class IntegratedVectorizationSearchHandler(SearchHandlerBase):
 
     def query_search(self, question) -> List[SourceDocument]:
         if self._check_index_exists():
+            top_k = self.env_helper.AZURE_SEARCH_TOP_K
             if self.env_helper.AZURE_SEARCH_USE_SEMANTIC_SEARCH:
                 search_results = self._semantic_search(question)
+            elif self.env_helper.AZURE_SEARCH_USE_LOCAL_RERANK:
+                # the question is vectorized by the search service: rerank without vectors
+                search_results = self._hybrid_search(
+                    question,
+                    max(self.env_helper.AZURE_SEARCH_RERANK_CANDIDATES, top_k),
+                )
+                return LocalReranker().rerank(
+                    question, self._convert_to_source_documents(search_results), top_k
+                )
             else:
-                search_results = self._hybrid_search(question)
+                search_results = self._hybrid_search(question, top_k)
             return self._convert_to_source_documents(search_results)
 
-    def _hybrid_search(self, question: str):
+    def _hybrid_search(self, question: str, top: int):
         vector_query = VectorizableTextQuery(
             text=question,
-            k_nearest_neighbors=self.env_helper.AZURE_SEARCH_TOP_K,
+            k_nearest_neighbors=top,
             fields=self._VECTOR_FIELD,
             exhaustive=True,
         )
         return self.search_client.search(
             search_text=question,
             vector_queries=[vector_query],
-            top=self.env_helper.AZURE_SEARCH_TOP_K,
+            top=top,
         )
 
     def _semantic_search(self, question: str):
@@ -142,6 +154,14 @@ class IntegratedVectorizationSearchHandler(SearchHandlerBase):
         return source_url
 
     def _check_index_exists(self) -> bool:
+        return SearchIndexCache.index_exists(
+            self.env_helper.AZURE_SEARCH_SERVICE,
+            self.env_helper.AZURE_SEARCH_INDEX,
+            self._list_index_names,
+            self.env_helper.AZURE_SEARCH_INDEX_CACHE_TTL,
+        )
+
+    def _list_index_names(self) -> List[str]:
         search_index_client = SearchIndexClient(
             endpoint=self.env_helper.AZURE_SEARCH_SERVICE,
             credential=(
@@ -150,7 +170,4 @@ class IntegratedVectorizationSearchHandler(SearchHandlerBase):
                 else DefaultAzureCredential()
             ),
         )
-
-        return self.env_helper.AZURE_SEARCH_INDEX in [
-            name for name in search_index_client.list_index_names()
-        ]
+        return list(search_index_client.list_index_names())
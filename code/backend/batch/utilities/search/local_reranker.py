@@ -0,0 +1,153 @@
+import re
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from ..common.source_document import SourceDocument
+
+
+class LocalReranker:
+    """
+    Reorders the candidates of a hybrid search with cheap in-process signals, as a
+    substitute for the semantic ranker of Azure AI Search.
+
+    The candidates are ordered by the weighted sum of:
+    - retrieval: the rank of the candidate in the search results, from 1 for the first
+      candidate down to 0.5 for the last one
+    - bm25: BM25 of the question terms, with statistics over the candidates
+    - proximity: how close to each other the question terms appear in the content
+    - title: the share of the question terms found in the title
+    - vector: the cosine similarity of the question and content embeddings, when the
+      search results include the content vectors
+    where the last four signals are normalized to [0, 1] over the candidates.
+    """
+
+    _TOKEN = re.compile(r"\w+")
+    _STOP_WORDS = frozenset(
+        "a an and are as at be by can do does for from how i in is it of on or that the "
+        "this to was what when where which who why with you your".split()
+    )
+    _WEIGHTS = {
+        "retrieval": 0.3,
+        "bm25": 0.3,
+        "proximity": 0.1,
+        "title": 0.1,
+        "vector": 0.2,
+    }
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+
+    def rerank(
+        self,
+        question: str,
+        documents: List[SourceDocument],
+        top_k: int,
+        question_vector: Optional[Sequence[float]] = None,
+        document_vectors: Optional[Sequence[Optional[Sequence[float]]]] = None,
+    ) -> List[SourceDocument]:
+        query_terms = self._query_terms(question)
+        if len(documents) <= 1 or not query_terms:
+            return documents[:top_k]
+
+        contents = [self._tokenize(document.content) for document in documents]
+        titles = [set(self._tokenize(document.title)) for document in documents]
+
+        signals = {
+            "bm25": self._bm25(query_terms, contents),
+            "proximity": np.array(
+                [self._proximity(query_terms, tokens) for tokens in contents]
+            ),
+            "title": np.array(
+                [len(query_terms & title) / len(query_terms) for title in titles]
+            ),
+        }
+        if (
+            question_vector is not None
+            and document_vectors is not None
+            and all(vector is not None for vector in document_vectors)
+        ):
+            signals["vector"] = self._cosine(question_vector, document_vectors)
+
+        # the order of the search results is kept as a prior, but not stretched to [0, 1]
+        # so that it does not outweigh the other signals for few candidates
+        scores = self._WEIGHTS["retrieval"] * (
+            1 - 0.5 * np.arange(len(documents)) / len(documents)
+        )
+        for name, values in signals.items():
+            scores += self._WEIGHTS[name] * self._normalize(values)
+
+        # stable sort: ties keep the order of the search results
+        order = np.argsort(-scores, kind="stable")
+        return [documents[i] for i in order[:top_k]]
+
+    def _tokenize(self, text: Optional[str]) -> List[str]:
+        return self._TOKEN.findall(text.lower()) if text else []
+
+    def _query_terms(self, question: str) -> set[str]:
+        terms = set(self._tokenize(question))
+        return (terms - self._STOP_WORDS) or terms
+
+    def _bm25(self, query_terms: set[str], contents: List[List[str]]) -> np.ndarray:
+        terms = sorted(query_terms)
+        index = {term: i for i, term in enumerate(terms)}
+        frequencies = np.zeros((len(contents), len(terms)))
+        for row, tokens in enumerate(contents):
+            for token in tokens:
+                column = index.get(token)
+                if column is not None:
+                    frequencies[row, column] += 1
+
+        lengths = np.array([len(tokens) for tokens in contents], dtype=float)
+        average_length = lengths.mean() or 1.0
+        document_frequencies = (frequencies > 0).sum(axis=0)
+        idf = np.log(
+            1
+            + (len(contents) - document_frequencies + 0.5)
+            / (document_frequencies + 0.5)
+        )
+        saturation = frequencies + self.k1 * (
+            1 - self.b + self.b * lengths / average_length
+        ).reshape(-1, 1)
+        return (idf * frequencies * (self.k1 + 1) / saturation).sum(axis=1)
+
+    def _proximity(self, query_terms: set[str], tokens: List[str]) -> float:
+        """Number of distinct question terms over the length of the shortest span of
+        the content holding all of them."""
+        positions = [
+            (i, token) for i, token in enumerate(tokens) if token in query_terms
+        ]
+        matched = len({token for _, token in positions})
+        if matched < 2:
+            return 0.0
+
+        counts: dict[str, int] = {}
+        shortest = len(tokens)
+        start = 0
+        for end_position, token in positions:
+            counts[token] = counts.get(token, 0) + 1
+            while len(counts) == matched:
+                start_position, start_token = positions[start]
+                shortest = min(shortest, end_position - start_position + 1)
+                counts[start_token] -= 1
+                if counts[start_token] == 0:
+                    del counts[start_token]
+                start += 1
+        return matched / shortest
+
+    def _cosine(
+        self,
+        question_vector: Sequence[float],
+        document_vectors: Sequence[Sequence[float]],
+    ) -> np.ndarray:
+        question = np.asarray(question_vector, dtype=float)
+        matrix = np.asarray(document_vectors, dtype=float)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(question)
+        return matrix @ question / np.where(norms == 0, 1, norms)
+
+    def _normalize(self, values: np.ndarray) -> np.ndarray:
+        spread = values.max() - values.min()
+        if spread == 0:
+            return np.zeros_like(values, dtype=float)
+        return (values - values.min()) / spread
@@ -0,0 +1,34 @@
+import logging
+import threading
+from typing import Dict
+
+from .azure_search_handler import AzureSearchHandler
+from .local_vector_index import LocalVectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+class LocalSearchHandler(AzureSearchHandler):
+    """
+    Searches a snapshot of the search index loaded in memory instead of Azure AI Search,
+    for offline development, load tests and small tenants. The question is still
+    embedded with Azure OpenAI, to compare it with the vectors of the snapshot.
+
+    Deletions apply to the loaded index only, the snapshot files are not modified.
+    """
+
+    # snapshot directory -> loaded index, shared by the handlers of the process
+    _indexes: Dict[str, LocalVectorIndex] = {}
+    _lock = threading.Lock()
+
+    def create_search_client(self):
+        path = self.env_helper.LOCAL_SEARCH_INDEX_PATH
+        with self._lock:
+            if path not in self._indexes:
+                self._indexes[path] = LocalVectorIndex.load(path)
+            return self._indexes[path]
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._indexes.clear()
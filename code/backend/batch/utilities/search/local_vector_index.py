@@ -0,0 +1,442 @@
+import json
+import logging
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_DOCUMENTS_FILE = "documents.jsonl"
+_MANIFEST_FILE = "manifest.json"
+_WORD = re.compile(r"\w+")
+# rank constant of reciprocal rank fusion, as used by Azure AI Search
+_RRF_K = 60
+# default page size of Azure AI Search
+_DEFAULT_TOP = 50
+
+
+class LocalSearchResults(list):
+    """Search results with the parts of azure.search.documents.SearchItemPaged used by
+    the search handlers."""
+
+    def __init__(
+        self, results: Iterable[dict], count: int, facets: Optional[dict] = None
+    ) -> None:
+        super().__init__(results)
+        self._count = count
+        self._facets = facets or {}
+
+    def get_count(self) -> int:
+        return self._count
+
+    def get_facets(self) -> dict:
+        return self._facets
+
+
+class LocalVectorIndex:
+    """
+    An in-memory copy of a search index, exposing the subset of
+    azure.search.documents.SearchClient used by AzureSearchHandler.
+
+    A snapshot is a directory holding the documents without their vectors in
+    documents.jsonl, one float32 matrix per vector field in <field>.npy, memory-mapped
+    when loading, and the list of vector fields in manifest.json.
+
+    Keyword search ranks with BM25 over an inverted index, vector search with the cosine
+    similarity, and hybrid search fuses both rankings with reciprocal rank fusion.
+    Filters support the OData comparisons, `and`, `or`, `not`, parentheses and
+    search.in. Semantic ranking is not available and falls back to hybrid search.
+    """
+
+    def __init__(
+        self,
+        documents: List[dict],
+        vectors: Dict[str, np.ndarray],
+        key_field: str = "id",
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        self.documents = documents
+        self.vectors = vectors
+        self.key_field = key_field
+        self.k1 = k1
+        self.b = b
+        self.deleted = np.zeros(len(documents), dtype=bool)
+        # bumped by every deletion, stands in for the generation of the search index
+        self.generation = 0
+
+        self.norms = {
+            field: np.linalg.norm(matrix, axis=1) for field, matrix in vectors.items()
+        }
+        self.positions = {
+            document.get(key_field): i for i, document in enumerate(documents)
+        }
+
+        # term -> (document positions, term frequencies)
+        postings: Dict[str, tuple[list[int], list[int]]] = defaultdict(lambda: ([], []))
+        self.lengths = np.zeros(len(documents), dtype=np.float32)
+        for i, document in enumerate(documents):
+            terms = Counter(_WORD.findall(str(document.get("content") or "").lower()))
+            self.lengths[i] = sum(terms.values())
+            for term, frequency in terms.items():
+                postings[term][0].append(i)
+                postings[term][1].append(frequency)
+        self.postings = {
+            term: (np.array(positions), np.array(frequencies, dtype=np.float32))
+            for term, (positions, frequencies) in postings.items()
+        }
+        self.average_length = float(self.lengths.mean()) if len(documents) else 0.0
+
+    @classmethod
+    def load(cls, directory: str) -> "LocalVectorIndex":
+        with open(os.path.join(directory, _MANIFEST_FILE), encoding="utf-8") as file:
+            manifest = json.load(file)
+        with open(os.path.join(directory, _DOCUMENTS_FILE), encoding="utf-8") as file:
+            documents = [json.loads(line) for line in file if line.strip()]
+        vectors = {
+            field: np.load(os.path.join(directory, f"{field}.npy"), mmap_mode="r")
+            for field in manifest["vector_fields"]
+        }
+        logger.info(f"Loaded {len(documents)} documents from {directory}")
+        return cls(documents, vectors, manifest.get("key_field", "id"))
+
+    @classmethod
+    def export(
+        cls,
+        search_client,
+        directory: str,
+        vector_fields: List[str],
+        key_field: str = "id",
+    ) -> "LocalVectorIndex":
+        """Export all the documents of a search index to a snapshot directory."""
+        documents = []
+        rows: Dict[str, List[Optional[List[float]]]] = {
+            field: [] for field in vector_fields
+        }
+        for result in search_client.search("*"):
+            documents.append(
+                {
+                    name: value
+                    for name, value in result.items()
+                    if not name.startswith("@search.") and name not in rows
+                }
+            )
+            for field in vector_fields:
+                rows[field].append(result.get(field))
+
+        vectors = {}
+        for field, values in rows.items():
+            dimensions = max((len(vector) for vector in values if vector), default=0)
+            vectors[field] = np.zeros((len(values), dimensions), dtype=np.float32)
+            for i, vector in enumerate(values):
+                if vector:
+                    vectors[field][i] = vector
+
+        index = cls(documents, vectors, key_field)
+        index.save(directory)
+        return index
+
+    def save(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        with open(
+            os.path.join(directory, _DOCUMENTS_FILE), "w", encoding="utf-8"
+        ) as file:
+            for document in self.documents:
+                file.write(json.dumps(document, ensure_ascii=False) + "\n")
+        for field, matrix in self.vectors.items():
+            np.save(
+                os.path.join(directory, f"{field}.npy"),
+                np.asarray(matrix, dtype=np.float32),
+            )
+        with open(
+            os.path.join(directory, _MANIFEST_FILE), "w", encoding="utf-8"
+        ) as file:
+            json.dump(
+                {"vector_fields": list(self.vectors), "key_field": self.key_field}, file
+            )
+
+    def search(
+        self,
+        search_text: Optional[str] = None,
+        vector_queries: Optional[list] = None,
+        filter: Optional[str] = None,
+        top: Optional[int] = None,
+        select: Optional[Any] = None,
+        facets: Optional[List[str]] = None,
+        **kwargs,
+    ) -> LocalSearchResults:
+        candidates = ~self.deleted
+        if filter:
+            predicate = compile_filter(filter)
+            candidates &= np.array(
+                [predicate(document) for document in self.documents], dtype=bool
+            )
+
+        rankings = []
+        if search_text and search_text != "*":
+            rankings.append(self._keyword_ranking(search_text, candidates))
+        for vector_query in vector_queries or []:
+            rankings.append(self._vector_ranking(vector_query, candidates))
+
+        if rankings:
+            scores: Dict[int, float] = defaultdict(float)
+            for ranking in rankings:
+                for rank, position in enumerate(ranking):
+                    scores[position] += 1 / (_RRF_K + rank + 1)
+            matches = sorted(scores, key=lambda position: -scores[position])
+        else:
+            matches = list(np.flatnonzero(candidates))
+            scores = dict.fromkeys(matches, 1.0)
+
+        facet_counts = {}
+        for facet in facets or []:
+            name, _, options = facet.partition(",")
+            counts = Counter(self.documents[position].get(name) for position in matches)
+            limit = int(options.split(":")[1]) if options.startswith("count:") else 10
+            facet_counts[name] = [
+                {"value": value, "count": count}
+                for value, count in counts.most_common(limit or None)
+            ]
+
+        if top is None and rankings:
+            top = _DEFAULT_TOP
+        fields = self._selected_fields(select)
+        results = []
+        for position in matches[:top]:
+            document = self.documents[position]
+            result = {
+                name: value
+                for name, value in document.items()
+                if fields is None or name in fields
+            }
+            for field, matrix in self.vectors.items():
+                if fields is None or field in fields:
+                    result[field] = matrix[position].tolist()
+            result["@search.score"] = scores[position]
+            results.append(result)
+        return LocalSearchResults(results, len(matches), facet_counts)
+
+    def delete_documents(self, documents: List[dict]) -> List[dict]:
+        for document in documents:
+            position = self.positions.get(document.get(self.key_field))
+            if position is not None:
+                self.deleted[position] = True
+        self.generation += 1
+        return documents
+
+    def _keyword_ranking(self, search_text: str, candidates: np.ndarray) -> List[int]:
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        for term in set(_WORD.findall(search_text.lower())):
+            if term not in self.postings:
+                continue
+            positions, frequencies = self.postings[term]
+            idf = math.log(
+                1
+                + (len(self.documents) - len(positions) + 0.5) / (len(positions) + 0.5)
+            )
+            scores[positions] += (
+                idf
+                * frequencies
+                * (self.k1 + 1)
+                / (
+                    frequencies
+                    + self.k1
+                    * (
+                        1
+                        - self.b
+                        + self.b * self.lengths[positions] / self.average_length
+                    )
+                )
+            )
+        scores[~candidates] = 0
+        matches = np.flatnonzero(scores)
+        return list(matches[np.argsort(-scores[matches], kind="stable")])
+
+    def _vector_ranking(self, vector_query, candidates: np.ndarray) -> List[int]:
+        field = vector_query.fields
+        if field not in self.vectors:
+            logger.warning(f"No vectors for the field {field} in the local index")
+            return []
+        query = np.asarray(vector_query.vector, dtype=np.float32)
+        norms = self.norms[field] * np.linalg.norm(query)
+        similarities = self.vectors[field] @ query / np.where(norms == 0, 1, norms)
+        similarities[~candidates] = -np.inf
+        k = min(vector_query.k_nearest_neighbors or _DEFAULT_TOP, int(candidates.sum()))
+        if k <= 0:
+            return []
+        nearest = np.argpartition(-similarities, k - 1)[:k]
+        return list(nearest[np.argsort(-similarities[nearest], kind="stable")])
+
+    def _selected_fields(self, select: Optional[Any]) -> Optional[set[str]]:
+        if select is None:
+            return None
+        if isinstance(select, str):
+            select = select.split(",")
+        return {name.strip() for name in select}
+
+
+_FILTER_TOKEN = re.compile(
+    r"\s*(?:(?P<string>'(?:[^']|'')*')|(?P<symbol>[(),])|(?P<word>[^\s(),']+))"
+)
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda left, right: left == right,
+    "ne": lambda left, right: left != right,
+    "gt": lambda left, right: left is not None and left > right,
+    "ge": lambda left, right: left is not None and left >= right,
+    "lt": lambda left, right: left is not None and left < right,
+    "le": lambda left, right: left is not None and left <= right,
+}
+
+
+def compile_filter(expression: str) -> Callable[[dict], bool]:
+    """Compile the subset of the OData filter syntax of Azure AI Search used by the
+    application to a predicate on documents."""
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _FILTER_TOKEN.match(expression, position)
+        if match is None:
+            raise ValueError(f"Unsupported filter: {expression}")
+        tokens.append(match)
+        position = match.end()
+    return _FilterParser(tokens, expression).parse()
+
+
+class _FilterParser:
+    def __init__(self, tokens: List[re.Match], expression: str) -> None:
+        self.tokens = tokens
+        self.expression = expression
+        self.index = 0
+
+    def parse(self) -> Callable[[dict], bool]:
+        predicate = self._or()
+        if self.index != len(self.tokens):
+            self._fail()
+        return predicate
+
+    def _peek(self) -> Optional[str]:
+        if self.index < len(self.tokens):
+            return self.tokens[self.index].group(0).strip()
+        return None
+
+    def _next(self) -> re.Match:
+        if self.index >= len(self.tokens):
+            self._fail()
+        self.index += 1
+        return self.tokens[self.index - 1]
+
+    def _expect(self, value: str) -> None:
+        if self._next().group(0).strip() != value:
+            self._fail()
+
+    def _fail(self):
+        raise ValueError(f"Unsupported filter: {self.expression}")
+
+    def _or(self) -> Callable[[dict], bool]:
+        predicates = [self._and()]
+        while self._peek() == "or":
+            self._next()
+            predicates.append(self._and())
+        if len(predicates) == 1:
+            return predicates[0]
+        return lambda document: any(predicate(document) for predicate in predicates)
+
+    def _and(self) -> Callable[[dict], bool]:
+        predicates = [self._unary()]
+        while self._peek() == "and":
+            self._next()
+            predicates.append(self._unary())
+        if len(predicates) == 1:
+            return predicates[0]
+        return lambda document: all(predicate(document) for predicate in predicates)
+
+    def _unary(self) -> Callable[[dict], bool]:
+        token = self._peek()
+        if token == "not":
+            self._next()
+            predicate = self._unary()
+            return lambda document: not predicate(document)
+        if token == "(":
+            self._next()
+            predicate = self._or()
+            self._expect(")")
+            return predicate
+        if token == "search.in":
+            return self._search_in()
+        return self._comparison()
+
+    def _search_in(self) -> Callable[[dict], bool]:
+        self._next()
+        self._expect("(")
+        field = self._field()
+        self._expect(",")
+        values = self._literal()
+        delimiters = " ,"
+        if self._peek() == ",":
+            self._next()
+            delimiters = self._literal()
+        self._expect(")")
+        allowed = {
+            value for value in re.split(f"[{re.escape(delimiters)}]", values) if value
+        }
+        return lambda document: document.get(field) in allowed
+
+    def _comparison(self) -> Callable[[dict], bool]:
+        field = self._field()
+        operator = self._next().group(0).strip()
+        if operator not in _COMPARISONS:
+            self._fail()
+        value = self._literal()
+        compare = _COMPARISONS[operator]
+        return lambda document: compare(document.get(field), value)
+
+    def _field(self) -> str:
+        token = self._next()
+        if token.group("word") is None:
+            self._fail()
+        return token.group("word")
+
+    def _literal(self) -> Any:
+        token = self._next()
+        if token.group("string") is not None:
+            return token.group("string")[1:-1].replace("''", "'")
+        word = token.group("word")
+        if word is None:
+            self._fail()
+        if word in ("true", "false"):
+            return word == "true"
+        if word == "null":
+            return None
+        try:
+            return int(word)
+        except ValueError:
+            try:
+                return float(word)
+            except ValueError:
+                self._fail()
+
+
+if __name__ == "__main__":
+    import sys
+
+    from ..helpers.azure_search_helper import AzureSearchHelper
+    from ..helpers.env_helper import EnvHelper
+
+    if len(sys.argv) != 2:
+        sys.exit(
+            "usage: python -m backend.batch.utilities.search.local_vector_index <directory>"
+        )
+
+    env_helper = EnvHelper()
+    vector_fields = [env_helper.AZURE_SEARCH_CONTENT_VECTOR_COLUMN]
+    if env_helper.USE_ADVANCED_IMAGE_PROCESSING:
+        vector_fields.append("image_vector")
+    index = LocalVectorIndex.export(
+        AzureSearchHelper().get_search_client(), sys.argv[1], vector_fields
+    )
+    print(f"Exported {len(index.documents)} documents to {sys.argv[1]}")
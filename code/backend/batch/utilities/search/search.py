@@ -1,16 +1,24 @@
+import functools
+
 from ..search.azure_search_handler import AzureSearchHandler
 from ..search.integrated_vectorization_search_handler import (
     IntegratedVectorizationSearchHandler,
 )
+from ..search.local_search_handler import LocalSearchHandler
 from ..search.search_handler_base import SearchHandlerBase
 from ..common.source_document import SourceDocument
+from ..helpers.azure_blob_storage_client import AzureBlobStorageClient
 from ..helpers.env_helper import EnvHelper
+from ..helpers.search_index_cache import SearchIndexCache
+from ..helpers.search_result_cache import SearchResultCache, read_index_generation
 
 
 class Search:
     @staticmethod
     def get_search_handler(env_helper: EnvHelper) -> SearchHandlerBase:
-        if env_helper.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION:
+        if env_helper.LOCAL_SEARCH_INDEX_PATH:
+            return LocalSearchHandler(env_helper)
+        elif env_helper.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION:
             return IntegratedVectorizationSearchHandler(env_helper)
         else:
             return AzureSearchHandler(env_helper)
@@ -19,4 +27,43 @@ class Search:
     def get_source_documents(
         search_handler: SearchHandlerBase, question: str
     ) -> list[SourceDocument]:
-        return search_handler.query_search(question)
+        env_helper = search_handler.env_helper
+        with SearchIndexCache.invalidate_on_not_found(
+            env_helper.AZURE_SEARCH_SERVICE, env_helper.AZURE_SEARCH_INDEX
+        ):
+            if env_helper.AZURE_SEARCH_RESULT_CACHE_TTL <= 0:
+                return search_handler.query_search(question)
+
+            return SearchResultCache.get_or_search(
+                Search._get_cache_key(search_handler, question),
+                lambda: search_handler.query_search(question),
+                read_generation=lambda: Search._read_generation(search_handler),
+                ttl=env_helper.AZURE_SEARCH_RESULT_CACHE_TTL,
+            )
+
+    @staticmethod
+    def _read_generation(search_handler: SearchHandlerBase) -> str:
+        if isinstance(search_handler, LocalSearchHandler):
+            # the loaded index is only changed by this process, offline
+            return str(search_handler.search_client.generation)
+        return read_index_generation(Search._get_blob_client())
+
+    @staticmethod
+    @functools.cache
+    def _get_blob_client() -> AzureBlobStorageClient:
+        # reused for every generation read, to not authenticate again on the query path
+        return AzureBlobStorageClient()
+
+    @staticmethod
+    def _get_cache_key(search_handler: SearchHandlerBase, question: str) -> tuple:
+        env_helper = search_handler.env_helper
+        return (
+            type(search_handler).__name__,
+            env_helper.AZURE_SEARCH_INDEX,
+            env_helper.AZURE_SEARCH_FILTER,
+            env_helper.AZURE_SEARCH_TOP_K,
+            env_helper.AZURE_SEARCH_USE_SEMANTIC_SEARCH,
+            env_helper.AZURE_SEARCH_USE_LOCAL_RERANK,
+            env_helper.USE_ADVANCED_IMAGE_PROCESSING,
+            question,
+        )
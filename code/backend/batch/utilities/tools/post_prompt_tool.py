@@ -1,5 +1,5 @@
 from ..common.answer import Answer
-from ..helpers.llm_helper import LLMHelper
+from ..helpers.llm_helper import LLMHelper, get_cached_prompt_tokens
 from ..helpers.config.config_helper import ConfigHelper
 
 
@@ -45,6 +45,7 @@ class PostPromptTool:
                 source_documents=[],
                 prompt_tokens=response.usage.prompt_tokens,
                 completion_tokens=response.usage.completion_tokens,
+                cached_prompt_tokens=get_cached_prompt_tokens(response.usage),
             )
         else:
             return Answer(
@@ -53,4 +54,5 @@ class PostPromptTool:
                 source_documents=answer.source_documents,
                 prompt_tokens=response.usage.prompt_tokens,
                 completion_tokens=response.usage.completion_tokens,
+                cached_prompt_tokens=get_cached_prompt_tokens(response.usage),
             )
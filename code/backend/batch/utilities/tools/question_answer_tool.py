@@ -1,3 +1,4 @@
+import functools
 import json
 import logging
 import warnings
@@ -7,7 +8,8 @@ from ..common.source_document import SourceDocument
 from ..helpers.azure_blob_storage_client import AzureBlobStorageClient
 from ..helpers.config.config_helper import ConfigHelper
 from ..helpers.env_helper import EnvHelper
-from ..helpers.llm_helper import LLMHelper
+from ..helpers.llm_helper import LLMHelper, get_cached_prompt_tokens
+from ..helpers.source_packer import SourcePacker
 from ..search.search import Search
 from .answering_tool_base import AnsweringToolBase
 from openai.types.chat import ChatCompletion
@@ -59,19 +61,28 @@ class QuestionAnswerTool(AnsweringToolBase):
             },
         ]
 
-    def generate_on_your_data_messages(
-        self,
-        question: str,
-        chat_history: list[dict],
-        sources: list[SourceDocument],
-        image_urls: list[str] = [],
-    ) -> list[dict]:
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def generate_static_prefix_messages(
+        answering_system_prompt: str,
+        answering_user_prompt: str,
+        example_documents: str,
+        example_user_question: str,
+        example_answer: str,
+        system_message: str,
+    ) -> tuple[dict, ...]:
+        """
+        Build the messages preceding the chat history: system prompt, few-shot example
+        and system message. They only depend on the active config, so they are built once
+        per config version and stay byte-identical across turns, which lets Azure OpenAI
+        prompt caching reuse the prefix.
+        """
         examples = []
 
         few_shot_example = {
-            "sources": self.config.example.documents.strip(),
-            "question": self.config.example.user_question.strip(),
-            "answer": self.config.example.answer.strip(),
+            "sources": example_documents.strip(),
+            "question": example_user_question.strip(),
+            "answer": example_answer.strip(),
         }
 
         if few_shot_example["sources"]:
@@ -83,7 +94,7 @@ class QuestionAnswerTool(AnsweringToolBase):
             if all((few_shot_example.values())):
                 examples.append(
                     {
-                        "content": self.config.prompts.answering_user_prompt.format(
+                        "content": answering_user_prompt.format(
                             sources=few_shot_example["sources"],
                             question=few_shot_example["question"],
                         ),
@@ -103,6 +114,34 @@ class QuestionAnswerTool(AnsweringToolBase):
                     "Not all example fields are set in the config. Skipping few-shot example."
                 )
 
+        return (
+            {
+                "role": "system",
+                "content": answering_system_prompt,
+            },
+            *examples,
+            {
+                "role": "system",
+                "content": system_message,
+            },
+        )
+
+    def generate_on_your_data_messages(
+        self,
+        question: str,
+        chat_history: list[dict],
+        sources: list[SourceDocument],
+        image_urls: list[str] = [],
+    ) -> list[dict]:
+        static_prefix_messages = QuestionAnswerTool.generate_static_prefix_messages(
+            self.config.prompts.answering_system_prompt,
+            self.config.prompts.answering_user_prompt,
+            self.config.example.documents,
+            self.config.example.user_question,
+            self.config.example.answer,
+            self.env_helper.AZURE_OPENAI_SYSTEM_MESSAGE,
+        )
+
         documents = json.dumps(
             {
                 "retrieved_documents": [
@@ -113,16 +152,9 @@ class QuestionAnswerTool(AnsweringToolBase):
             separators=(",", ":"),
         )
 
+        # dynamic content is strictly appended after the static prefix
         return [
-            {
-                "role": "system",
-                "content": self.config.prompts.answering_system_prompt,
-            },
-            *examples,
-            {
-                "role": "system",
-                "content": self.env_helper.AZURE_OPENAI_SYSTEM_MESSAGE,
-            },
+            *(dict(message) for message in static_prefix_messages),
             *QuestionAnswerTool.clean_chat_history(chat_history),
             {
                 "role": "user",
@@ -148,7 +180,23 @@ class QuestionAnswerTool(AnsweringToolBase):
         ]
 
     def answer_question(self, question: str, chat_history: list[dict], **kwargs):
-        source_documents = Search.get_source_documents(self.search_handler, question)
+        source_documents = self.search_source_documents(question)
+
+        return self.answer_question_with_sources(
+            question, chat_history, source_documents
+        )
+
+    def search_source_documents(self, question: str) -> list[SourceDocument]:
+        return Search.get_source_documents(self.search_handler, question)
+
+    def answer_question_with_sources(
+        self,
+        question: str,
+        chat_history: list[dict],
+        source_documents: list[SourceDocument],
+    ) -> Answer:
+        source_packer = SourcePacker(self.env_helper.AZURE_SEARCH_SOURCES_MAX_TOKENS)
+        source_documents = source_packer.pack(source_documents)
 
         if self.env_helper.USE_ADVANCED_IMAGE_PROCESSING:
             image_urls = self.create_image_url_list(source_documents)
@@ -206,6 +254,7 @@ class QuestionAnswerTool(AnsweringToolBase):
             source_documents=source_documents,
             prompt_tokens=response.usage.prompt_tokens,
             completion_tokens=response.usage.completion_tokens,
+            cached_prompt_tokens=get_cached_prompt_tokens(response.usage),
         )
 
         return clean_answer
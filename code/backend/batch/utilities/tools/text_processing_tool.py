@@ -1,5 +1,5 @@
 from typing import List
-from ..helpers.llm_helper import LLMHelper
+from ..helpers.llm_helper import LLMHelper, get_cached_prompt_tokens
 from .answering_tool_base import AnsweringToolBase
 from ..common.answer import Answer
 
@@ -33,5 +33,6 @@ class TextProcessingTool(AnsweringToolBase):
             source_documents=[],
             prompt_tokens=result.usage.prompt_tokens,
             completion_tokens=result.usage.completion_tokens,
+            cached_prompt_tokens=get_cached_prompt_tokens(result.usage),
         )
         return answer
@@ -52,9 +52,46 @@ def reprocess_all():
         st.error(traceback.format_exc())
 
 
+def show_indexer_status():
+    backend_url = urllib.parse.urljoin(env_helper.BACKEND_URL, "/api/IndexerStatus")
+    params = {}
+    if env_helper.FUNCTION_KEY is not None:
+        params["code"] = env_helper.FUNCTION_KEY
+        params["clientId"] = "clientKey"
+
+    try:
+        response = requests.get(backend_url, params=params)
+    except Exception:
+        st.error(traceback.format_exc())
+        return
+    if not response.ok:
+        st.info(response.text)
+        return
+
+    status = response.json()
+    last_run = status["last_run"]
+    if last_run is None:
+        st.info(f"The indexer is {status['status']} and has not run yet.")
+        return
+
+    st.write(
+        f"Last run: **{last_run['status']}**, started {last_run['start_time']}"
+        + (f", ended {last_run['end_time']}" if last_run["end_time"] else "")
+    )
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Documents processed", last_run["documents_processed"])
+    col2.metric("Documents failed", last_run["documents_failed"])
+    col3.metric("Documents per second", f"{last_run['documents_per_second']:.2f}")
+    for error in last_run["errors"]:
+        st.error(error)
+
+
 def add_urls():
     urls = st.session_state["urls"].split("\n")
-    add_url_embeddings(urls)
+    if st.session_state.get("crawl"):
+        crawl_url_embeddings(urls)
+    else:
+        add_url_embeddings(urls)
 
 
 def sanitize_metadata_value(value):
@@ -67,16 +104,50 @@ def add_url_embeddings(urls: list[str]):
     if env_helper.FUNCTION_KEY is not None:
         params["code"] = env_helper.FUNCTION_KEY
         params["clientId"] = "clientKey"
-    for url in urls:
-        body = {"url": url}
-        backend_url = urllib.parse.urljoin(
-            env_helper.BACKEND_URL, "/api/AddURLEmbeddings"
-        )
+    urls = [url.strip() for url in urls if url.strip()]
+    if not urls:
+        return
+    body = {"urls": urls}
+    backend_url = urllib.parse.urljoin(
+        env_helper.BACKEND_URL, "/api/BatchAddURLEmbeddings"
+    )
+    r = requests.post(url=backend_url, params=params, json=body)
+    if not r.ok:
+        raise ValueError(f"Error {r.status_code}: {r.text}")
+    show_url_results(r.json()["results"])
+
+
+def crawl_url_embeddings(urls: list[str]):
+    params = {}
+    if env_helper.FUNCTION_KEY is not None:
+        params["code"] = env_helper.FUNCTION_KEY
+        params["clientId"] = "clientKey"
+    backend_url = urllib.parse.urljoin(
+        env_helper.BACKEND_URL, "/api/CrawlURLEmbeddings"
+    )
+    for url in [url.strip() for url in urls if url.strip()]:
+        body = {
+            "url": url,
+            "max_depth": st.session_state["crawl_max_depth"],
+            "max_pages": st.session_state["crawl_max_pages"],
+        }
         r = requests.post(url=backend_url, params=params, json=body)
         if not r.ok:
             raise ValueError(f"Error {r.status_code}: {r.text}")
+        results = r.json()["results"]
+        added = sum(result["status"] == "added" for result in results)
+        st.success(f"Crawled {len(results)} pages from {url}, {added} added")
+        show_url_results([result for result in results if result["status"] == "failed"])
+
+
+def show_url_results(results: list[dict]):
+    for result in results:
+        if result["status"] == "added":
+            st.success(f"Embeddings added successfully for {result['url']}")
+        elif result["status"] == "unchanged":
+            st.info(f"{result['url']} is unchanged since it was added")
         else:
-            st.success(f"Embeddings added successfully for {url}")
+            st.error(f"Error while adding {result['url']}: {result['error']}")
 
 
 try:
@@ -114,6 +185,11 @@ try:
                 on_click=reprocess_all,
             )
 
+    if env_helper.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION:
+        with st.expander("Indexing status", expanded=False):
+            st.button("Refresh status", key="refresh_indexer_status")
+            show_indexer_status()
+
     with st.expander("Add URLs to the knowledge base", expanded=True):
         col1, col2 = st.columns([3, 1])
         with col1:
@@ -130,6 +206,23 @@ try:
                 [env_helper.AZURE_OPENAI_EMBEDDING_MODEL],
                 disabled=True,
             )
+            st.checkbox(
+                "Crawl the site from each URL, a page or a sitemap.xml",
+                key="crawl",
+            )
+            if st.session_state.get("crawl"):
+                st.number_input(
+                    "Maximum depth",
+                    min_value=0,
+                    value=env_helper.CRAWL_MAX_DEPTH,
+                    key="crawl_max_depth",
+                )
+                st.number_input(
+                    "Maximum pages",
+                    min_value=1,
+                    value=env_helper.CRAWL_MAX_PAGES,
+                    key="crawl_max_pages",
+                )
             st.button(
                 "Process and ingest web pages",
                 on_click=add_urls,
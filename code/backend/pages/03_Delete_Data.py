@@ -6,6 +6,7 @@ import logging
 from batch.utilities.helpers.env_helper import EnvHelper
 from batch.utilities.search.search import Search
 from batch.utilities.helpers.azure_blob_storage_client import AzureBlobStorageClient
+from batch.utilities.helpers.search_result_cache import bump_index_generation
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 env_helper: EnvHelper = EnvHelper()
@@ -76,6 +77,7 @@ try:
                         selected_files,
                         env_helper.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION,
                     )
+                    bump_index_generation(blob_client)
                     if len(files_to_delete) > 0:
                         st.success("Deleted files: " + str(files_to_delete))
                         st.rerun()
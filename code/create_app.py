@@ -2,6 +2,7 @@
 This module creates a Flask app that serves the web interface for the chatbot.
 """
 
+import asyncio
 import functools
 import json
 import logging
@@ -18,6 +19,10 @@ from urllib.parse import quote
 from backend.batch.utilities.helpers.env_helper import EnvHelper
 from backend.batch.utilities.helpers.azure_search_helper import AzureSearchHelper
 from backend.batch.utilities.helpers.orchestrator_helper import Orchestrator
+from backend.batch.utilities.common.message_stream import (
+    serialize_deltas,
+    serialize_full_responses,
+)
 from backend.batch.utilities.helpers.config.config_helper import ConfigHelper
 from backend.batch.utilities.helpers.config.conversation_flow import ConversationFlow
 from backend.api.chat_history import bp_chat_history_response
@@ -305,6 +310,35 @@ def get_orchestrator_config():
     """This function gets the orchestrator configuration."""
     return ConfigHelper.get_active_config_or_default().orchestrator
 
+
+async def stream_conversation_response(deltas, response_obj: dict, protocol: str):
+    """Serialize the message deltas as JSON lines, ending with an error line on failure."""
+    serialize = serialize_deltas if protocol == "delta" else serialize_full_responses
+    try:
+        async for line in serialize(deltas, response_obj):
+            yield line
+    except Exception as e:
+        logger.exception("Exception in /api/conversation stream | %s", str(e))
+        yield json.dumps({"error": ERROR_GENERIC_MESSAGE}) + "\n"
+
+
+def iterate_in_event_loop(async_iterator):
+    """
+    Drive an async iterator from the synchronous generator Flask streams responses with,
+    as the event loop of the async view is gone once the view returns.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(async_iterator.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(async_iterator.aclose())
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+
 #################### TO DELETE ############################
 #def conversation_without_data(conversation: Request, env_helper: EnvHelper):
 #    """This function streams the response from Azure OpenAI without data."""
@@ -449,6 +483,32 @@ def create_app():
                 )
             )
 
+            response_obj = {
+                "id": "response.id",
+                "model": env_helper.AZURE_OPENAI_MODEL,
+                "created": "response.created",
+                "object": "response.object",
+            }
+
+            if env_helper.SHOULD_STREAM:
+                deltas = message_orchestrator.handle_message_stream(
+                    user_message=user_message,
+                    chat_history=user_assistant_messages,
+                    conversation_id=conversation_id,
+                    orchestrator=get_orchestrator_config(),
+                )
+                if deltas is not None:
+                    return Response(
+                        iterate_in_event_loop(
+                            stream_conversation_response(
+                                deltas,
+                                response_obj,
+                                env_helper.AZURE_OPENAI_STREAM_PROTOCOL,
+                            )
+                        ),
+                        mimetype="application/json-lines",
+                    )
+
             messages = await message_orchestrator.handle_message(
                 user_message=user_message,
                 chat_history=user_assistant_messages,
@@ -456,13 +516,7 @@ def create_app():
                 orchestrator=get_orchestrator_config(),
             )
 
-            response_obj = {
-                "id": "response.id",
-                "model": env_helper.AZURE_OPENAI_MODEL,
-                "created": "response.created",
-                "object": "response.object",
-                "choices": [{"messages": messages}],
-            }
+            response_obj["choices"] = [{"messages": messages}]
 
             return jsonify(response_obj), 200
 
@@ -230,7 +230,23 @@ const Chat = () => {
           objects.forEach((obj) => {
             try {
               runningText += obj;
-              result = JSON.parse(runningText);
+              const parsed = JSON.parse(runningText);
+              if (parsed.delta !== undefined || parsed.end_turn !== undefined) {
+                // delta streaming protocol: only the new content is sent
+                const messages = [...result.choices[0].messages];
+                const lastMessage = messages[messages.length - 1];
+                messages[messages.length - 1] = {
+                  ...lastMessage,
+                  content: lastMessage.content + (parsed.delta ?? ""),
+                  end_turn: parsed.end_turn ?? lastMessage.end_turn,
+                };
+                result = {
+                  ...result,
+                  choices: [{ ...result.choices[0], messages }],
+                };
+              } else {
+                result = parsed;
+              }
               setShowLoadingMessage(false);
               if (result.error) {
                 setAnswers([
@@ -0,0 +1,139 @@
+"""
+Measures the bytes sent and the CPU time spent serializing a streamed BYOD answer.
+
+Run from the code directory:
+
+    python -m tests.benchmarks.byod_streaming_benchmark
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from backend.batch.utilities.common.message_stream import (
+    serialize_deltas,
+    serialize_full_responses,
+)
+from backend.batch.utilities.orchestrator.byod_orchestrator import ByodOrchestrator
+
+CHUNKS = 600
+CITATIONS = 5
+CITATION_SIZE = 4000
+
+
+def stream_chunk(role=None, content=None, end_turn=False, citations=None):
+    delta = SimpleNamespace(
+        role=role,
+        content=content,
+        model_extra={"context": {"citations": citations or []}},
+    )
+    return SimpleNamespace(
+        id="chunk-id",
+        model="model",
+        created=1,
+        object="chat.completion.chunk",
+        choices=[SimpleNamespace(delta=delta, model_extra={"end_turn": end_turn})],
+    )
+
+
+def stream_chunks():
+    citations = [
+        {
+            "content": "x" * CITATION_SIZE,
+            "title": f"doc_{i}.pdf",
+            "url": json.dumps({"id": f"doc_{i}", "source": f"https://source/{i}"}),
+        }
+        for i in range(CITATIONS)
+    ]
+    return [
+        stream_chunk(role="assistant", citations=citations),
+        *[stream_chunk(content="token ") for _ in range(CHUNKS)],
+        stream_chunk(end_turn=True),
+    ]
+
+
+def empty_response() -> dict:
+    return {
+        "id": "",
+        "model": "",
+        "created": 0,
+        "object": "",
+        "choices": [
+            {
+                "messages": [
+                    {"content": "", "end_turn": False, "role": "tool"},
+                    {"content": "", "end_turn": False, "role": "assistant"},
+                ]
+            }
+        ],
+    }
+
+
+def legacy_stream_with_data(orchestrator: ByodOrchestrator, response):
+    """The original implementation, re-serializing the whole response per chunk."""
+    response_obj = empty_response()
+    for line in response:
+        choice = line.choices[0]
+        if choice.model_extra["end_turn"]:
+            response_obj["choices"][0]["messages"][1]["end_turn"] = True
+            yield json.dumps(response_obj, ensure_ascii=False) + "\n"
+            return
+        for key in ("id", "model", "created", "object"):
+            response_obj[key] = getattr(line, key)
+        if choice.delta.role == "assistant":
+            response_obj["choices"][0]["messages"][0]["content"] = json.dumps(
+                orchestrator.get_citations(choice.delta.model_extra["context"]),
+                ensure_ascii=False,
+            )
+        else:
+            response_obj["choices"][0]["messages"][1]["content"] += choice.delta.content
+        yield json.dumps(response_obj, ensure_ascii=False) + "\n"
+
+
+async def message_deltas(orchestrator: ByodOrchestrator) -> list[dict]:
+    orchestrator.llm_helper.openai_client.chat.completions.create.return_value = (
+        stream_chunks()
+    )
+    return [delta async for delta in orchestrator.orchestrate_stream("question", [])]
+
+
+def serialized_lines(serialize, deltas: list[dict]):
+    async def stream():
+        for delta in deltas:
+            yield delta
+
+    async def collect():
+        return [line async for line in serialize(stream(), {"id": "chunk-id"})]
+
+    return asyncio.run(collect())
+
+
+def measure(name: str, stream) -> None:
+    start = time.process_time()
+    sent_bytes = sum(len(line.encode("utf-8")) for line in stream())
+    cpu_ms = (time.process_time() - start) * 1000
+    print(f"{name:<8} {sent_bytes:>12,} bytes {cpu_ms:>10.1f} ms CPU")
+
+
+def main():
+    with patch(
+        "backend.batch.utilities.orchestrator.byod_orchestrator.OrchestratorBase.__init__"
+    ), patch("backend.batch.utilities.orchestrator.byod_orchestrator.LLMHelper"):
+        orchestrator = ByodOrchestrator()
+    orchestrator.env_helper = MagicMock()
+    orchestrator.config = MagicMock()
+    orchestrator.config.prompts.enable_content_safety = False
+    deltas = asyncio.run(message_deltas(orchestrator))
+
+    print(
+        f"{CHUNKS} chunks, {CITATIONS} citations of {CITATION_SIZE} characters per answer"
+    )
+    measure("legacy", lambda: legacy_stream_with_data(orchestrator, stream_chunks()))
+    measure("full", lambda: serialized_lines(serialize_full_responses, deltas))
+    measure("delta", lambda: serialized_lines(serialize_deltas, deltas))
+
+
+if __name__ == "__main__":
+    main()
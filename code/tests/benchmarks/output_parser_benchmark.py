@@ -0,0 +1,79 @@
+"""
+Measures the time spent rewriting the citations of long answers with many citations.
+
+Run from the code directory:
+
+    python -m tests.benchmarks.output_parser_benchmark
+"""
+
+import re
+import time
+
+from backend.batch.utilities.common.source_document import SourceDocument
+from backend.batch.utilities.parser.output_parser_tool import OutputParserTool
+
+DOCUMENTS = 50
+SENTENCES = 2000
+RUNS = 20
+
+
+def legacy_make_doc_references_sequential(answer: str) -> str:
+    """The previous implementation, reversing the whole answer twice per reference."""
+    doc_ids = [int(i) for i in re.findall(r"\[doc(\d+)\]", answer)]
+    for i, idx in enumerate(doc_ids):
+        answer = (answer[::-1].replace(f"[doc{idx}]"[::-1], f"[doc{i+1}]"[::-1], 1))[
+            ::-1
+        ]
+    return answer
+
+
+def source_documents() -> list[SourceDocument]:
+    return [
+        SourceDocument(
+            id=f"doc_{i}",
+            content="content " * 200,
+            source=f"https://source/documents/doc_{i}.pdf",
+            title=f"/documents/doc_{i}.pdf",
+            chunk=i,
+            chunk_id=f"doc_{i}_pages_{i}",
+        )
+        for i in range(DOCUMENTS)
+    ]
+
+
+def long_answer() -> str:
+    return " ".join(
+        f"Sentence {i} of the answer [doc{(i * 7) % DOCUMENTS + 1}]."
+        for i in range(SENTENCES)
+    )
+
+
+def measure(name: str, rewrite) -> None:
+    answer = long_answer()
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        rewrite(answer)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / RUNS
+    print(f"{name:<8} {elapsed_ms:>10.2f} ms per answer")
+
+
+def main():
+    output_parser = OutputParserTool()
+    documents = source_documents()
+
+    print(f"{SENTENCES} citations of {DOCUMENTS} documents per answer")
+    measure("legacy", legacy_make_doc_references_sequential)
+    measure(
+        "rewrite",
+        lambda answer: output_parser._rewrite_doc_references(answer, documents),
+    )
+    measure(
+        "parse",
+        lambda answer: output_parser.parse(
+            question="question", answer=answer, source_documents=documents
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Replays a labelled query set against the search handler returned by
+Search.get_search_handler, with a snapshot searched by LocalSearchHandler standing in for
+Azure AI Search and a local hashing embedder standing in for Azure OpenAI, so that it
+runs without network.
+
+Reports per search configuration the recall@k and MRR of the labelled chunks, the
+p50/p95 latency of each stage (embedding, search, conversion, the rest of the search
+handler and total) and the tokens of the sources sent to the model.
+
+The latencies of the search stage are those of the local index, not representative of
+the latency of Azure AI Search.
+
+Run from the code directory:
+
+    python -m tests.benchmarks.retrieval_eval
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import statistics
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+from unittest.mock import patch
+
+import numpy as np
+import tiktoken
+
+from backend.batch.utilities.helpers.query_vector_cache import QueryVectorCache
+from backend.batch.utilities.helpers.source_packer import SourcePacker
+from backend.batch.utilities.search.local_search_handler import LocalSearchHandler
+from backend.batch.utilities.search.local_vector_index import LocalVectorIndex
+from backend.batch.utilities.search.search import Search
+
+RESOURCES = os.path.join(os.path.dirname(__file__), "resources")
+EVAL_SET = os.path.join(RESOURCES, "retrieval_eval_set.json")
+
+# tokenize without downloading the encoding, as the functional tests do
+TIKTOKEN_CACHE_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "functional", "resources"
+)
+
+TOP_K = 5
+SOURCES_MAX_TOKENS = 6000
+EMBEDDING_DIMENSIONS = 256
+# other: the rest of query_search, mostly tokenizing the question and reranking
+STAGES = ["embedding", "search", "conversion", "other", "total"]
+
+CONFIGURATIONS = {
+    "hybrid": {"AZURE_SEARCH_USE_LOCAL_RERANK": False},
+    "hybrid+rerank": {"AZURE_SEARCH_USE_LOCAL_RERANK": True},
+}
+
+_WORD = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """Embeds text as normalized hashed character trigrams of its words."""
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS) -> None:
+        self.dimensions = dimensions
+        self.encoding = tiktoken.get_encoding("cl100k_base")
+
+    def embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimensions)
+        for word in _WORD.findall(text.lower()):
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                vector[zlib.crc32(padded[i : i + 3].encode()) % self.dimensions] += 1
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def generate_embeddings(self, tokens_or_text) -> List[float]:
+        if not isinstance(tokens_or_text, str):
+            tokens_or_text = self.encoding.decode(tokens_or_text)
+        return self.embed(tokens_or_text)
+
+
+@dataclass
+class EvaluationReport:
+    name: str
+    recall_at_k: float
+    mrr: float
+    average_source_tokens: float
+    latencies_ms: Dict[str, List[float]] = field(default_factory=dict)
+
+    def percentile(self, stage: str, percentile: int) -> float:
+        latencies = sorted(self.latencies_ms[stage])
+        index = min(
+            len(latencies) - 1, math.ceil(percentile / 100 * len(latencies)) - 1
+        )
+        return latencies[max(index, 0)]
+
+
+def load_eval_set(path: str = EVAL_SET) -> dict:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _timed(function: Callable, latencies: List[float]) -> Callable:
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    return wrapper
+
+
+def evaluate(
+    name: str,
+    settings: dict,
+    eval_set: Optional[dict] = None,
+    top_k: int = TOP_K,
+) -> EvaluationReport:
+    with patch.dict(
+        os.environ,
+        {
+            "TIKTOKEN_CACHE_DIR": os.environ.get(
+                "TIKTOKEN_CACHE_DIR", TIKTOKEN_CACHE_DIR
+            )
+        },
+    ), tempfile.TemporaryDirectory() as directory:
+        return _evaluate(name, settings, eval_set or load_eval_set(), top_k, directory)
+
+
+def _evaluate(
+    name: str, settings: dict, eval_set: dict, top_k: int, directory: str
+) -> EvaluationReport:
+    env_helper = SimpleNamespace(
+        **{
+            "AZURE_SEARCH_TOP_K": top_k,
+            "AZURE_SEARCH_FILTER": "",
+            "AZURE_SEARCH_USE_SEMANTIC_SEARCH": False,
+            "AZURE_SEARCH_USE_LOCAL_RERANK": False,
+            "AZURE_SEARCH_RERANK_CANDIDATES": 20,
+            "AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION": False,
+            "USE_ADVANCED_IMAGE_PROCESSING": False,
+            "LOCAL_SEARCH_INDEX_PATH": directory,
+            **settings,
+        }
+    )
+    embedder = HashingEmbedder()
+    documents = [
+        {**document, "chunk": i, "offset": 0, "page_number": None}
+        for i, document in enumerate(eval_set["documents"])
+    ]
+    vectors = np.array(
+        [embedder.embed(document["content"]) for document in documents],
+        dtype=np.float32,
+    )
+
+    module = "backend.batch.utilities.search.azure_search_handler"
+    LocalVectorIndex(documents, {"content_vector": vectors}).save(directory)
+    with patch(f"{module}.LLMHelper", return_value=embedder), patch(
+        f"{module}.AzureComputerVisionClient"
+    ):
+        search_handler = Search.get_search_handler(env_helper)
+    LocalSearchHandler.clear()
+    search_client = search_handler.search_client
+
+    latencies: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    search_handler.llm_helper = SimpleNamespace(
+        embedding_model="hashing",
+        generate_embeddings=_timed(
+            embedder.generate_embeddings, latencies["embedding"]
+        ),
+    )
+    search_handler.search_client = SimpleNamespace(
+        search=_timed(search_client.search, latencies["search"])
+    )
+    search_handler._convert_to_source_documents = _timed(
+        search_handler._convert_to_source_documents, latencies["conversion"]
+    )
+
+    source_packer = SourcePacker(max_tokens=SOURCES_MAX_TOKENS)
+    recalls, reciprocal_ranks, source_tokens = [], [], []
+    for query in eval_set["queries"]:
+        # measure the embedding of every question, not the query vector cache
+        QueryVectorCache.clear()
+        start = time.perf_counter()
+        documents = search_handler.query_search(query["question"])
+        total = (time.perf_counter() - start) * 1000
+        latencies["total"].append(total)
+        latencies["other"].append(
+            total - sum(latencies[stage][-1] for stage in STAGES[:3])
+        )
+
+        retrieved = [document.id for document in documents[:top_k]]
+        relevant = set(query["relevant"])
+        recalls.append(len(relevant.intersection(retrieved)) / len(relevant))
+        reciprocal_ranks.append(
+            next(
+                (1 / (rank + 1) for rank, id in enumerate(retrieved) if id in relevant),
+                0.0,
+            )
+        )
+        source_tokens.append(
+            sum(
+                source_packer.count_tokens(document)
+                for document in source_packer.pack(documents)
+            )
+        )
+
+    return EvaluationReport(
+        name=name,
+        recall_at_k=statistics.mean(recalls),
+        mrr=statistics.mean(reciprocal_ranks),
+        average_source_tokens=statistics.mean(source_tokens),
+        latencies_ms=latencies,
+    )
+
+
+def main():
+    # the handler sets a filter on the vector queries, which the SDK warns about
+    logging.getLogger("azure.search.documents").setLevel(logging.ERROR)
+    eval_set = load_eval_set()
+    print(
+        f"{len(eval_set['queries'])} queries over {len(eval_set['documents'])} chunks, "
+        f"top {TOP_K}"
+    )
+    print(
+        f"{'configuration':<15} {'recall@k':>8} {'mrr':>6} {'tokens':>7}  "
+        + "  ".join(f"{stage + ' p50/p95 ms':>22}" for stage in STAGES)
+    )
+    for name, settings in CONFIGURATIONS.items():
+        report = evaluate(name, settings, eval_set)
+        latencies = "  ".join(
+            f"{report.percentile(stage, 50):>10.3f}/{report.percentile(stage, 95):<11.3f}"
+            for stage in STAGES
+        )
+        print(
+            f"{name:<15} {report.recall_at_k:>8.3f} {report.mrr:>6.3f} "
+            f"{report.average_source_tokens:>7.0f}  {latencies}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import pytest
+from tests.benchmarks.retrieval_eval import CONFIGURATIONS, STAGES, evaluate
+
+
+@pytest.fixture(scope="module")
+def reports():
+    return {name: evaluate(name, settings) for name, settings in CONFIGURATIONS.items()}
+
+
+@pytest.mark.parametrize("name", CONFIGURATIONS)
+def test_retrieval_quality(reports, name):
+    # when
+    report = reports[name]
+
+    # then
+    assert report.recall_at_k >= 0.9
+    assert report.mrr >= 0.8
+
+
+def test_local_rerank_does_not_degrade_the_ranking(reports):
+    # then
+    assert reports["hybrid+rerank"].mrr >= reports["hybrid"].mrr
+
+
+@pytest.mark.parametrize("name", CONFIGURATIONS)
+def test_reports_latency_and_tokens(reports, name):
+    # when
+    report = reports[name]
+
+    # then
+    for stage in STAGES:
+        assert 0 <= report.percentile(stage, 50) <= report.percentile(stage, 95)
+    assert report.average_source_tokens > 0
@@ -0,0 +1,45 @@
+import json
+
+from backend.batch.utilities.common.answer import Answer
+from backend.batch.utilities.common.source_document import SourceDocument
+
+
+def test_to_json_and_from_json_round_trip():
+    # Given
+    answer = Answer(
+        question="A question?",
+        answer="An answer [doc1]",
+        source_documents=[
+            SourceDocument(id="1", content="Some content", source="A source")
+        ],
+        prompt_tokens=10,
+        completion_tokens=5,
+        cached_prompt_tokens=4,
+    )
+
+    # When
+    result = Answer.from_json(answer.to_json())
+
+    # Then
+    assert result == answer
+
+
+def test_from_json_reads_source_documents_serialized_as_strings():
+    # Given
+    source_document = SourceDocument(id="1", content="Some content", source="A source")
+    json_string = json.dumps(
+        {
+            "question": "A question?",
+            "answer": "An answer [doc1]",
+            "source_documents": [json.dumps(source_document.to_dict())],
+            "prompt_tokens": 10,
+            "completion_tokens": 5,
+        }
+    )
+
+    # When
+    result = Answer.from_json(json_string)
+
+    # Then
+    assert result.source_documents == [source_document]
+    assert result.cached_prompt_tokens == 0
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+from backend.batch.utilities.common.message_stream import (
+    merge_message_deltas,
+    serialize_deltas,
+    serialize_full_responses,
+)
+
+RESPONSE_OBJ = {"id": "response.id", "model": "model", "created": 1, "object": "obj"}
+
+DELTAS = [
+    {"role": "tool", "content": '{"citations": []}', "end_turn": False},
+    {"role": "assistant", "content": "Azure AI ", "end_turn": False},
+    {"role": "assistant", "content": 'is "great"\n', "end_turn": False},
+    {"role": "assistant", "content": "", "end_turn": True},
+]
+
+
+async def as_stream(deltas):
+    for delta in deltas:
+        yield delta
+
+
+async def collect(lines):
+    return [line async for line in lines]
+
+
+def test_merge_message_deltas():
+    # when
+    messages = merge_message_deltas(DELTAS)
+
+    # then
+    assert messages == [
+        {"role": "tool", "content": '{"citations": []}', "end_turn": False},
+        {"role": "assistant", "content": 'Azure AI is "great"\n', "end_turn": True},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_serialize_full_responses():
+    # when
+    lines = await collect(serialize_full_responses(as_stream(DELTAS), RESPONSE_OBJ))
+
+    # then
+    responses = [json.loads(line) for line in lines]
+    assert [
+        [message["content"] for message in response["choices"][0]["messages"]]
+        for response in responses
+    ] == [
+        ['{"citations": []}'],
+        ['{"citations": []}', "Azure AI "],
+        ['{"citations": []}', 'Azure AI is "great"\n'],
+        ['{"citations": []}', 'Azure AI is "great"\n'],
+    ]
+    assert responses[-1] == {
+        **RESPONSE_OBJ,
+        "choices": [{"messages": merge_message_deltas(DELTAS)}],
+    }
+    assert all(
+        line == json.dumps(response, ensure_ascii=False) + "\n"
+        for line, response in zip(lines, responses)
+    )
+
+
+@pytest.mark.asyncio
+async def test_serialize_deltas():
+    # when
+    lines = await collect(serialize_deltas(as_stream(DELTAS), RESPONSE_OBJ))
+
+    # then
+    assert [json.loads(line) for line in lines] == [
+        {
+            **RESPONSE_OBJ,
+            "choices": [
+                {
+                    "messages": [
+                        DELTAS[0],
+                        {"role": "assistant", "content": "", "end_turn": False},
+                    ]
+                }
+            ],
+        },
+        {"delta": "Azure AI "},
+        {"delta": 'is "great"\n'},
+        {"end_turn": True},
+    ]
@@ -224,3 +224,39 @@ def test_decode_method_returns_expected_source_document():
     assert result.chunk == expected_source_document.chunk
     assert result.offset == expected_source_document.offset
     assert result.page_number == expected_source_document.page_number
+
+
+def test_to_json_and_from_json_round_trip():
+    # Given
+    source_document = SourceDocument(
+        id="1",
+        content="Some content with unicode ✓",
+        source="https://example.com/path/to/file.pdf",
+        title="A title",
+        chunk=3,
+        offset=120,
+        page_number=2,
+        chunk_id="abcd_pages_2",
+    )
+
+    # When
+    result = SourceDocument.from_json(source_document.to_json())
+
+    # Then
+    assert result == source_document
+
+
+def test_get_filename_is_recomputed_when_the_source_changes():
+    # Given
+    source_document = SourceDocument(
+        content="Some content", source="https://example.com/path/to/file.pdf"
+    )
+    assert source_document.get_filename(include_path=True) == "file.pdf"
+
+    # When
+    source_document.source = "https://example.com/path/to/other.docx"
+
+    # Then
+    assert source_document.get_filename() == "other"
+    assert source_document.get_filename(include_path=True) == "other.docx"
+    assert not hasattr(source_document, "__dict__")
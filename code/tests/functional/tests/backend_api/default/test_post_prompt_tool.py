@@ -78,12 +78,18 @@ def completions_mocking(httpserver: HTTPServer, app_config: AppConfig):
                 {
                     "message": {
                         "role": "assistant",
-                        "function_call": {
-                            "name": "search_documents",
-                            "arguments": '{"question": "What is the meaning of life?"}',
-                        },
+                        "tool_calls": [
+                            {
+                                "id": "call_search_documents",
+                                "type": "function",
+                                "function": {
+                                    "name": "search_documents",
+                                    "arguments": '{"question": "What is the meaning of life?"}',
+                                },
+                            }
+                        ],
                     },
-                    "finish_reason": "function_call",
+                    "finish_reason": "tool_calls",
                     "index": 0,
                 }
             ],
@@ -1,5 +1,7 @@
+import threading
 import pytest
 from unittest.mock import MagicMock, Mock, patch
+from backend.batch.utilities.helpers.query_vector_cache import QueryVectorCache
 from backend.batch.utilities.search.azure_search_handler import AzureSearchHandler
 import json
 from azure.search.documents.models import VectorizedQuery
@@ -7,10 +9,19 @@ from azure.search.documents import SearchItemPaged
 from backend.batch.utilities.common.source_document import SourceDocument
 
 
+@pytest.fixture(autouse=True)
+def reset_query_vector_cache():
+    QueryVectorCache.clear()
+    yield
+    QueryVectorCache.clear()
+
+
 @pytest.fixture(autouse=True)
 def env_helper_mock():
     mock = Mock()
     mock.AZURE_SEARCH_USE_SEMANTIC_SEARCH = False
+    mock.AZURE_SEARCH_USE_LOCAL_RERANK = False
+    mock.AZURE_SEARCH_RERANK_CANDIDATES = 10
     mock.USE_ADVANCED_IMAGE_PROCESSING = False
     mock.AZURE_SEARCH_TOP_K = 3
     mock.AZURE_SEARCH_FILTER = "some-search-filter"
@@ -228,6 +239,45 @@ def test_query_search_performs_semantic_search(
     )
 
 
+def test_query_search_reranks_more_candidates_locally(
+    handler, mock_llm_helper, env_helper_mock
+):
+    # given
+    question = "What is the refund policy?"
+    env_helper_mock.AZURE_SEARCH_USE_LOCAL_RERANK = True
+    env_helper_mock.AZURE_SEARCH_TOP_K = 1
+    mock_llm_helper.generate_embeddings.return_value = [1, 0]
+    handler.search_client.search.return_value = [
+        {"id": 1, "content": "Shipping takes two days.", "title": "shipping"},
+        {
+            "id": 2,
+            "content": "The refund policy allows returns within 30 days.",
+            "title": "refund policy",
+            "content_vector": [1, 0],
+        },
+    ]
+
+    # when
+    actual_results = handler.query_search(question)
+
+    # then
+    handler.search_client.search.assert_called_once_with(
+        search_text=question,
+        vector_queries=[
+            VectorizedQuery(
+                vector=[1, 0],
+                k_nearest_neighbors=env_helper_mock.AZURE_SEARCH_RERANK_CANDIDATES,
+                filter=handler.env_helper.AZURE_SEARCH_FILTER,
+                fields="content_vector",
+            )
+        ],
+        query_type="simple",
+        filter=handler.env_helper.AZURE_SEARCH_FILTER,
+        top=env_helper_mock.AZURE_SEARCH_RERANK_CANDIDATES,
+    )
+    assert [document.id for document in actual_results] == [2]
+
+
 def test_query_search_converts_results_to_source_documents(
     handler,
 ):
@@ -322,6 +372,53 @@ def test_hybrid_search_with_advanced_image_processing(
     )
 
 
+def test_query_search_vectorizes_question_for_images_while_embedding_it(
+    handler: AzureSearchHandler,
+    mock_llm_helper: MagicMock,
+    mock_azure_computer_vision_client: MagicMock,
+    env_helper_mock: MagicMock,
+):
+    # given
+    env_helper_mock.USE_ADVANCED_IMAGE_PROCESSING = True
+    vectorization_started = threading.Event()
+    mock_azure_computer_vision_client.vectorize_text.side_effect = lambda question: (
+        vectorization_started.set() or [3, 2, 1]
+    )
+    overlapped = []
+    mock_llm_helper.generate_embeddings.side_effect = lambda tokens: (
+        overlapped.append(vectorization_started.wait(timeout=5)) or [1, 2, 3]
+    )
+
+    # when
+    handler.query_search("What is the answer?")
+
+    # then
+    assert overlapped == [True]
+
+
+def test_query_search_reuses_question_vectors(
+    handler: AzureSearchHandler,
+    mock_llm_helper: MagicMock,
+    mock_azure_computer_vision_client: MagicMock,
+    env_helper_mock: MagicMock,
+):
+    # given
+    env_helper_mock.USE_ADVANCED_IMAGE_PROCESSING = True
+    mock_llm_helper.generate_embeddings.return_value = [1, 2, 3]
+
+    # when
+    handler.query_search("What is the answer?")
+    handler.query_search("What is the answer?")
+    handler.query_search("What is the question?")
+
+    # then
+    assert mock_llm_helper.generate_embeddings.call_count == 2
+    assert mock_azure_computer_vision_client.vectorize_text.call_count == 2
+    assert handler.search_client.search.call_args.kwargs["vector_queries"][
+        0
+    ].vector == [1, 2, 3]
+
+
 def test_semantic_search_with_advanced_image_processing(
     handler: AzureSearchHandler,
     mock_llm_helper: MagicMock,
@@ -17,6 +17,8 @@ def env_helper_mock():
     mock.AZURE_SEARCH_KEY = "example-key"
     mock.is_auth_type_keys = Mock(return_value=True)
     mock.AZURE_SEARCH_TOP_K = 5
+    mock.AZURE_SEARCH_USE_LOCAL_RERANK = False
+    mock.AZURE_SEARCH_RERANK_CANDIDATES = 10
     return mock
 
 
@@ -212,6 +214,48 @@ def test_query_search_performs_search_semantic(handler, env_helper_mock):
     )
 
 
+def test_query_search_reranks_more_candidates_locally(handler, env_helper_mock):
+    # given
+    question = "refund policy"
+    env_helper_mock.AZURE_SEARCH_USE_SEMANTIC_SEARCH = False
+    env_helper_mock.AZURE_SEARCH_USE_LOCAL_RERANK = True
+    env_helper_mock.AZURE_SEARCH_TOP_K = 1
+    handler.search_client.search.return_value = [
+        {
+            "id": 1,
+            "content": "Shipping takes two days.",
+            "title": "shipping",
+            "source": "https://example.com/shipping",
+            "chunk_id": "chunk1",
+        },
+        {
+            "id": 2,
+            "content": "The refund policy allows returns within 30 days.",
+            "title": "refund policy",
+            "source": "https://example.com/refunds",
+            "chunk_id": "chunk2",
+        },
+    ]
+
+    # when
+    actual_results = handler.query_search(question)
+
+    # then
+    handler.search_client.search.assert_called_once_with(
+        search_text=question,
+        vector_queries=[
+            VectorizableTextQuery(
+                text=question,
+                k_nearest_neighbors=env_helper_mock.AZURE_SEARCH_RERANK_CANDIDATES,
+                fields="content_vector",
+                exhaustive=True,
+            )
+        ],
+        top=env_helper_mock.AZURE_SEARCH_RERANK_CANDIDATES,
+    )
+    assert [document.id for document in actual_results] == [2]
+
+
 def test_query_search_converts_results_to_source_documents(handler):
     # given
     question = "test question"
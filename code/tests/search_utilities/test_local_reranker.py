@@ -0,0 +1,118 @@
+from backend.batch.utilities.common.source_document import SourceDocument
+from backend.batch.utilities.search.local_reranker import LocalReranker
+
+
+def document(id: str, content: str, title: str = "") -> SourceDocument:
+    return SourceDocument(id=id, content=content, title=title, source=f"source/{id}")
+
+
+def ids(documents):
+    return [document.id for document in documents]
+
+
+def test_rerank_trims_to_top_k():
+    # given
+    documents = [document(str(i), f"content {i}") for i in range(5)]
+
+    # when
+    reranked = LocalReranker().rerank("content", documents, top_k=2)
+
+    # then
+    assert len(reranked) == 2
+
+
+def test_rerank_promotes_documents_matching_the_question_terms():
+    # given
+    documents = [
+        document("shipping", "Orders ship within two business days."),
+        document("returns", "Our returns policy: a refund is issued within 30 days."),
+        document("contact", "Call support for any other question."),
+    ]
+
+    # when
+    reranked = LocalReranker().rerank(
+        "How do I get a refund under the returns policy?", documents, top_k=3
+    )
+
+    # then
+    assert ids(reranked)[0] == "returns"
+
+
+def test_rerank_prefers_question_terms_close_to_each_other():
+    # given
+    filler = " ".join(["filler"] * 50)
+    documents = [
+        document("far", f"password {filler} reset"),
+        document("near", f"password reset {filler}"),
+    ]
+
+    # when
+    reranked = LocalReranker().rerank("password reset", documents, top_k=2)
+
+    # then
+    assert ids(reranked) == ["near", "far"]
+
+
+def test_rerank_uses_the_title():
+    # given
+    documents = [
+        document("other", "The benefits are listed below.", title="handbook"),
+        document("benefits", "The benefits are listed below.", title="benefits"),
+    ]
+
+    # when
+    reranked = LocalReranker().rerank("benefits", documents, top_k=2)
+
+    # then
+    assert ids(reranked) == ["benefits", "other"]
+
+
+def test_rerank_uses_the_vector_similarity():
+    # given
+    documents = [
+        document("first", "same content"),
+        document("second", "same content"),
+    ]
+
+    # when
+    reranked = LocalReranker().rerank(
+        "content",
+        documents,
+        top_k=2,
+        question_vector=[0.0, 1.0],
+        document_vectors=[[1.0, 0.0], [0.0, 1.0]],
+    )
+
+    # then
+    assert ids(reranked) == ["second", "first"]
+
+
+def test_rerank_ignores_vectors_when_some_are_missing():
+    # given
+    documents = [
+        document("first", "same content"),
+        document("second", "same content"),
+    ]
+
+    # when
+    reranked = LocalReranker().rerank(
+        "content",
+        documents,
+        top_k=2,
+        question_vector=[0.0, 1.0],
+        document_vectors=[[1.0, 0.0], None],
+    )
+
+    # then
+    assert ids(reranked) == ["first", "second"]
+
+
+def test_rerank_keeps_the_search_order_without_signals():
+    # given
+    documents = [document(str(i), "") for i in range(3)]
+
+    # when
+    reranked = LocalReranker().rerank("", documents, top_k=3)
+
+    # then
+    assert ids(reranked) == ["0", "1", "2"]
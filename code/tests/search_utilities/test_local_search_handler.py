@@ -0,0 +1,160 @@
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+from backend.batch.utilities.common.source_document import SourceDocument
+from backend.batch.utilities.helpers.search_result_cache import SearchResultCache
+from backend.batch.utilities.search.search import Search
+from backend.batch.utilities.search.local_search_handler import LocalSearchHandler
+from backend.batch.utilities.search.local_vector_index import LocalVectorIndex
+
+DOCUMENTS = [
+    {
+        "id": "doc_1",
+        "title": "/documents/a.pdf",
+        "source": "https://source/documents/a.pdf_SAS_TOKEN_PLACEHOLDER_",
+        "content": "reset your password in the portal",
+        "metadata": '{"chunk": 0}',
+        "chunk": 0,
+        "offset": 0,
+        "page_number": 1,
+    },
+    {
+        "id": "doc_2",
+        "title": "/documents/b.pdf",
+        "source": "https://source/documents/b.pdf_SAS_TOKEN_PLACEHOLDER_",
+        "content": "vacation days",
+        "metadata": '{"chunk": 0}',
+        "chunk": 0,
+        "offset": 0,
+        "page_number": 1,
+    },
+]
+
+
+@pytest.fixture(autouse=True)
+def reset_local_indexes():
+    LocalSearchHandler.clear()
+    yield
+    LocalSearchHandler.clear()
+
+
+@pytest.fixture
+def env_helper_mock(tmp_path):
+    LocalVectorIndex(
+        DOCUMENTS, {"content_vector": np.array([[1, 0], [0, 1]], dtype=np.float32)}
+    ).save(str(tmp_path))
+
+    mock = Mock()
+    mock.LOCAL_SEARCH_INDEX_PATH = str(tmp_path)
+    mock.AZURE_SEARCH_USE_SEMANTIC_SEARCH = False
+    mock.AZURE_SEARCH_USE_LOCAL_RERANK = False
+    mock.USE_ADVANCED_IMAGE_PROCESSING = False
+    mock.AZURE_SEARCH_TOP_K = 1
+    mock.AZURE_SEARCH_FILTER = ""
+    return mock
+
+
+@pytest.fixture
+def handler(env_helper_mock):
+    with patch(
+        "backend.batch.utilities.search.azure_search_handler.LLMHelper"
+    ) as llm_helper, patch(
+        "backend.batch.utilities.search.azure_search_handler.AzureComputerVisionClient"
+    ):
+        llm_helper.return_value.generate_embeddings.return_value = [1, 0]
+        yield LocalSearchHandler(env_helper_mock)
+
+
+def test_query_search(handler):
+    # when
+    results = handler.query_search("How do I reset my password?")
+
+    # then
+    assert results == [
+        SourceDocument(
+            id="doc_1",
+            content="reset your password in the portal",
+            title="/documents/a.pdf",
+            source="https://source/documents/a.pdf_SAS_TOKEN_PLACEHOLDER_",
+            chunk=0,
+            offset=0,
+            page_number=1,
+        )
+    ]
+
+
+def test_loads_the_snapshot_once(handler, env_helper_mock):
+    # when
+    with patch.object(LocalVectorIndex, "load") as load:
+        other_handler = LocalSearchHandler(env_helper_mock)
+
+    # then
+    load.assert_not_called()
+    assert other_handler.search_client is handler.search_client
+
+
+def test_get_files_and_delete_from_index(handler):
+    # given
+    assert handler.output_results(handler.get_files()) == {
+        "/documents/a.pdf": ["doc_1"],
+        "/documents/b.pdf": ["doc_2"],
+    }
+
+    # when
+    handler.delete_from_index("https://source/documents/a.pdf")
+
+    # then
+    assert handler.output_results(handler.get_files()) == {
+        "/documents/b.pdf": ["doc_2"]
+    }
+
+
+def test_search_with_facets(handler):
+    # when
+    results = handler.search_with_facets("*", "title", facet_count=0)
+
+    # then
+    assert handler.get_unique_files(results, "title") == [
+        "/documents/a.pdf",
+        "/documents/b.pdf",
+    ]
+
+
+def test_perform_search(handler):
+    # when
+    data = handler.process_results(handler.perform_search("/documents/b.pdf"))
+
+    # then
+    assert data == [[0, "vacation days"]]
+
+
+@patch("backend.batch.utilities.search.search.AzureBlobStorageClient")
+def test_cached_search_does_not_read_blob_storage(
+    blob_client_mock, handler, env_helper_mock
+):
+    # given
+    SearchResultCache.clear()
+    Search._get_blob_client.cache_clear()
+    env_helper_mock.AZURE_SEARCH_RESULT_CACHE_TTL = 60
+
+    # when
+    first = Search.get_source_documents(handler, "How do I reset my password?")
+    second = Search.get_source_documents(handler, "How do I reset my password?")
+
+    # then
+    assert first == second
+    assert SearchResultCache.stats()["hits"] == 1
+    blob_client_mock.assert_not_called()
+    SearchResultCache.clear()
+
+
+def test_delete_bumps_the_generation(handler):
+    # given
+    generation = handler.search_client.generation
+
+    # when
+    handler.delete_from_index("https://source/documents/a.pdf")
+
+    # then
+    assert handler.search_client.generation > generation
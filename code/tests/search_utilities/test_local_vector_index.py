@@ -0,0 +1,150 @@
+import pytest
+from azure.search.documents.models import VectorizedQuery
+from backend.batch.utilities.search.local_vector_index import (
+    LocalVectorIndex,
+    compile_filter,
+)
+
+DOCUMENTS = [
+    {"id": "1", "title": "a.pdf", "source": "a", "content": "password reset portal"},
+    {"id": "2", "title": "a.pdf", "source": "a", "content": "vacation days per year"},
+    {"id": "3", "title": "b.pdf", "source": "b", "content": "reset the vpn client"},
+]
+VECTORS = [[1.0, 0.0], [0.0, 1.0], [0.6, 0.8]]
+
+
+@pytest.fixture
+def index(tmp_path):
+    search_client = type(
+        "SearchClient",
+        (),
+        {
+            "search": lambda self, search_text: [
+                {**document, "content_vector": vector, "@search.score": 1.0}
+                for document, vector in zip(DOCUMENTS, VECTORS)
+            ]
+        },
+    )()
+    LocalVectorIndex.export(search_client, str(tmp_path), ["content_vector"])
+    return LocalVectorIndex.load(str(tmp_path))
+
+
+def ids(results):
+    return [result["id"] for result in results]
+
+
+def test_load_memory_maps_the_exported_vectors(index):
+    # then
+    assert index.documents == DOCUMENTS
+    assert index.vectors["content_vector"].dtype == "float32"
+    assert index.vectors["content_vector"].filename is not None
+
+
+def test_keyword_search(index):
+    # when
+    results = index.search("reset")
+
+    # then
+    assert sorted(ids(results)) == ["1", "3"]
+
+
+def test_vector_search(index):
+    # when
+    results = index.search(
+        None,
+        vector_queries=[
+            VectorizedQuery(
+                vector=[0.0, 1.0], k_nearest_neighbors=2, fields="content_vector"
+            )
+        ],
+    )
+
+    # then
+    assert ids(results) == ["2", "3"]
+    assert results[0]["content_vector"] == [0.0, 1.0]
+
+
+def test_hybrid_search_fuses_the_rankings(index):
+    # when
+    results = index.search(
+        "reset",
+        vector_queries=[
+            VectorizedQuery(
+                vector=[0.6, 0.8], k_nearest_neighbors=3, fields="content_vector"
+            )
+        ],
+        top=1,
+    )
+
+    # then
+    assert ids(results) == ["3"]
+
+
+def test_search_with_filter_select_and_count(index):
+    # when
+    results = index.search(
+        "*", filter="title eq 'a.pdf'", select="id, title", include_total_count=True
+    )
+
+    # then
+    assert list(results) == [
+        {"id": "1", "title": "a.pdf", "@search.score": 1.0},
+        {"id": "2", "title": "a.pdf", "@search.score": 1.0},
+    ]
+    assert results.get_count() == 2
+
+
+def test_search_with_facets(index):
+    # when
+    results = index.search("*", facets=["title,count:0"])
+
+    # then
+    assert results.get_facets() == {
+        "title": [{"value": "a.pdf", "count": 2}, {"value": "b.pdf", "count": 1}]
+    }
+
+
+def test_delete_documents(index):
+    # when
+    index.delete_documents([{"id": "1"}])
+
+    # then
+    assert ids(index.search("reset")) == ["3"]
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        ("title eq 'a.pdf'", ["1", "2"]),
+        ("title ne 'a.pdf'", ["3"]),
+        ("title eq 'a.pdf' and id ne '1'", ["2"]),
+        ("id eq '1' or id eq '3'", ["1", "3"]),
+        ("not (id eq '1' or id eq '3')", ["2"]),
+        ("search.in(id, '1,2', ',')", ["1", "2"]),
+        ("search.in(id, '2 3')", ["2", "3"]),
+        ("id gt '1'", ["2", "3"]),
+        ("title eq null", []),
+    ],
+)
+def test_compile_filter(expression, expected):
+    # when
+    predicate = compile_filter(expression)
+
+    # then
+    assert [document["id"] for document in DOCUMENTS if predicate(document)] == (
+        expected
+    )
+
+
+def test_compile_filter_unescapes_quotes():
+    # when
+    predicate = compile_filter("title eq 'o''brien.pdf'")
+
+    # then
+    assert predicate({"title": "o'brien.pdf"})
+
+
+@pytest.mark.parametrize("expression", ["title eq", "title like 'a'", "(id eq '1'"])
+def test_compile_filter_rejects_unsupported_filters(expression):
+    with pytest.raises(ValueError):
+        compile_filter(expression)
@@ -1,10 +1,13 @@
 import pytest
 from unittest.mock import Mock, MagicMock, patch
+from azure.core.exceptions import ResourceNotFoundError
 from backend.batch.utilities.search.search import Search
 from backend.batch.utilities.search.integrated_vectorization_search_handler import (
     IntegratedVectorizationSearchHandler,
 )
 from backend.batch.utilities.common.source_document import SourceDocument
+from backend.batch.utilities.helpers.search_index_cache import SearchIndexCache
+from backend.batch.utilities.helpers.search_result_cache import SearchResultCache
 
 
 @pytest.fixture
@@ -15,9 +18,35 @@ def env_helper_mock():
     mock.AZURE_SEARCH_KEY = "example-key"
     mock.is_auth_type_keys = Mock(return_value=True)
     mock.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION = False
+    mock.LOCAL_SEARCH_INDEX_PATH = ""
+    mock.AZURE_SEARCH_FILTER = ""
+    mock.AZURE_SEARCH_TOP_K = 5
+    mock.AZURE_SEARCH_USE_SEMANTIC_SEARCH = False
+    mock.AZURE_SEARCH_USE_LOCAL_RERANK = False
+    mock.USE_ADVANCED_IMAGE_PROCESSING = False
+    mock.AZURE_SEARCH_RESULT_CACHE_TTL = 0
     return mock
 
 
+@pytest.fixture(autouse=True)
+def reset_search_result_cache():
+    SearchResultCache.clear()
+    yield
+    SearchResultCache.clear()
+
+
+@pytest.fixture
+def blob_client_mock():
+    Search._get_blob_client.cache_clear()
+    with patch("backend.batch.utilities.search.search.AzureBlobStorageClient") as mock:
+        blob_client = mock.return_value
+        blob_client.get_container_metadata.return_value = {
+            "search_index_generation": "1"
+        }
+        yield blob_client
+    Search._get_blob_client.cache_clear()
+
+
 @pytest.fixture(autouse=True)
 def iv_search_handler_mock():
     with patch(
@@ -45,6 +74,20 @@ def test_get_search_handler_integrated_vectorization(env_helper_mock):
     assert isinstance(search_handler, IntegratedVectorizationSearchHandler)
 
 
+@patch("backend.batch.utilities.search.search.LocalSearchHandler")
+def test_get_search_handler_local(local_search_handler_mock, env_helper_mock):
+    # given
+    env_helper_mock.LOCAL_SEARCH_INDEX_PATH = "/snapshots/index"
+    env_helper_mock.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION = True
+
+    # when
+    search_handler = Search.get_search_handler(env_helper_mock)
+
+    # then
+    assert search_handler == local_search_handler_mock.return_value
+    local_search_handler_mock.assert_called_once_with(env_helper_mock)
+
+
 def test_get_source_documents_integrated_vectorization(env_helper_mock):
     # given
     env_helper_mock.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION = True
@@ -67,6 +110,7 @@ def test_get_source_documents_integrated_vectorization(env_helper_mock):
         },
     ]
     search_handler_mock = Mock(spec=IntegratedVectorizationSearchHandler)
+    search_handler_mock.env_helper = env_helper_mock
     search_handler_mock.query_search.return_value = search_results
 
     # when
@@ -83,6 +127,7 @@ def test_get_source_documents_integrated_vectorization_no_results(env_helper_moc
 
     search_results = []
     search_handler_mock = Mock(spec=IntegratedVectorizationSearchHandler)
+    search_handler_mock.env_helper = env_helper_mock
     search_handler_mock.query_search.return_value = search_results
 
     # when
@@ -117,6 +162,7 @@ def test_get_source_documents_azure_search(search_handler_mock: MagicMock):
             page_number="page_number2",
         ),
     ]
+    search_handler_mock.env_helper.AZURE_SEARCH_RESULT_CACHE_TTL = 0
     search_handler_mock.query_search.return_value = expected_source_documents
 
     # when
@@ -124,3 +170,96 @@ def test_get_source_documents_azure_search(search_handler_mock: MagicMock):
 
     # then
     assert len(actual_source_documents) == len(expected_source_documents)
+
+
+def test_get_source_documents_reuses_cached_results(env_helper_mock, blob_client_mock):
+    # given
+    env_helper_mock.AZURE_SEARCH_RESULT_CACHE_TTL = 60
+    search_handler_mock = MagicMock()
+    search_handler_mock.env_helper = env_helper_mock
+    documents = [SourceDocument(content="content", source="source")]
+    search_handler_mock.query_search.return_value = documents
+
+    # when
+    first = Search.get_source_documents(search_handler_mock, "question")
+    second = Search.get_source_documents(search_handler_mock, "question")
+
+    # then
+    assert first == documents
+    assert second == documents
+    search_handler_mock.query_search.assert_called_once_with("question")
+    assert SearchResultCache.stats()["hits"] == 1
+
+
+@patch("backend.batch.utilities.search.search.AzureBlobStorageClient")
+def test_get_source_documents_reuses_blob_client_for_generation(
+    blob_client_class_mock: MagicMock, env_helper_mock
+):
+    # given
+    Search._get_blob_client.cache_clear()
+    env_helper_mock.AZURE_SEARCH_RESULT_CACHE_TTL = 60
+    search_handler_mock = MagicMock()
+    search_handler_mock.env_helper = env_helper_mock
+    search_handler_mock.query_search.return_value = []
+
+    # when
+    Search.get_source_documents(search_handler_mock, "question")
+    SearchResultCache.invalidate()
+    Search.get_source_documents(search_handler_mock, "question")
+
+    # then
+    blob_client_class_mock.assert_called_once_with()
+    assert blob_client_class_mock.return_value.get_container_metadata.call_count == 2
+    Search._get_blob_client.cache_clear()
+
+
+def test_get_source_documents_caches_per_question_and_filter(
+    env_helper_mock, blob_client_mock
+):
+    # given
+    env_helper_mock.AZURE_SEARCH_RESULT_CACHE_TTL = 60
+    search_handler_mock = MagicMock()
+    search_handler_mock.env_helper = env_helper_mock
+    search_handler_mock.query_search.return_value = []
+
+    # when
+    Search.get_source_documents(search_handler_mock, "question")
+    Search.get_source_documents(search_handler_mock, "other question")
+    env_helper_mock.AZURE_SEARCH_FILTER = "title eq 'doc'"
+    Search.get_source_documents(search_handler_mock, "question")
+
+    # then
+    assert search_handler_mock.query_search.call_count == 3
+
+
+def test_get_source_documents_does_not_cache_when_disabled(env_helper_mock):
+    # given
+    search_handler_mock = MagicMock()
+    search_handler_mock.env_helper = env_helper_mock
+    search_handler_mock.query_search.return_value = []
+
+    # when
+    Search.get_source_documents(search_handler_mock, "question")
+    Search.get_source_documents(search_handler_mock, "question")
+
+    # then
+    assert search_handler_mock.query_search.call_count == 2
+
+
+def test_get_source_documents_forgets_missing_index(env_helper_mock):
+    # given
+    SearchIndexCache.mark_exists(
+        env_helper_mock.AZURE_SEARCH_SERVICE, env_helper_mock.AZURE_SEARCH_INDEX, 60
+    )
+    search_handler_mock = MagicMock()
+    search_handler_mock.env_helper = env_helper_mock
+    search_handler_mock.query_search.side_effect = ResourceNotFoundError("not found")
+
+    # when
+    with pytest.raises(ResourceNotFoundError):
+        Search.get_source_documents(search_handler_mock, "question")
+
+    # then
+    assert not SearchIndexCache.is_known(
+        env_helper_mock.AZURE_SEARCH_SERVICE, env_helper_mock.AZURE_SEARCH_INDEX
+    )
@@ -9,8 +9,14 @@ sys.path.append(os.path.join(os.path.dirname(sys.path[0]), "backend", "batch"))
 from backend.batch.add_url_embeddings import add_url_embeddings  # noqa: E402
 
 
+@patch("backend.batch.add_url_embeddings.bump_index_generation")
+@patch("backend.batch.add_url_embeddings.AzureBlobStorageClient")
 @patch("backend.batch.add_url_embeddings.EmbedderFactory")
-def test_add_url_embeddings(mock_embedder_factory: MagicMock):
+def test_add_url_embeddings(
+    mock_embedder_factory: MagicMock,
+    mock_blob_storage_client: MagicMock,
+    mock_bump_index_generation: MagicMock,
+):
     # given
     fake_request = func.HttpRequest(
         method="POST",
@@ -28,6 +34,9 @@ def test_add_url_embeddings(mock_embedder_factory: MagicMock):
     mock_embedder_instance.embed_file.assert_called_once_with(
         "https://example.com", ".url"
     )
+    mock_bump_index_generation.assert_called_once_with(
+        mock_blob_storage_client.return_value
+    )
 
 
 def test_add_url_embeddings_returns_400_when_url_not_set():
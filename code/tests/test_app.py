@@ -2,6 +2,7 @@
 This module tests the entry point for the application.
 """
 
+import json
 from unittest.mock import AsyncMock, MagicMock, Mock, patch, ANY
 
 from openai import RateLimitError, BadRequestError, InternalServerError
@@ -253,6 +254,7 @@ class TestConversationCustom:
 
         message_orchestrator_mock = AsyncMock()
         message_orchestrator_mock.handle_message.return_value = self.messages
+        message_orchestrator_mock.handle_message_stream = MagicMock(return_value=None)
         get_message_orchestrator_mock.return_value = message_orchestrator_mock
 
         env_helper_mock.AZURE_OPENAI_MODEL = self.openai_model
@@ -296,6 +298,7 @@ class TestConversationCustom:
 
         message_orchestrator_mock = AsyncMock()
         message_orchestrator_mock.handle_message.return_value = self.messages
+        message_orchestrator_mock.handle_message_stream = MagicMock(return_value=None)
         get_message_orchestrator_mock.return_value = message_orchestrator_mock
 
         env_helper_mock.AZURE_OPENAI_MODEL = self.openai_model
@@ -440,6 +443,7 @@ class TestConversationCustom:
 
         message_orchestrator_mock = AsyncMock()
         message_orchestrator_mock.handle_message.return_value = self.messages
+        message_orchestrator_mock.handle_message_stream = MagicMock(return_value=None)
         get_message_orchestrator_mock.return_value = message_orchestrator_mock
 
         body = {
@@ -471,6 +475,89 @@ class TestConversationCustom:
             orchestrator=self.orchestrator_config,
         )
 
+    @patch("create_app.get_message_orchestrator")
+    @patch("create_app.get_orchestrator_config")
+    def test_conversation_custom_streams_message_deltas(
+        self,
+        get_orchestrator_config_mock,
+        get_message_orchestrator_mock,
+        env_helper_mock,
+        client,
+    ):
+        """Test that the answer is streamed as JSON lines when the orchestrator streams."""
+        # given
+        get_orchestrator_config_mock.return_value = self.orchestrator_config
+
+        async def deltas():
+            yield self.messages[0]
+            yield {"role": "assistant", "content": "An ", "end_turn": False}
+            yield {"role": "assistant", "content": "answer", "end_turn": True}
+
+        message_orchestrator_mock = MagicMock()
+        message_orchestrator_mock.handle_message_stream.return_value = deltas()
+        get_message_orchestrator_mock.return_value = message_orchestrator_mock
+
+        env_helper_mock.AZURE_OPENAI_MODEL = self.openai_model
+        env_helper_mock.AZURE_OPENAI_STREAM_PROTOCOL = "full"
+
+        # when
+        response = client.post(
+            "/api/conversation",
+            headers={"content-type": "application/json"},
+            json=self.body,
+        )
+
+        # then
+        assert response.status_code == 200
+        assert response.content_type == "application/json-lines"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 3
+        assert lines[-1] == {
+            "choices": [{"messages": self.messages}],
+            "created": "response.created",
+            "id": "response.id",
+            "model": self.openai_model,
+            "object": "response.object",
+        }
+        message_orchestrator_mock.handle_message.assert_not_called()
+
+    @patch("create_app.get_message_orchestrator")
+    @patch("create_app.get_orchestrator_config")
+    def test_conversation_custom_ends_stream_with_error_line_on_exception(
+        self,
+        get_orchestrator_config_mock,
+        get_message_orchestrator_mock,
+        env_helper_mock,
+        client,
+    ):
+        """Test that an error line is streamed when the orchestrator fails mid-stream."""
+        # given
+        get_orchestrator_config_mock.return_value = self.orchestrator_config
+
+        async def deltas():
+            yield self.messages[0]
+            raise Exception("An error occurred")
+
+        message_orchestrator_mock = MagicMock()
+        message_orchestrator_mock.handle_message_stream.return_value = deltas()
+        get_message_orchestrator_mock.return_value = message_orchestrator_mock
+
+        env_helper_mock.AZURE_OPENAI_STREAM_PROTOCOL = "full"
+
+        # when
+        response = client.post(
+            "/api/conversation",
+            headers={"content-type": "application/json"},
+            json=self.body,
+        )
+
+        # then
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[-1] == {
+            "error": "An error occurred. Please try again. If the problem persists, please contact the site "
+            "administrator."
+        }
+
     @patch(
         "backend.batch.utilities.helpers.config.config_helper.ConfigHelper.get_active_config_or_default"
     )
@@ -0,0 +1,210 @@
+import json
+import sys
+import os
+from unittest.mock import MagicMock, patch
+import azure.functions as func
+import pytest
+
+from backend.batch.utilities.helpers.url_fetcher import FetchedPage
+
+sys.path.append(os.path.join(os.path.dirname(sys.path[0]), "backend", "batch"))
+
+from backend.batch.batch_add_url_embeddings import (  # noqa: E402
+    batch_add_url_embeddings,
+    crawl_url_embeddings,
+)
+
+URLS = [
+    "https://example.com/new",
+    "https://example.com/same",
+    "https://example.com/bad",
+]
+
+
+@pytest.fixture(autouse=True)
+def env_helper_mock():
+    with patch("backend.batch.batch_add_url_embeddings.EnvHelper") as mock:
+        env_helper = mock.return_value
+        env_helper.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION = False
+        env_helper.EMBEDDING_MAX_WORKERS = 2
+        yield env_helper
+
+
+@pytest.fixture(autouse=True)
+def url_fetcher_mock():
+    with patch("backend.batch.batch_add_url_embeddings.UrlFetcher") as mock:
+
+        def fetch(url, validators):
+            if "bad" in url:
+                raise ValueError("404 Client Error")
+            if "same" in url:
+                return FetchedPage(url=url, content=None, validators=validators)
+            return FetchedPage(
+                url=url, content=b"<p>page</p>", validators={"source_etag": '"v2"'}
+            )
+
+        mock.return_value.fetch.side_effect = fetch
+        yield mock.return_value
+
+
+def _request(body: bytes) -> func.HttpRequest:
+    return func.HttpRequest(
+        method="POST",
+        url="",
+        body=body,
+        headers={"Content-Type": "application/json"},
+    )
+
+
+@patch("backend.batch.batch_add_url_embeddings.bump_index_generation")
+@patch("backend.batch.batch_add_url_embeddings.AzureBlobStorageClient")
+@patch("backend.batch.batch_add_url_embeddings.EmbedderFactory")
+def test_batch_add_url_embeddings_returns_the_status_of_each_url(
+    mock_embedder_factory: MagicMock,
+    mock_blob_storage_client: MagicMock,
+    mock_bump_index_generation: MagicMock,
+    url_fetcher_mock: MagicMock,
+):
+    # given
+    embedder = mock_embedder_factory.create.return_value
+    embedder.get_web_page_validators.return_value = {"source_etag": '"v1"'}
+
+    # when
+    response = batch_add_url_embeddings.build().get_user_function()(
+        _request(json.dumps({"urls": URLS + [URLS[0]]}).encode("utf-8"))
+    )
+
+    # then
+    assert response.status_code == 200
+    assert json.loads(response.get_body()) == {
+        "results": [
+            {"url": URLS[0], "status": "added"},
+            {"url": URLS[1], "status": "unchanged"},
+            {"url": URLS[2], "status": "failed", "error": "404 Client Error"},
+        ]
+    }
+    url_fetcher_mock.fetch.assert_any_call(URLS[0], {"source_etag": '"v1"'})
+    embedder.embed_web_page.assert_called_once_with(
+        URLS[0], b"<p>page</p>", {"source_etag": '"v2"'}
+    )
+    mock_bump_index_generation.assert_called_once_with(
+        mock_blob_storage_client.return_value
+    )
+
+
+@patch("backend.batch.batch_add_url_embeddings.bump_index_generation")
+@patch("backend.batch.batch_add_url_embeddings.EmbedderFactory")
+def test_batch_add_url_embeddings_does_not_bump_index_generation_when_nothing_added(
+    mock_embedder_factory: MagicMock,
+    mock_bump_index_generation: MagicMock,
+):
+    # when
+    response = batch_add_url_embeddings.build().get_user_function()(
+        _request(json.dumps({"urls": URLS[1:]}).encode("utf-8"))
+    )
+
+    # then
+    assert response.status_code == 200
+    mock_embedder_factory.create.return_value.embed_web_page.assert_not_called()
+    mock_bump_index_generation.assert_not_called()
+
+
+@patch("backend.batch.batch_add_url_embeddings.AzureBlobStorageClient")
+def test_batch_add_url_embeddings_integrated_vectorization(
+    mock_blob_storage_client: MagicMock,
+    env_helper_mock: MagicMock,
+    url_fetcher_mock: MagicMock,
+):
+    # given
+    env_helper_mock.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION = True
+    blob_client = mock_blob_storage_client.return_value
+    blob_client.get_blob_metadata.side_effect = lambda url: (
+        None if "new" in url else {"title": url, "source_etag": '"v1"'}
+    )
+
+    # when
+    response = batch_add_url_embeddings.build().get_user_function()(
+        _request(json.dumps({"urls": URLS[:2]}).encode("utf-8"))
+    )
+
+    # then
+    assert response.status_code == 200
+    assert json.loads(response.get_body()) == {
+        "results": [
+            {"url": URLS[0], "status": "added"},
+            {"url": URLS[1], "status": "unchanged"},
+        ]
+    }
+    url_fetcher_mock.fetch.assert_any_call(URLS[0], {})
+    blob_client.upload_file.assert_called_once_with(
+        b"page", URLS[0], metadata={"title": URLS[0], "source_etag": '"v2"'}
+    )
+
+
+@pytest.mark.parametrize("body", [b"", b'{"urls": []}', b'{"urls": "https://a.com"}'])
+def test_batch_add_url_embeddings_returns_400_when_urls_not_set(body: bytes):
+    # when
+    response = batch_add_url_embeddings.build().get_user_function()(_request(body))
+
+    # then
+    assert response.status_code == 400
+
+
+@patch("backend.batch.batch_add_url_embeddings.bump_index_generation")
+@patch("backend.batch.batch_add_url_embeddings.AzureBlobStorageClient")
+@patch("backend.batch.batch_add_url_embeddings.EmbedderFactory")
+@patch("backend.batch.batch_add_url_embeddings.WebCrawler")
+def test_crawl_url_embeddings_adds_the_crawled_pages(
+    mock_web_crawler: MagicMock,
+    mock_embedder_factory: MagicMock,
+    mock_blob_storage_client: MagicMock,
+    mock_bump_index_generation: MagicMock,
+    env_helper_mock: MagicMock,
+):
+    # given
+    crawler = mock_web_crawler.return_value
+    crawler.crawl.return_value = iter(
+        [
+            FetchedPage(url=URLS[0], content=b"new", validators={"source_etag": "2"}),
+            FetchedPage(url=URLS[1], content=b"same", validators={"source_etag": "1"}),
+        ]
+    )
+    crawler.failed = {URLS[2]: "404 Client Error"}
+    embedder = mock_embedder_factory.create.return_value
+    embedder.get_web_page_validators.return_value = {"source_etag": "1"}
+
+    # when
+    response = crawl_url_embeddings.build().get_user_function()(
+        _request(b'{"url": "https://example.com/", "max_depth": "1"}')
+    )
+
+    # then
+    assert response.status_code == 200
+    assert json.loads(response.get_body()) == {
+        "results": [
+            {"url": URLS[0], "status": "added"},
+            {"url": URLS[1], "status": "unchanged"},
+            {"url": URLS[2], "status": "failed", "error": "404 Client Error"},
+        ]
+    }
+    mock_web_crawler.assert_called_once_with(
+        env_helper_mock, max_depth=1, max_pages=None
+    )
+    crawler.crawl.assert_called_once_with("https://example.com/")
+    embedder.embed_web_page.assert_called_once_with(
+        URLS[0], b"new", {"source_etag": "2"}
+    )
+    mock_bump_index_generation.assert_called_once_with(
+        mock_blob_storage_client.return_value
+    )
+
+
+@pytest.mark.parametrize(
+    "body", [b"", b"{}", b'{"url": "https://a.com", "max_pages": "a"}']
+)
+def test_crawl_url_embeddings_returns_400_when_url_not_set(body: bytes):
+    # when
+    response = crawl_url_embeddings.build().get_user_function()(_request(body))
+
+    # then
+    assert response.status_code == 400
@@ -1,6 +1,6 @@
 import json
 import pytest
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 from azure.functions import QueueMessage
 from backend.batch.batch_push_results import (
     batch_push_results,
@@ -109,10 +109,15 @@ def test_batch_push_results_with_blob_created_event_uses_embedder(
     mock_create_embedder.embed_file.assert_called_once_with(
         "test_blob_sas", "test/test/test_filename.md"
     )
+    mock_blob_client_instance.upsert_container_metadata.assert_called_once_with(
+        {"search_index_generation": ANY}, exclusive=False
+    )
 
 
 @patch("backend.batch.batch_push_results.EnvHelper")
+@patch("backend.batch.batch_push_results.AzureBlobStorageClient")
 def test_batch_push_results_with_blob_deleted_event_uses_search_to_delete_with_sas_appended(
+    mock_azure_blob_storage_client,
     mock_env_helper,
     get_processor_handler_mock,
 ):
@@ -126,3 +131,35 @@ def test_batch_push_results_with_blob_deleted_event_uses_search_to_delete_with_s
     mock_get_search_handler.delete_from_index.assert_called_once_with(
         "https://test.test/test/test_filename.pdf"
     )
+    mock_azure_blob_storage_client.return_value.upsert_container_metadata.assert_called_once_with(
+        {"search_index_generation": ANY}, exclusive=False
+    )
+
+
+@patch("backend.batch.batch_push_results.EnvHelper")
+@patch("backend.batch.batch_push_results.AzureBlobStorageClient")
+def test_batch_push_results_with_batch_of_files_embeds_them_together(
+    mock_azure_blob_storage_client,
+    mock_env_helper,
+    get_processor_handler_mock,
+):
+    mock_create_embedder, mock_get_search_handler = get_processor_handler_mock
+
+    mock_queue_message = QueueMessage(
+        body='{"filenames": ["test_filename.md", "test_filename.pdf"]}'
+    )
+
+    mock_blob_client_instance = mock_azure_blob_storage_client.return_value
+    mock_blob_client_instance.get_blob_sas.side_effect = lambda name: f"sas/{name}"
+
+    batch_push_results.build().get_user_function()(mock_queue_message)
+    mock_create_embedder.embed_files.assert_called_once_with(
+        [
+            ("sas/test_filename.md", "test_filename.md"),
+            ("sas/test_filename.pdf", "test_filename.pdf"),
+        ]
+    )
+    mock_create_embedder.embed_file.assert_not_called()
+    mock_blob_client_instance.upsert_container_metadata.assert_called_once_with(
+        {"search_index_generation": ANY}, exclusive=False
+    )
@@ -31,22 +31,31 @@ def test_batch_start_processing_processes_all(
 
     mock_queue_client = Mock()
     mock_create_queue_client.return_value = mock_queue_client
-    mock_blob_storage_client.return_value.get_all_files.return_value = [
-        {"filename": "file_name_one", "embeddings_added": False},
-        {"filename": "file_name_two", "embeddings_added": True},
-    ]
+    mock_blob_storage_client.return_value.iter_files.return_value = iter(
+        [
+            {"filename": "file_name_one"},
+            {"filename": "file_name_two"},
+            {"filename": "file_name_three"},
+        ]
+    )
     env_helper_mock.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION = False
+    env_helper_mock.EMBEDDING_MAX_WORKERS = 2
     # when
     response = batch_start_processing.build().get_user_function()(mock_http_request)
 
     # then
     assert response.status_code == 200
-    assert response.get_body() == b"Conversion started successfully for 2 documents."
+    assert response.get_body() == b"Conversion started successfully for 3 documents."
+    mock_blob_storage_client.return_value.iter_files.assert_called_once_with(
+        include_metadata=False
+    )
 
     send_message_calls = mock_queue_client.send_message.call_args_list
     assert len(send_message_calls) == 2
-    assert send_message_calls[0] == call(b'{"filename": "file_name_one"}')
-    assert send_message_calls[1] == call(b'{"filename": "file_name_two"}')
+    assert send_message_calls[0] == call(
+        b'{"filenames": ["file_name_one", "file_name_two"]}'
+    )
+    assert send_message_calls[1] == call(b'{"filenames": ["file_name_three"]}')
 
 
 @patch("backend.batch.batch_start_processing.create_queue_client")
@@ -63,10 +72,9 @@ def test_batch_start_processing_processes_all_integrated_vectorization(
 
     mock_queue_client = Mock()
     mock_create_queue_client.return_value = mock_queue_client
-    mock_blob_storage_client.return_value.get_all_files.return_value = [
-        {"filename": "file_name_one", "embeddings_added": False},
-        {"filename": "file_name_two", "embeddings_added": True},
-    ]
+    mock_blob_storage_client.return_value.iter_files.return_value = iter(
+        [{"filename": "file_name_one"}, {"filename": "file_name_two"}]
+    )
     mock_integrated_vectorization_embedder.return_value.reprocess_all.return_value = (
         None
     )
@@ -78,6 +86,10 @@ def test_batch_start_processing_processes_all_integrated_vectorization(
     # then
     assert response.status_code == 200
     assert response.get_body() == b"Conversion started successfully for 2 documents."
+    mock_blob_storage_client.return_value.iter_files.assert_called_once_with(
+        include_metadata=False
+    )
+    mock_blob_storage_client.return_value.upsert_container_metadata.assert_called_once()
 
     send_message_calls = mock_queue_client.send_message.call_args_list
     assert len(send_message_calls) == 0
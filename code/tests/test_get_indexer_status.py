@@ -0,0 +1,91 @@
+import sys
+import os
+import json
+from unittest.mock import MagicMock, patch
+import azure.functions as func
+from azure.core.exceptions import ResourceNotFoundError
+
+
+sys.path.append(os.path.join(os.path.dirname(sys.path[0]), "backend", "batch"))
+
+from backend.batch.get_indexer_status import get_indexer_status  # noqa: E402
+
+STATUS = {"status": "running", "last_run": None}
+
+
+def _request():
+    return func.HttpRequest(method="GET", url="", body=b"")
+
+
+@patch("backend.batch.get_indexer_status.AzureSearchIndexer")
+@patch("backend.batch.get_indexer_status.EnvHelper")
+def test_get_indexer_status(
+    mock_env_helper: MagicMock, mock_azure_search_indexer: MagicMock
+):
+    # given
+    mock_env_helper.return_value.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION = True
+    mock_env_helper.return_value.AZURE_SEARCH_INDEXER_NAME = "indexer_name"
+    mock_azure_search_indexer.return_value.get_indexer_status.return_value = STATUS
+
+    # when
+    response = get_indexer_status.build().get_user_function()(_request())
+
+    # then
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert json.loads(response.get_body()) == STATUS
+    mock_azure_search_indexer.return_value.get_indexer_status.assert_called_once_with(
+        "indexer_name"
+    )
+
+
+@patch("backend.batch.get_indexer_status.AzureSearchIndexer")
+@patch("backend.batch.get_indexer_status.EnvHelper")
+def test_get_indexer_status_without_integrated_vectorization(
+    mock_env_helper: MagicMock, mock_azure_search_indexer: MagicMock
+):
+    # given
+    mock_env_helper.return_value.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION = False
+
+    # when
+    response = get_indexer_status.build().get_user_function()(_request())
+
+    # then
+    assert response.status_code == 404
+    mock_azure_search_indexer.assert_not_called()
+
+
+@patch("backend.batch.get_indexer_status.AzureSearchIndexer")
+@patch("backend.batch.get_indexer_status.EnvHelper")
+def test_get_indexer_status_before_indexer_is_created(
+    mock_env_helper: MagicMock, mock_azure_search_indexer: MagicMock
+):
+    # given
+    mock_env_helper.return_value.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION = True
+    mock_azure_search_indexer.return_value.get_indexer_status.side_effect = (
+        ResourceNotFoundError("not found")
+    )
+
+    # when
+    response = get_indexer_status.build().get_user_function()(_request())
+
+    # then
+    assert response.status_code == 404
+
+
+@patch("backend.batch.get_indexer_status.AzureSearchIndexer")
+@patch("backend.batch.get_indexer_status.EnvHelper")
+def test_get_indexer_status_returns_error(
+    mock_env_helper: MagicMock, mock_azure_search_indexer: MagicMock
+):
+    # given
+    mock_env_helper.return_value.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION = True
+    mock_azure_search_indexer.return_value.get_indexer_status.side_effect = Exception(
+        "search down"
+    )
+
+    # when
+    response = get_indexer_status.build().get_user_function()(_request())
+
+    # then
+    assert response.status_code == 500
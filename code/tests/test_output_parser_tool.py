@@ -205,6 +205,28 @@ def test_returns_chunk_number():
     assert expected["citations"][0]["chunk_id"] == "2"
 
 
+def test_reuses_citation_number_for_repeated_doc_references():
+    # Given
+    output_parser = OutputParserTool()
+    question = "A question?"
+    answer = "An answer [doc3] [doc1]. Again [doc3]."
+    source_documents = [
+        SourceDocument(id="1", content="Some content", source="A source"),
+        SourceDocument(id="2", content="Some more content", source="Another source"),
+        SourceDocument(id="3", content="Yet some more content", source="A source"),
+    ]
+
+    # When
+    messages = output_parser.parse(
+        question=question, answer=answer, source_documents=source_documents
+    )
+
+    # Then
+    assert messages[1]["content"] == "An answer [doc1] [doc2]. Again [doc1]."
+    citations = json.loads(messages[0]["content"])["citations"]
+    assert [citation["id"] for citation in citations] == ["3", "1"]
+
+
 def _convert_source_documents_to_content(
     question: str, source_documents: List[SourceDocument]
 ) -> dict:
@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import MagicMock, patch
+from azure.core.exceptions import ResourceNotFoundError
 from backend.batch.utilities.helpers.embedders.integrated_vectorization_embedder import (
+    FINGERPRINT_METADATA_KEY,
     IntegratedVectorizationEmbedder,
 )
 from backend.batch.utilities.document_chunking.chunking_strategy import ChunkingSettings
@@ -12,6 +14,13 @@ CHUNKING_SETTINGS = ChunkingSettings({"strategy": "layout", "size": 1, "overlap"
 LOADING_SETTINGS = LoadingSettings({"strategy": LoadingStrategy.LAYOUT})
 
 
+@pytest.fixture(autouse=True)
+def reset_reconciled_fingerprint():
+    IntegratedVectorizationEmbedder.clear()
+    yield
+    IntegratedVectorizationEmbedder.clear()
+
+
 @pytest.fixture(autouse=True)
 def env_helper_mock():
     with patch(
@@ -19,6 +28,7 @@ def env_helper_mock():
     ) as mock:
         env_helper = mock.return_value
         env_helper.AZURE_SEARCH_INDEXER_NAME = AZURE_SEARCH_INDEXER_NAME
+        env_helper.AZURE_SEARCH_INDEXER_RUN_WINDOW = 30
 
         yield env_helper
 
@@ -156,11 +166,159 @@ def test_reprocess_all_calls_process_using_integrated_vectorization_when_indexer
 ):
     # Given
     azure_search_iv_indexer_helper_mock.return_value.indexer_exists.return_value = False
+    blob_client = MagicMock()
 
     # When
-    embedder = IntegratedVectorizationEmbedder(env_helper_mock)
+    embedder = IntegratedVectorizationEmbedder(env_helper_mock, blob_client)
     embedder.reprocess_all()
 
     # Then
     azure_search_iv_indexer_helper_mock.return_value.run_indexer.assert_not_called()
     azure_search_iv_indexer_helper_mock.return_value.create_or_update_indexer.assert_called_once()
+    blob_client.get_container_metadata.assert_not_called()
+    blob_client.upsert_container_metadata.assert_called_once_with(
+        {FINGERPRINT_METADATA_KEY: embedder.get_fingerprint()}
+    )
+
+
+@pytest.fixture
+def blob_client_mock():
+    blob_client = MagicMock()
+    blob_client.get_container_metadata.return_value = {}
+    return blob_client
+
+
+def test_embed_file_reconciles_resources_when_fingerprint_changed(
+    env_helper_mock: MagicMock,
+    azure_search_iv_datasource_helper_mock: MagicMock,
+    azure_search_iv_index_helper_mock: MagicMock,
+    azure_search_iv_skillset_helper_mock: MagicMock,
+    azure_search_iv_indexer_helper_mock: MagicMock,
+    blob_client_mock: MagicMock,
+):
+    # given
+    embedder = IntegratedVectorizationEmbedder(env_helper_mock, blob_client_mock)
+    fingerprint = embedder.get_fingerprint()
+
+    # when
+    embedder.embed_file("some-url", "some-file.pdf")
+
+    # then
+    azure_search_iv_datasource_helper_mock.return_value.create_or_update_datasource.assert_called_once()
+    azure_search_iv_index_helper_mock.return_value.create_or_update_index.assert_called_once()
+    azure_search_iv_skillset_helper_mock.return_value.create_skillset.assert_called_once()
+    azure_search_iv_indexer_helper_mock.return_value.create_or_update_indexer.assert_called_once()
+    azure_search_iv_indexer_helper_mock.return_value.request_run.assert_not_called()
+    blob_client_mock.upsert_container_metadata.assert_called_once_with(
+        {FINGERPRINT_METADATA_KEY: fingerprint}
+    )
+
+
+def test_embed_file_only_runs_indexer_when_fingerprint_unchanged(
+    env_helper_mock: MagicMock,
+    azure_search_iv_datasource_helper_mock: MagicMock,
+    azure_search_iv_indexer_helper_mock: MagicMock,
+    blob_client_mock: MagicMock,
+):
+    # given
+    embedder = IntegratedVectorizationEmbedder(env_helper_mock, blob_client_mock)
+    blob_client_mock.get_container_metadata.return_value = {
+        FINGERPRINT_METADATA_KEY: embedder.get_fingerprint()
+    }
+
+    # when
+    embedder.embed_file("some-url", "some-file.pdf")
+
+    # then
+    azure_search_iv_datasource_helper_mock.return_value.create_or_update_datasource.assert_not_called()
+    azure_search_iv_indexer_helper_mock.return_value.create_or_update_indexer.assert_not_called()
+    azure_search_iv_indexer_helper_mock.return_value.request_run.assert_called_once_with(
+        AZURE_SEARCH_INDEXER_NAME, 30
+    )
+    blob_client_mock.upsert_container_metadata.assert_not_called()
+
+
+def test_embed_file_remembers_reconciled_fingerprint(
+    env_helper_mock: MagicMock,
+    azure_search_iv_indexer_helper_mock: MagicMock,
+    blob_client_mock: MagicMock,
+):
+    # given
+    embedder = IntegratedVectorizationEmbedder(env_helper_mock, blob_client_mock)
+    embedder.embed_file("some-url", "some-file.pdf")
+
+    # when
+    IntegratedVectorizationEmbedder(env_helper_mock, blob_client_mock).embed_file(
+        "some-other-url", "some-other-file.pdf"
+    )
+
+    # then
+    blob_client_mock.get_container_metadata.assert_called_once()
+    azure_search_iv_indexer_helper_mock.return_value.create_or_update_indexer.assert_called_once()
+    azure_search_iv_indexer_helper_mock.return_value.request_run.assert_called_once_with(
+        AZURE_SEARCH_INDEXER_NAME, 30
+    )
+
+
+def test_embed_file_reconciles_resources_again_when_definitions_change(
+    env_helper_mock: MagicMock,
+    azure_search_iv_skillset_helper_mock: MagicMock,
+    azure_search_iv_indexer_helper_mock: MagicMock,
+    blob_client_mock: MagicMock,
+):
+    # given
+    skillset = (
+        azure_search_iv_skillset_helper_mock.return_value.get_skillset.return_value
+    )
+    skillset.serialize.return_value = {"maximumPageLength": 800}
+    embedder = IntegratedVectorizationEmbedder(env_helper_mock, blob_client_mock)
+    embedder.embed_file("some-url", "some-file.pdf")
+
+    # when
+    skillset.serialize.return_value = {"maximumPageLength": 1000}
+    embedder.embed_file("some-other-url", "some-other-file.pdf")
+
+    # then
+    assert (
+        azure_search_iv_indexer_helper_mock.return_value.create_or_update_indexer.call_count
+        == 2
+    )
+    assert blob_client_mock.upsert_container_metadata.call_count == 2
+
+
+def test_embed_file_reconciles_resources_when_fingerprint_cannot_be_read(
+    env_helper_mock: MagicMock,
+    azure_search_iv_indexer_helper_mock: MagicMock,
+    blob_client_mock: MagicMock,
+):
+    # given
+    blob_client_mock.get_container_metadata.side_effect = Exception("storage down")
+    embedder = IntegratedVectorizationEmbedder(env_helper_mock, blob_client_mock)
+
+    # when
+    embedder.embed_file("some-url", "some-file.pdf")
+
+    # then
+    azure_search_iv_indexer_helper_mock.return_value.create_or_update_indexer.assert_called_once()
+
+
+def test_embed_file_recreates_resources_when_indexer_was_deleted(
+    env_helper_mock: MagicMock,
+    azure_search_iv_indexer_helper_mock: MagicMock,
+    blob_client_mock: MagicMock,
+):
+    # given
+    embedder = IntegratedVectorizationEmbedder(env_helper_mock, blob_client_mock)
+    blob_client_mock.get_container_metadata.return_value = {
+        FINGERPRINT_METADATA_KEY: embedder.get_fingerprint()
+    }
+    azure_search_iv_indexer_helper_mock.return_value.request_run.side_effect = (
+        ResourceNotFoundError("indexer not found")
+    )
+
+    # when
+    embedder.embed_file("some-url", "some-file.pdf")
+
+    # then
+    azure_search_iv_indexer_helper_mock.return_value.create_or_update_indexer.assert_called_once()
+    blob_client_mock.upsert_container_metadata.assert_called_once()
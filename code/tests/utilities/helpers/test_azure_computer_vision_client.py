@@ -42,6 +42,13 @@ def pytest_ssl(monkeypatch: pytest.MonkeyPatch, ca: CA):
         yield
 
 
+@pytest.fixture(autouse=True)
+def reset_shared_session():
+    AzureComputerVisionClient.clear()
+    yield
+    AzureComputerVisionClient.clear()
+
+
 @pytest.fixture
 def env_helper_mock(httpserver: HTTPServer):
     env_helper_mock = MagicMock()
@@ -178,7 +185,9 @@ def test_returns_text_vectors(
 def test_vectorize_image_calls_computer_vision_timeout(
     mock_requests: MagicMock, azure_computer_vision_client: AzureComputerVisionClient
 ):
-    mock_requests.post.side_effect = ReadTimeout("An error occurred")
+    mock_requests.Session.return_value.post.side_effect = ReadTimeout(
+        "An error occurred"
+    )
     # when
     with pytest.raises(Exception) as exec_info:
         azure_computer_vision_client.vectorize_image(IMAGE_URL)
@@ -187,6 +196,60 @@ def test_vectorize_image_calls_computer_vision_timeout(
     assert isinstance(exec_info.value.__cause__, ReadTimeout)
 
 
+@mock.patch(
+    "backend.batch.utilities.helpers.azure_computer_vision_client.DefaultAzureCredential"
+)
+@mock.patch(
+    "backend.batch.utilities.helpers.azure_computer_vision_client.get_bearer_token_provider"
+)
+def test_reuses_token_provider_across_calls(
+    mock_get_bearer_token_provider: MagicMock,
+    mock_default_azure_credential: MagicMock,
+    httpserver: HTTPServer,
+    env_helper_mock: MagicMock,
+):
+    # given
+    env_helper_mock.is_auth_type_keys.return_value = False
+    mock_get_bearer_token_provider.return_value.return_value = "dummy token"
+    httpserver.expect_request(
+        COMPUTER_VISION_VECTORIZE_TEXT_PATH,
+        COMPUTER_VISION_VECTORIZE_TEXT_REQUEST_METHOD,
+    ).respond_with_json({"modelVersion": "2022-04-11", "vector": [1.0]})
+
+    # when
+    AzureComputerVisionClient(env_helper_mock).vectorize_text(TEXT)
+    AzureComputerVisionClient(env_helper_mock).vectorize_text(TEXT)
+
+    # then
+    mock_default_azure_credential.assert_called_once()
+    mock_get_bearer_token_provider.assert_called_once()
+    assert mock_get_bearer_token_provider.return_value.call_count == 2
+
+
+def test_retries_throttled_requests(
+    httpserver: HTTPServer, azure_computer_vision_client: AzureComputerVisionClient
+):
+    # given
+    expected_vectors = [3.0, 2.0, 1.0]
+    httpserver.expect_ordered_request(
+        COMPUTER_VISION_VECTORIZE_TEXT_PATH,
+        COMPUTER_VISION_VECTORIZE_TEXT_REQUEST_METHOD,
+    ).respond_with_json(
+        {"error": "too many requests"}, status=429, headers={"Retry-After": "0"}
+    )
+    httpserver.expect_ordered_request(
+        COMPUTER_VISION_VECTORIZE_TEXT_PATH,
+        COMPUTER_VISION_VECTORIZE_TEXT_REQUEST_METHOD,
+    ).respond_with_json({"modelVersion": "2022-04-11", "vector": expected_vectors})
+
+    # when
+    actual_vectors = azure_computer_vision_client.vectorize_text(TEXT)
+
+    # then
+    assert actual_vectors == expected_vectors
+    assert len(httpserver.log) == 2
+
+
 def test_raises_exception_if_bad_response_code(
     httpserver: HTTPServer, azure_computer_vision_client: AzureComputerVisionClient
 ):
@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import ANY, MagicMock, patch
+from azure.core.exceptions import ResourceNotFoundError
 from backend.batch.utilities.helpers.azure_search_helper import AzureSearchHelper
+from backend.batch.utilities.helpers.search_index_cache import SearchIndexCache
 from azure.search.documents.indexes.models import (
     ExhaustiveKnnAlgorithmConfiguration,
     ExhaustiveKnnParameters,
@@ -88,6 +90,8 @@ def env_helper_mock():
         )
 
         env_helper.USE_ADVANCED_IMAGE_PROCESSING = USE_ADVANCED_IMAGE_PROCESSING
+        env_helper.AZURE_SEARCH_INDEX_CACHE_TTL = 300
+        env_helper.AZURE_SEARCH_DIMENSIONS = ""
         env_helper.is_auth_type_keys.return_value = True
 
         yield env_helper
@@ -102,6 +106,13 @@ def reset_search_dimensions():
     AzureSearchHelper._image_search_dimension = None
 
 
+@pytest.fixture(autouse=True)
+def reset_search_index_cache():
+    SearchIndexCache.clear()
+    yield
+    SearchIndexCache.clear()
+
+
 @pytest.fixture(autouse=True)
 def azure_computer_vision_client_mock():
     with patch(
@@ -414,3 +425,88 @@ def test_get_conversation_logger_rbac(
         fields=ANY,
         user_agent="langchain chatwithyourdata-sa",
     )
+
+
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchClient")
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchIndexClient")
+def test_checks_search_index_exists_once_within_ttl(
+    search_index_client_mock: MagicMock,
+    search_client_mock: MagicMock,
+    llm_helper_mock: MagicMock,
+):
+    # given
+    search_index_client_mock.return_value.list_index_names.return_value = [
+        AZURE_SEARCH_INDEX
+    ]
+
+    # when
+    AzureSearchHelper().get_search_client()
+    AzureSearchHelper().get_search_client()
+
+    # then
+    search_index_client_mock.return_value.list_index_names.assert_called_once()
+    llm_helper_mock.get_embedding_model.assert_not_called()
+
+
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchClient")
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchIndexClient")
+def test_does_not_list_indexes_after_creating_search_index(
+    search_index_client_mock: MagicMock,
+    search_client_mock: MagicMock,
+):
+    # given
+    search_index_client_mock.return_value.list_index_names.return_value = []
+
+    # when
+    AzureSearchHelper().get_search_client()
+    AzureSearchHelper().get_search_client()
+
+    # then
+    search_index_client_mock.return_value.create_index.assert_called_once()
+    search_index_client_mock.return_value.list_index_names.assert_called_once()
+
+
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchClient")
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchIndexClient")
+def test_search_dimensions_of_known_embedding_model_are_not_probed(
+    search_index_client_mock: MagicMock,
+    search_client_mock: MagicMock,
+    env_helper_mock: MagicMock,
+    llm_helper_mock: MagicMock,
+):
+    # given
+    env_helper_mock.AZURE_OPENAI_EMBEDDING_MODEL = "my-embedding-deployment"
+    env_helper_mock.AZURE_OPENAI_EMBEDDING_MODEL_NAME = "text-embedding-3-large"
+    search_index_client_mock.return_value.get_index.side_effect = (
+        ResourceNotFoundError()
+    )
+
+    # when
+    dimensions = AzureSearchHelper().search_dimensions
+
+    # then
+    assert dimensions == 3072
+    llm_helper_mock.get_embedding_model.assert_not_called()
+
+
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchClient")
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchIndexClient")
+def test_search_dimensions_are_read_from_existing_index_without_model_name(
+    search_index_client_mock: MagicMock,
+    search_client_mock: MagicMock,
+    env_helper_mock: MagicMock,
+    llm_helper_mock: MagicMock,
+):
+    # given
+    env_helper_mock.AZURE_OPENAI_EMBEDDING_MODEL = "my-embedding-deployment"
+    env_helper_mock.AZURE_OPENAI_EMBEDDING_MODEL_NAME = ""
+    vector_field = MagicMock(vector_search_dimensions=3072)
+    vector_field.name = env_helper_mock.AZURE_SEARCH_CONTENT_VECTOR_COLUMN
+    search_index_client_mock.return_value.get_index.return_value.fields = [vector_field]
+
+    # when
+    dimensions = AzureSearchHelper().search_dimensions
+
+    # then
+    assert dimensions == 3072
+    llm_helper_mock.get_embedding_model.assert_not_called()
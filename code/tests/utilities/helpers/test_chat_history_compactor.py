@@ -0,0 +1,131 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from backend.batch.utilities.helpers.chat_history_compactor import (
+    ChatHistoryCompactor,
+)
+
+
+@pytest.fixture(autouse=True)
+def llm_helper_mock():
+    with patch(
+        "backend.batch.utilities.helpers.chat_history_compactor.LLMHelper"
+    ) as mock:
+        llm_helper = mock.return_value
+        llm_helper.get_chat_completion.return_value.choices[0].message.content = (
+            "mock summary"
+        )
+        llm_helper.get_chat_completion.return_value.usage.prompt_tokens = 10
+        llm_helper.get_chat_completion.return_value.usage.completion_tokens = 5
+
+        yield llm_helper
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    ChatHistoryCompactor.clear_cache()
+    yield
+    ChatHistoryCompactor.clear_cache()
+
+
+def chat_history(turns: int) -> list[dict]:
+    messages = []
+    for turn in range(turns):
+        messages.append({"role": "user", "content": f"question {turn} " * 20})
+        messages.append({"role": "assistant", "content": f"answer {turn} " * 20})
+    return messages
+
+
+def test_compact_keeps_short_history(llm_helper_mock: MagicMock):
+    # given
+    compactor = ChatHistoryCompactor(max_tokens=4000)
+    history = chat_history(2)
+
+    # when
+    result = compactor.compact(history, "conversation-id")
+
+    # then
+    assert result == history
+    llm_helper_mock.get_chat_completion.assert_not_called()
+
+
+def test_compact_is_disabled_without_budget(llm_helper_mock: MagicMock):
+    # given
+    compactor = ChatHistoryCompactor(max_tokens=0)
+    history = chat_history(50)
+
+    # when
+    result = compactor.compact(history, "conversation-id")
+
+    # then
+    assert result == history
+
+
+def test_compact_summarizes_older_messages(llm_helper_mock: MagicMock):
+    # given
+    compactor = ChatHistoryCompactor(max_tokens=600)
+    history = chat_history(10)
+
+    # when
+    result = compactor.compact(history, "conversation-id")
+
+    # then
+    assert result[:2] == [
+        {"role": "user", "content": "Summarize our earlier conversation."},
+        {"role": "assistant", "content": "mock summary"},
+    ]
+    assert result[2:] == history[-(len(result) - 2) :]
+    assert sum(compactor.count_tokens(message) for message in result) <= 600
+    llm_helper_mock.get_chat_completion.assert_called_once()
+    assert compactor.prompt_tokens == 10
+    assert compactor.completion_tokens == 5
+
+
+def test_compact_keeps_latest_turn_with_tiny_budget(llm_helper_mock: MagicMock):
+    # given
+    compactor = ChatHistoryCompactor(max_tokens=50)
+    history = chat_history(3)
+
+    # when
+    result = compactor.compact(history, "conversation-id")
+
+    # then
+    assert result == [
+        {"role": "user", "content": "Summarize our earlier conversation."},
+        {"role": "assistant", "content": "mock summary"},
+        *history[-2:],
+    ]
+
+
+def test_compact_reuses_cached_summary(llm_helper_mock: MagicMock):
+    # given
+    history = chat_history(10)
+    ChatHistoryCompactor(max_tokens=600).compact(history, "conversation-id")
+    llm_helper_mock.get_chat_completion.reset_mock()
+
+    # when
+    compactor = ChatHistoryCompactor(max_tokens=600)
+    compactor.compact(history, "conversation-id")
+
+    # then
+    llm_helper_mock.get_chat_completion.assert_not_called()
+    assert compactor.prompt_tokens == 0
+
+
+def test_compact_only_summarizes_new_messages(llm_helper_mock: MagicMock):
+    # given
+    history = chat_history(10)
+    ChatHistoryCompactor(max_tokens=600).compact(history, "conversation-id")
+    llm_helper_mock.get_chat_completion.reset_mock()
+
+    # when
+    ChatHistoryCompactor(max_tokens=600).compact(
+        history + chat_history(12)[20:], "conversation-id"
+    )
+
+    # then
+    llm_helper_mock.get_chat_completion.assert_called_once()
+    prompt = llm_helper_mock.get_chat_completion.call_args.args[0][1]["content"]
+    assert prompt.startswith("SUMMARY:\nmock summary")
+    assert "question 0" not in prompt
+    assert "question 8" in prompt
@@ -3,6 +3,7 @@ from backend.batch.utilities.helpers.document_loading_helper import (
     DocumentLoading,
     LoadingSettings,
 )
+from backend.batch.utilities.document_loading.web import WebDocumentLoading
 
 
 @pytest.mark.azure("This test requires Azure Document Intelligence configured")
@@ -42,6 +43,60 @@ def test_document_loading_web():
     assert data[0].source == url
 
 
+def test_web_document_loading_load_content():
+    # given
+    url = "https://example.com/page"
+    content = b"<html><body><h1>Title</h1> <p>Some\x00 text</p></body></html>"
+
+    # when
+    data = WebDocumentLoading().load_content(url, content)
+
+    # then
+    assert len(data) == 1
+    assert data[0].source == url
+    assert data[0].content == "Title Some text"
+
+
+def test_web_document_loading_removes_boilerplate_and_blank_lines():
+    # given
+    content = b"""<html><head><meta charset="utf-8">
+<style>p { color: red; }</style></head><body>
+<nav><a href="/">Home</a></nav>
+<div role="navigation">Menu</div>
+<h1>Title</h1>
+<p>First\tparagraph\xc2\xa0
+
+
+ \r
+still the first paragraph</p>
+<p>Second paragraph</p>
+<script>var tracking = true;</script>
+<footer>Copyright</footer>
+</body></html>"""
+
+    # when
+    data = WebDocumentLoading().load_content("https://example.com/page", content)
+
+    # then
+    assert data[0].content == (
+        "Title\nFirstparagraph\n\nstill the first paragraph\nSecond paragraph"
+    )
+
+
+def test_web_document_loading_skips_empty_pages():
+    # given
+    content = (
+        b'<html><head><meta charset="utf-8"></head>'
+        b"<body><nav>Home</nav><p>\x00\xe2\x80\x8b</p></body></html>"
+    )
+
+    # when
+    data = WebDocumentLoading().load_content("https://example.com/page", content)
+
+    # then
+    assert data == []
+
+
 @pytest.mark.azure("This test requires Azure Document Intelligence configured")
 def test_document_loading_docx():
     document_loading = DocumentLoading()
@@ -0,0 +1,106 @@
+from unittest.mock import MagicMock
+
+from azure.core.exceptions import ResourceNotFoundError
+from backend.batch.utilities.helpers.embedding_dimensions import (
+    get_index_field_dimensions,
+    resolve_dimensions,
+)
+
+
+def test_resolve_dimensions_uses_configured_dimensions():
+    # given
+    from_index = MagicMock()
+    probe = MagicMock()
+
+    # when
+    dimensions = resolve_dimensions("text", "3072", 1536, from_index, probe)
+
+    # then
+    assert dimensions == 3072
+    from_index.assert_not_called()
+    probe.assert_not_called()
+
+
+def test_resolve_dimensions_ignores_invalid_configured_dimensions():
+    # when
+    dimensions = resolve_dimensions("text", "invalid", 1536, lambda: None, MagicMock())
+
+    # then
+    assert dimensions == 1536
+
+
+def test_resolve_dimensions_reads_index_schema_for_unknown_model():
+    # given
+    probe = MagicMock()
+
+    # when
+    dimensions = resolve_dimensions("text", "", None, lambda: 768, probe)
+
+    # then
+    assert dimensions == 768
+    probe.assert_not_called()
+
+
+def test_resolve_dimensions_prefers_index_schema_over_known_model():
+    # given
+    probe = MagicMock()
+
+    # when
+    dimensions = resolve_dimensions("text", "", 1536, lambda: 3072, probe)
+
+    # then
+    assert dimensions == 3072
+    probe.assert_not_called()
+
+
+def test_resolve_dimensions_uses_known_model_for_new_index():
+    # given
+    probe = MagicMock()
+
+    # when
+    dimensions = resolve_dimensions("text", "", 3072, lambda: None, probe)
+
+    # then
+    assert dimensions == 3072
+    probe.assert_not_called()
+
+
+def test_resolve_dimensions_probes_as_last_resort():
+    # when
+    dimensions = resolve_dimensions("text", "", None, lambda: None, lambda: 512)
+
+    # then
+    assert dimensions == 512
+
+
+def test_get_index_field_dimensions():
+    # given
+    search_index_client = MagicMock()
+    content_field = MagicMock(vector_search_dimensions=None)
+    content_field.name = "content"
+    vector_field = MagicMock(vector_search_dimensions=1536)
+    vector_field.name = "content_vector"
+    search_index_client.get_index.return_value.fields = [content_field, vector_field]
+
+    # when
+    dimensions = get_index_field_dimensions(
+        search_index_client, "index", "content_vector"
+    )
+
+    # then
+    assert dimensions == 1536
+    search_index_client.get_index.assert_called_once_with("index")
+
+
+def test_get_index_field_dimensions_returns_none_when_index_does_not_exist():
+    # given
+    search_index_client = MagicMock()
+    search_index_client.get_index.side_effect = ResourceNotFoundError()
+
+    # when
+    dimensions = get_index_field_dimensions(
+        search_index_client, "index", "content_vector"
+    )
+
+    # then
+    assert dimensions is None
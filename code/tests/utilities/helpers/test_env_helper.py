@@ -143,6 +143,33 @@ def test_use_advanced_image_processing(monkeypatch: MonkeyPatch, value, expected
     assert actual_use_advanced_image_processing == expected
 
 
+def test_embedding_model_name_is_read_from_model_info(monkeypatch: MonkeyPatch):
+    # given
+    monkeypatch.setenv(
+        "AZURE_OPENAI_EMBEDDING_MODEL_INFO",
+        '{"model": "my-embeddings", "modelName": "text-embedding-3-large", "modelVersion": "1"}',
+    )
+
+    # when
+    env_helper = EnvHelper()
+
+    # then
+    assert env_helper.AZURE_OPENAI_EMBEDDING_MODEL == "my-embeddings"
+    assert env_helper.AZURE_OPENAI_EMBEDDING_MODEL_NAME == "text-embedding-3-large"
+
+
+def test_embedding_model_name_is_empty_when_not_set(monkeypatch: MonkeyPatch):
+    # given
+    monkeypatch.delenv("AZURE_OPENAI_EMBEDDING_MODEL_INFO", raising=False)
+    monkeypatch.delenv("AZURE_OPENAI_EMBEDDING_MODEL_NAME", raising=False)
+
+    # when
+    env_helper = EnvHelper()
+
+    # then
+    assert env_helper.AZURE_OPENAI_EMBEDDING_MODEL_NAME == ""
+
+
 @patch(
     "backend.batch.utilities.helpers.env_helper.os.getenv",
     side_effect=Exception("Some error"),
@@ -1,7 +1,11 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
-from backend.batch.utilities.helpers.llm_helper import LLMHelper
+from backend.batch.utilities.helpers.llm_helper import (
+    LLMHelper,
+    get_cached_prompt_tokens,
+)
+from openai.types.completion_usage import CompletionUsage
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
 from openai.types.create_embedding_response import CreateEmbeddingResponse
 from openai.types.embedding import Embedding
@@ -157,3 +161,27 @@ def test_get_ml_client_initializes_with_expected_parameters(
         env_helper_mock.AZURE_RESOURCE_GROUP,
         env_helper_mock.AZURE_ML_WORKSPACE_NAME,
     )
+
+
+def test_get_cached_prompt_tokens_from_usage():
+    # given
+    usage = CompletionUsage.model_validate(
+        {
+            "prompt_tokens": 2000,
+            "completion_tokens": 10,
+            "total_tokens": 2010,
+            "prompt_tokens_details": {"cached_tokens": 1536},
+        }
+    )
+
+    # then
+    assert get_cached_prompt_tokens(usage) == 1536
+
+
+def test_get_cached_prompt_tokens_defaults_to_zero():
+    # given
+    usage = CompletionUsage(prompt_tokens=20, completion_tokens=10, total_tokens=30)
+
+    # then
+    assert get_cached_prompt_tokens(usage) == 0
+    assert get_cached_prompt_tokens(None) == 0
@@ -1,13 +1,16 @@
 import hashlib
 import json
+import threading
 import pytest
 from unittest.mock import MagicMock, call, patch
+from azure.core.exceptions import ResourceNotFoundError
 from backend.batch.utilities.helpers.embedders.push_embedder import PushEmbedder
 from backend.batch.utilities.document_chunking.chunking_strategy import ChunkingSettings
 from backend.batch.utilities.document_loading import LoadingSettings
 from backend.batch.utilities.document_loading.strategies import LoadingStrategy
 from backend.batch.utilities.common.source_document import SourceDocument
 from backend.batch.utilities.helpers.config.embedding_config import EmbeddingConfig
+from backend.batch.utilities.helpers.search_index_cache import SearchIndexCache
 
 CHUNKING_SETTINGS = ChunkingSettings({"strategy": "layout", "size": 1, "overlap": 0})
 LOADING_SETTINGS = LoadingSettings({"strategy": LoadingStrategy.LAYOUT})
@@ -111,6 +114,12 @@ def mock_config_helper():
                 LOADING_SETTINGS,
                 use_advanced_image_processing=False,
             ),
+            EmbeddingConfig(
+                "url",
+                CHUNKING_SETTINGS,
+                LoadingSettings({"strategy": LoadingStrategy.WEB}),
+                use_advanced_image_processing=False,
+            ),
         ]
         config_helper.get_advanced_image_processing_image_types.return_value = {
             "jpeg",
@@ -187,6 +196,31 @@ def test_embed_file_advanced_image_processing_vectorizes_image(
     )
 
 
+def test_embed_file_advanced_image_processing_vectorizes_image_while_captioning(
+    llm_helper_mock, azure_computer_vision_mock
+):
+    # given
+    push_embedder = PushEmbedder(MagicMock(), MagicMock())
+    image_vectorization_started = threading.Event()
+    azure_computer_vision_mock.return_value.vectorize_image.side_effect = (
+        lambda source_url: image_vectorization_started.set() or [1.0]
+    )
+    caption_completion = llm_helper_mock.get_chat_completion.return_value
+    overlapped = []
+    llm_helper_mock.get_chat_completion.side_effect = lambda *args: (
+        overlapped.append(image_vectorization_started.wait(timeout=5))
+        or caption_completion
+    )
+
+    # when
+    push_embedder.embed_file(
+        "http://localhost:8080/some-file-name.jpg", "some-file-name.jpg"
+    )
+
+    # then
+    assert overlapped == [True]
+
+
 def test_embed_file_advanced_image_processing_uses_vision_model_for_captioning(
     llm_helper_mock,
 ):
@@ -298,6 +332,22 @@ def test_embed_file_advanced_image_processing_raises_exception_on_failure(
         )
 
 
+def test_embed_file_forgets_missing_index(azure_search_helper_mock, env_helper_mock):
+    # given
+    push_embedder = PushEmbedder(MagicMock(), env_helper_mock)
+    SearchIndexCache.mark_exists(AZURE_SEARCH_SERVICE, AZURE_SEARCH_INDEX, ttl=60)
+    azure_search_helper_mock.return_value.get_search_client.return_value.upload_documents.side_effect = ResourceNotFoundError(
+        "not found"
+    )
+
+    # when
+    with pytest.raises(ResourceNotFoundError):
+        push_embedder.embed_file("some-url", "some-file-name.jpg")
+
+    # then
+    assert not SearchIndexCache.is_known(AZURE_SEARCH_SERVICE, AZURE_SEARCH_INDEX)
+
+
 def test_embed_file_use_advanced_image_processing_does_not_vectorize_image_if_unsupported(
     azure_computer_vision_mock,
     mock_config_helper,
@@ -510,3 +560,148 @@ def test_embed_file_raises_exception_on_failure(
             "some-url",
             "some-file-name.pdf",
         )
+
+
+def test_embed_files_embeds_each_file(azure_search_helper_mock, env_helper_mock):
+    # given
+    blob_client = MagicMock()
+    push_embedder = PushEmbedder(blob_client, env_helper_mock)
+    files = [(f"http://localhost:8080/file-{i}.pdf", f"file-{i}.pdf") for i in range(5)]
+
+    # when
+    push_embedder.embed_files(files, max_workers=2)
+
+    # then
+    assert (
+        azure_search_helper_mock.return_value.get_search_client.return_value.upload_documents.call_count
+        == 5
+    )
+    blob_client.upsert_blobs_metadata.assert_called_once_with(
+        {file_name: {"embeddings_added": "true"} for _, file_name in files}
+    )
+    blob_client.upsert_blob_metadata.assert_not_called()
+
+
+def test_embed_files_raises_exception_after_embedding_the_other_files(
+    document_loading_mock, azure_search_helper_mock, env_helper_mock
+):
+    # given
+    env_helper_mock.EMBEDDING_MAX_WORKERS = 2
+    blob_client = MagicMock()
+    push_embedder = PushEmbedder(blob_client, env_helper_mock)
+    documents = document_loading_mock.return_value.load.return_value
+    document_loading_mock.return_value.load.side_effect = lambda source_url, _: (
+        _raise(ValueError("not a pdf")) if "bad" in source_url else documents
+    )
+
+    # when
+    with pytest.raises(RuntimeError) as exec_info:
+        push_embedder.embed_files(
+            [
+                ("http://localhost:8080/good-1.pdf", "good-1.pdf"),
+                ("http://localhost:8080/bad.pdf", "bad.pdf"),
+                ("http://localhost:8080/good-2.pdf", "good-2.pdf"),
+            ]
+        )
+
+    # then
+    assert str(exec_info.value) == "Embedding failed for 1 of 3 files: bad.pdf"
+    assert isinstance(exec_info.value.__cause__, ValueError)
+    blob_client.upsert_blobs_metadata.assert_called_once_with(
+        {
+            "good-1.pdf": {"embeddings_added": "true"},
+            "good-2.pdf": {"embeddings_added": "true"},
+        }
+    )
+    assert (
+        azure_search_helper_mock.return_value.get_search_client.return_value.upload_documents.call_count
+        == 2
+    )
+
+
+@patch("backend.batch.utilities.helpers.embedders.push_embedder.WebDocumentLoading")
+def test_embed_web_page_stores_validators_in_metadata(
+    web_document_loading_mock: MagicMock,
+    document_chunking_mock,
+    azure_search_helper_mock,
+    env_helper_mock,
+):
+    # given
+    push_embedder = PushEmbedder(MagicMock(), env_helper_mock)
+    validators = {"source_etag": '"v1"'}
+
+    # when
+    push_embedder.embed_web_page("https://example.com/page", b"<p>page</p>", validators)
+
+    # then
+    web_document_loading_mock.return_value.load_content.assert_called_once_with(
+        "https://example.com/page", b"<p>page</p>"
+    )
+    document_chunking_mock.return_value.chunk.assert_called_once_with(
+        web_document_loading_mock.return_value.load_content.return_value,
+        CHUNKING_SETTINGS,
+    )
+    uploaded_documents = azure_search_helper_mock.return_value.get_search_client.return_value.upload_documents.call_args[
+        0
+    ][
+        0
+    ]
+    assert len(uploaded_documents) == 2
+    for document in uploaded_documents:
+        assert (
+            json.loads(document[AZURE_SEARCH_FIELDS_METADATA])["source_etag"] == '"v1"'
+        )
+
+
+def test_get_web_page_validators(azure_search_helper_mock, env_helper_mock):
+    # given
+    push_embedder = PushEmbedder(MagicMock(), env_helper_mock)
+    search_client = azure_search_helper_mock.return_value.get_search_client.return_value
+    search_client.search.return_value = [
+        {
+            AZURE_SEARCH_FIELDS_METADATA: json.dumps(
+                {
+                    "chunk": 0,
+                    "source_etag": '"v1"',
+                    "source_last_modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+                }
+            )
+        }
+    ]
+
+    # when
+    validators = push_embedder.get_web_page_validators(
+        "https://example.com/o'brien?page=1"
+    )
+
+    # then
+    assert validators == {
+        "source_etag": '"v1"',
+        "source_last_modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }
+    search_client.search.assert_called_once_with(
+        "*",
+        filter=f"{AZURE_SEARCH_SOURCE_COLUMN} eq 'https://example.com/o''brien'",
+        select=[AZURE_SEARCH_FIELDS_METADATA],
+        top=1,
+    )
+
+
+def test_get_web_page_validators_returns_empty_when_not_embedded(
+    azure_search_helper_mock, env_helper_mock
+):
+    # given
+    push_embedder = PushEmbedder(MagicMock(), env_helper_mock)
+    azure_search_helper_mock.return_value.get_search_client.return_value.search.return_value = (
+        []
+    )
+
+    # when
+    validators = push_embedder.get_web_page_validators("https://example.com/page")
+
+    # then
+    assert validators == {}
+
+
+def _raise(error: Exception):
+    raise error
@@ -0,0 +1,75 @@
+from unittest.mock import MagicMock
+
+import pytest
+from backend.batch.utilities.helpers.query_vector_cache import QueryVectorCache
+
+KEY = ("embedding", "model", "question")
+
+
+@pytest.fixture(autouse=True)
+def reset_query_vector_cache():
+    QueryVectorCache.clear()
+    yield
+    QueryVectorCache.clear()
+
+
+def test_get_or_compute_returns_cached_vectors():
+    # given
+    compute = MagicMock(return_value=[0.1, 0.2, 0.3])
+
+    # when
+    vectors = [QueryVectorCache.get_or_compute(KEY, compute) for _ in range(3)]
+
+    # then
+    assert vectors == [[0.1, 0.2, 0.3]] * 3
+    compute.assert_called_once()
+
+
+def test_get_or_compute_computes_vectors_per_key():
+    # given
+    compute = MagicMock(side_effect=[[1.0], [2.0]])
+
+    # when
+    first = QueryVectorCache.get_or_compute(("embedding", "model", "a"), compute)
+    second = QueryVectorCache.get_or_compute(("image", "endpoint", "a"), compute)
+
+    # then
+    assert (first, second) == ([1.0], [2.0])
+
+
+def test_get_or_compute_returns_a_copy_of_the_cached_vector():
+    # given
+    QueryVectorCache.get_or_compute(KEY, lambda: [1.0, 2.0])
+
+    # when
+    QueryVectorCache.get_or_compute(KEY, lambda: [0.0]).append(3.0)
+
+    # then
+    assert QueryVectorCache.get_or_compute(KEY, lambda: [0.0]) == [1.0, 2.0]
+
+
+def test_get_or_compute_evicts_the_least_recently_used_vector(monkeypatch):
+    # given
+    monkeypatch.setattr(QueryVectorCache, "_MAX_CACHED_VECTORS", 2)
+    QueryVectorCache.get_or_compute(("a",), lambda: [1.0])
+    QueryVectorCache.get_or_compute(("b",), lambda: [2.0])
+    QueryVectorCache.get_or_compute(("a",), lambda: [0.0])
+
+    # when
+    QueryVectorCache.get_or_compute(("c",), lambda: [3.0])
+
+    # then
+    assert QueryVectorCache.get_or_compute(("a",), lambda: [0.0]) == [1.0]
+    assert QueryVectorCache.get_or_compute(("b",), lambda: [0.0]) == [0.0]
+
+
+def test_get_or_compute_does_not_cache_failures():
+    # given
+    compute = MagicMock(side_effect=[RuntimeError("throttled"), [1.0]])
+
+    # when
+    with pytest.raises(RuntimeError):
+        QueryVectorCache.get_or_compute(KEY, compute)
+
+    # then
+    assert QueryVectorCache.get_or_compute(KEY, compute) == [1.0]
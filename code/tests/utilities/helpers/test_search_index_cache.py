@@ -0,0 +1,105 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from azure.core.exceptions import ResourceNotFoundError
+from backend.batch.utilities.helpers.search_index_cache import SearchIndexCache
+
+ENDPOINT = "https://search.example.com"
+
+
+@pytest.fixture(autouse=True)
+def reset_search_index_cache():
+    SearchIndexCache.clear()
+    yield
+    SearchIndexCache.clear()
+
+
+def test_index_exists_lists_indexes_once_within_ttl():
+    # given
+    list_index_names = MagicMock(return_value=["index"])
+
+    # when
+    results = [
+        SearchIndexCache.index_exists(ENDPOINT, "index", list_index_names, ttl=60)
+        for _ in range(3)
+    ]
+
+    # then
+    assert results == [True, True, True]
+    list_index_names.assert_called_once()
+
+
+def test_index_exists_does_not_remember_missing_indexes():
+    # given
+    list_index_names = MagicMock(side_effect=[[], ["index"]])
+
+    # when
+    results = [
+        SearchIndexCache.index_exists(ENDPOINT, "index", list_index_names, ttl=60)
+        for _ in range(2)
+    ]
+
+    # then
+    assert results == [False, True]
+
+
+@patch("backend.batch.utilities.helpers.search_index_cache.time")
+def test_index_exists_lists_indexes_again_after_ttl(time_mock: MagicMock):
+    # given
+    list_index_names = MagicMock(return_value=["index"])
+    time_mock.monotonic.return_value = 1000
+    SearchIndexCache.index_exists(ENDPOINT, "index", list_index_names, ttl=60)
+
+    # when
+    time_mock.monotonic.return_value = 1061
+    SearchIndexCache.index_exists(ENDPOINT, "index", list_index_names, ttl=60)
+
+    # then
+    assert list_index_names.call_count == 2
+
+
+def test_invalidate_forgets_index():
+    # given
+    SearchIndexCache.mark_exists(ENDPOINT, "index", ttl=60)
+    SearchIndexCache.mark_exists(ENDPOINT, "other-index", ttl=60)
+
+    # when
+    SearchIndexCache.invalidate(ENDPOINT, "index")
+
+    # then
+    assert not SearchIndexCache.is_known(ENDPOINT, "index")
+    assert SearchIndexCache.is_known(ENDPOINT, "other-index")
+
+
+def test_invalidate_on_not_found_forgets_index():
+    # given
+    SearchIndexCache.mark_exists(ENDPOINT, "index", ttl=60)
+
+    # when
+    with pytest.raises(ResourceNotFoundError):
+        with SearchIndexCache.invalidate_on_not_found(ENDPOINT, "index"):
+            raise ResourceNotFoundError("not found")
+
+    # then
+    assert not SearchIndexCache.is_known(ENDPOINT, "index")
+
+
+def test_invalidate_on_not_found_keeps_index_on_other_errors():
+    # given
+    SearchIndexCache.mark_exists(ENDPOINT, "index", ttl=60)
+
+    # when
+    with pytest.raises(ValueError):
+        with SearchIndexCache.invalidate_on_not_found(ENDPOINT, "index"):
+            raise ValueError()
+
+    # then
+    assert SearchIndexCache.is_known(ENDPOINT, "index")
+
+
+def test_mark_exists_is_disabled_with_zero_ttl():
+    # when
+    SearchIndexCache.mark_exists(ENDPOINT, "index", ttl=0)
+
+    # then
+    assert not SearchIndexCache.is_known(ENDPOINT, "index")
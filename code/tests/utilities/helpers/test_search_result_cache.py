@@ -0,0 +1,163 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from backend.batch.utilities.common.source_document import SourceDocument
+from backend.batch.utilities.helpers.search_result_cache import (
+    INDEX_GENERATION_METADATA_KEY,
+    SearchResultCache,
+    bump_index_generation,
+    read_index_generation,
+)
+
+KEY = ("index", "filter", 5, False, "question")
+DOCUMENTS = [SourceDocument(content="content", source="source")]
+
+
+@pytest.fixture(autouse=True)
+def reset_search_result_cache():
+    SearchResultCache.clear()
+    yield
+    SearchResultCache.clear()
+
+
+def test_get_or_search_returns_cached_results_within_ttl():
+    # given
+    search = MagicMock(return_value=DOCUMENTS)
+    read_generation = MagicMock(return_value="1")
+
+    # when
+    results = [
+        SearchResultCache.get_or_search(KEY, search, read_generation, ttl=60)
+        for _ in range(3)
+    ]
+
+    # then
+    assert results == [DOCUMENTS] * 3
+    search.assert_called_once()
+    read_generation.assert_called_once()
+    stats = SearchResultCache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+    assert stats["saved_latency_seconds"] >= 0
+
+
+def test_get_or_search_returns_a_copy_of_the_cached_results():
+    # given
+    search = MagicMock(return_value=list(DOCUMENTS))
+    SearchResultCache.get_or_search(KEY, search, lambda: "1", ttl=60)
+
+    # when
+    SearchResultCache.get_or_search(KEY, search, lambda: "1", ttl=60).clear()
+
+    # then
+    assert SearchResultCache.get_or_search(KEY, search, lambda: "1", ttl=60) == (
+        DOCUMENTS
+    )
+
+
+@patch("backend.batch.utilities.helpers.search_result_cache.time")
+def test_get_or_search_searches_again_after_ttl(time_mock: MagicMock):
+    # given
+    search = MagicMock(return_value=DOCUMENTS)
+    time_mock.monotonic.return_value = 1000
+    time_mock.perf_counter.return_value = 0
+    SearchResultCache.get_or_search(KEY, search, lambda: "1", ttl=5)
+
+    # when
+    time_mock.monotonic.return_value = 1006
+    SearchResultCache.get_or_search(KEY, search, lambda: "1", ttl=5)
+
+    # then
+    assert search.call_count == 2
+
+
+@patch("backend.batch.utilities.helpers.search_result_cache.time")
+def test_get_or_search_searches_again_on_a_new_index_generation(time_mock: MagicMock):
+    # given
+    search = MagicMock(return_value=DOCUMENTS)
+    read_generation = MagicMock(side_effect=["1", "2"])
+    time_mock.monotonic.return_value = 1000
+    time_mock.perf_counter.return_value = 0
+    SearchResultCache.get_or_search(KEY, search, read_generation, ttl=60)
+
+    # when
+    time_mock.monotonic.return_value = (
+        1000 + SearchResultCache._GENERATION_REFRESH_SECONDS
+    )
+    SearchResultCache.get_or_search(KEY, search, read_generation, ttl=60)
+
+    # then
+    assert search.call_count == 2
+    assert read_generation.call_count == 2
+
+
+def test_get_or_search_does_not_cache_without_a_generation():
+    # given
+    search = MagicMock(return_value=DOCUMENTS)
+    read_generation = MagicMock(side_effect=Exception("storage unavailable"))
+
+    # when
+    SearchResultCache.get_or_search(KEY, search, read_generation, ttl=60)
+    SearchResultCache.get_or_search(KEY, search, read_generation, ttl=60)
+
+    # then
+    assert search.call_count == 2
+    assert SearchResultCache.stats()["hits"] == 0
+
+
+def test_get_or_search_evicts_the_least_recently_used_results():
+    # given
+    search = MagicMock(return_value=DOCUMENTS)
+
+    # when
+    with patch.object(SearchResultCache, "_MAX_CACHED_RESULTS", 2):
+        for question in ["first", "second", "first", "third", "first", "second"]:
+            SearchResultCache.get_or_search((question,), search, lambda: "1", ttl=60)
+
+    # then
+    assert search.call_count == 4
+
+
+def test_bump_index_generation_invalidates_cached_results():
+    # given
+    blob_client = MagicMock()
+    search = MagicMock(return_value=DOCUMENTS)
+    read_generation = MagicMock(return_value="1")
+    SearchResultCache.get_or_search(KEY, search, read_generation, ttl=60)
+
+    # when
+    bump_index_generation(blob_client)
+    SearchResultCache.get_or_search(KEY, search, read_generation, ttl=60)
+
+    # then
+    assert search.call_count == 2
+    metadata = blob_client.upsert_container_metadata.call_args.args[0]
+    assert int(metadata[INDEX_GENERATION_METADATA_KEY]) > 0
+    assert blob_client.upsert_container_metadata.call_args.kwargs == {
+        "exclusive": False
+    }
+
+
+def test_bump_index_generation_ignores_storage_errors():
+    # given
+    blob_client = MagicMock()
+    blob_client.upsert_container_metadata.side_effect = Exception("forbidden")
+
+    # when
+    bump_index_generation(blob_client)
+
+    # then
+    blob_client.upsert_container_metadata.assert_called_once()
+
+
+def test_read_index_generation_defaults_to_zero():
+    # given
+    blob_client = MagicMock()
+    blob_client.get_container_metadata.return_value = {}
+
+    # when
+    generation = read_index_generation(blob_client)
+
+    # then
+    assert generation == "0"
@@ -0,0 +1,149 @@
+from backend.batch.utilities.common.source_document import SourceDocument
+from backend.batch.utilities.helpers.source_packer import SourcePacker
+
+
+def document(id: str, content: str, source: str = "source", chunk=None, chunk_id=None):
+    return SourceDocument(
+        id=id, content=content, source=source, chunk=chunk, chunk_id=chunk_id
+    )
+
+
+def test_pack_keeps_distinct_documents_in_order():
+    # given
+    documents = [
+        document("1", "the holiday policy grants 25 days per year"),
+        document("2", "the pension plan matches contributions up to 5 percent"),
+    ]
+
+    # when
+    packed = SourcePacker().pack(documents)
+
+    # then
+    assert packed == documents
+
+
+def test_deduplicate_drops_repeated_ids_and_near_duplicates():
+    # given
+    documents = [
+        document("1", "the holiday policy grants 25 days of paid leave per year"),
+        document("1", "the holiday policy grants 25 days of paid leave per year"),
+        document(
+            "2",
+            "the holiday policy grants 25 days of paid leave per year to employees",
+            source="other",
+        ),
+        document("3", "the pension plan matches contributions up to 5 percent"),
+    ]
+
+    # when
+    packed = SourcePacker().deduplicate(documents)
+
+    # then
+    assert [document.id for document in packed] == ["1", "3"]
+
+
+def test_merge_adjacent_chunks_removes_overlap():
+    # given
+    documents = [
+        document("b", "policy grants 25 days.\nUnused days expire", chunk=4),
+        document("other", "an unrelated chunk", chunk=9),
+        document("a", "The holiday policy grants 25 days.", chunk=3),
+    ]
+
+    # when
+    packed = SourcePacker().merge_adjacent(documents)
+
+    # then
+    assert packed == [
+        SourceDocument(
+            id="a",
+            content="The holiday policy grants 25 days.\nUnused days expire",
+            source="source",
+            chunk=3,
+        ),
+        documents[1],
+    ]
+
+
+def test_merge_adjacent_merges_chunks_ranked_out_of_order():
+    # given
+    documents = [
+        document("3", "third", chunk=3),
+        document("other", "an unrelated chunk", source="other source", chunk=4),
+        document("5", "fifth", chunk=5),
+        document("4", "fourth", chunk=4),
+        document("7", "seventh", chunk=7),
+    ]
+
+    # when
+    packed = SourcePacker().merge_adjacent(documents)
+
+    # then
+    assert packed == [
+        SourceDocument(
+            id="3", content="third\nfourth\nfifth", source="source", chunk=3
+        ),
+        documents[1],
+        documents[4],
+    ]
+
+
+def test_merge_adjacent_reads_the_chunk_number_of_the_chunk_id():
+    # given
+    documents = [
+        document("b", "second", chunk_id="31e6a74d1340_cGFyZW50_pages_2"),
+        document("a", "first", chunk_id="31e6a74d1340_cGFyZW50_pages_1"),
+    ]
+
+    # when
+    packed = SourcePacker().merge_adjacent(documents)
+
+    # then
+    assert packed == [
+        SourceDocument(
+            id="a",
+            content="first\nsecond",
+            source="source",
+            chunk_id="31e6a74d1340_cGFyZW50_pages_1",
+        )
+    ]
+
+
+def test_merge_adjacent_ignores_other_documents():
+    # given
+    documents = [
+        document("a", "first", source="first source", chunk=1),
+        document("b", "second", source="second source", chunk=2),
+    ]
+
+    # when
+    packed = SourcePacker().merge_adjacent(documents)
+
+    # then
+    assert packed == documents
+
+
+def test_fill_budget_skips_documents_that_do_not_fit():
+    # given
+    documents = [
+        document("1", "short answer"),
+        document("2", "long " * 100),
+        document("3", "another short answer"),
+    ]
+
+    # when
+    packed = SourcePacker(max_tokens=20).fill_budget(documents)
+
+    # then
+    assert [document.id for document in packed] == ["1", "3"]
+
+
+def test_fill_budget_keeps_best_document_when_nothing_fits():
+    # given
+    documents = [document("1", "long " * 100), document("2", "long " * 100)]
+
+    # when
+    packed = SourcePacker(max_tokens=10).fill_budget(documents)
+
+    # then
+    assert packed == documents[:1]
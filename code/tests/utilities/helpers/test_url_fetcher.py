@@ -0,0 +1,140 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+from requests import HTTPError
+
+from backend.batch.utilities.helpers.url_fetcher import UrlFetcher
+
+URL = "https://example.com/page"
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_session():
+    UrlFetcher.clear()
+    yield
+    UrlFetcher.clear()
+
+
+@pytest.fixture
+def env_helper_mock():
+    env_helper = MagicMock()
+    env_helper.URL_FETCH_MAX_PER_HOST = 2
+    return env_helper
+
+
+@pytest.fixture
+def session_mock():
+    with patch("backend.batch.utilities.helpers.url_fetcher.requests") as mock:
+        yield mock.Session.return_value
+
+
+def _response(status_code=200, content=b"<p>page</p>", headers=None):
+    response = MagicMock(status_code=status_code, content=content)
+    response.headers = headers or {}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = HTTPError(str(status_code))
+    return response
+
+
+def test_fetch_returns_content_and_validators(
+    env_helper_mock: MagicMock, session_mock: MagicMock
+):
+    # given
+    session_mock.get.return_value = _response(
+        headers={"ETag": '"v1"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    )
+
+    # when
+    page = UrlFetcher(env_helper_mock).fetch(URL)
+
+    # then
+    assert not page.not_modified
+    assert page.content == b"<p>page</p>"
+    assert page.validators == {
+        "source_etag": '"v1"',
+        "source_last_modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }
+    session_mock.get.assert_called_once_with(URL, headers={}, timeout=30)
+
+
+def test_fetch_is_conditional_on_the_validators(
+    env_helper_mock: MagicMock, session_mock: MagicMock
+):
+    # given
+    session_mock.get.return_value = _response(status_code=304, content=b"")
+    validators = {
+        "title": URL,
+        "source_etag": '"v1"',
+        "source_last_modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }
+
+    # when
+    page = UrlFetcher(env_helper_mock).fetch(URL, validators)
+
+    # then
+    assert page.not_modified
+    session_mock.get.assert_called_once_with(
+        URL,
+        headers={
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+        },
+        timeout=30,
+    )
+
+
+def test_fetch_raises_on_error_status(
+    env_helper_mock: MagicMock, session_mock: MagicMock
+):
+    # given
+    session_mock.get.return_value = _response(status_code=404)
+
+    # when + then
+    with pytest.raises(HTTPError):
+        UrlFetcher(env_helper_mock).fetch(URL)
+
+
+def test_fetch_reuses_the_session(env_helper_mock: MagicMock):
+    with patch("backend.batch.utilities.helpers.url_fetcher.requests") as mock:
+        # given
+        mock.Session.return_value.get.return_value = _response()
+
+        # when
+        UrlFetcher(env_helper_mock).fetch(URL)
+        UrlFetcher(env_helper_mock).fetch(URL)
+
+        # then
+        mock.Session.assert_called_once()
+
+
+def test_fetch_limits_the_requests_in_flight_per_host(
+    env_helper_mock: MagicMock, session_mock: MagicMock
+):
+    # given
+    in_flight = {}
+    max_in_flight = {}
+    lock = threading.Lock()
+
+    def get(url, **kwargs):
+        host = url.split("/")[2]
+        with lock:
+            in_flight[host] = in_flight.get(host, 0) + 1
+            max_in_flight[host] = max(max_in_flight.get(host, 0), in_flight[host])
+        time.sleep(0.05)
+        with lock:
+            in_flight[host] -= 1
+        return _response()
+
+    session_mock.get.side_effect = get
+    fetcher = UrlFetcher(env_helper_mock)
+    urls = [f"https://{host}/page-{i}" for host in ["a.com", "b.com"] for i in range(4)]
+
+    # when
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        list(executor.map(fetcher.fetch, urls))
+
+    # then
+    assert max_in_flight == {"a.com": 2, "b.com": 2}
@@ -0,0 +1,201 @@
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_httpserver import HTTPServer
+
+from backend.batch.utilities.helpers.url_fetcher import UrlFetcher
+from backend.batch.utilities.helpers.web_crawler import WebCrawler, canonicalize_url
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_session():
+    UrlFetcher.clear()
+    yield
+    UrlFetcher.clear()
+
+
+@pytest.fixture
+def site():
+    # a plain HTTP server, the httpserver fixture serving HTTPS
+    server = HTTPServer()
+    server.start()
+    server.expect_request("/robots.txt").respond_with_data(
+        "User-agent: *\nDisallow: /private\n"
+    )
+    yield server
+    server.clear()
+    if server.is_running():
+        server.stop()
+
+
+@pytest.fixture
+def env_helper_mock():
+    env_helper = MagicMock()
+    env_helper.CRAWL_MAX_DEPTH = 2
+    env_helper.CRAWL_MAX_PAGES = 100
+    env_helper.EMBEDDING_MAX_WORKERS = 2
+    env_helper.URL_FETCH_MAX_PER_HOST = 2
+    return env_helper
+
+
+def page(site: HTTPServer, path: str, body: str, head: str = "", query_string=None):
+    site.expect_request(path, query_string=query_string).respond_with_data(
+        f"<html><head>{head}</head><body>{body}</body></html>",
+        content_type="text/html",
+    )
+
+
+def crawled_paths(site: HTTPServer, pages) -> list[str]:
+    return sorted(page.url.replace(site.url_for(""), "/") for page in pages)
+
+
+def test_crawl_follows_the_links_of_the_site(
+    site: HTTPServer, env_helper_mock: MagicMock
+):
+    # given
+    page(
+        site,
+        "/",
+        '<a href="/a">a</a> <a href="b#section">b</a> <a href="/private/c">c</a>'
+        ' <a href="https://example.com/">external</a>',
+    )
+    page(site, "/a", 'page a <a href="/">home</a> <a href="/a/deep">deep</a>')
+    page(site, "/b", 'page b <a href="/b/deep">deep</a>')
+    page(site, "/a/deep", 'deep a <a href="/a/deeper">deeper</a>')
+    page(site, "/b/deep", "deep b")
+    crawler = WebCrawler(env_helper_mock)
+
+    # when
+    pages = list(crawler.crawl(site.url_for("/")))
+
+    # then
+    assert crawled_paths(site, pages) == ["/", "/a", "/a/deep", "/b", "/b/deep"]
+    assert all(b"<html>" in page.content for page in pages)
+    assert crawler.failed == {}
+
+
+def test_crawl_stops_at_max_pages(site: HTTPServer, env_helper_mock: MagicMock):
+    # given
+    page(site, "/", " ".join(f'<a href="/{i}">{i}</a>' for i in range(10)))
+    for i in range(10):
+        page(site, f"/{i}", f"page {i}")
+    crawler = WebCrawler(env_helper_mock, max_pages=4)
+
+    # when
+    pages = list(crawler.crawl(site.url_for("/")))
+
+    # then
+    assert len(pages) == 4
+
+
+def test_crawl_skips_duplicates_and_noindex_pages(
+    site: HTTPServer, env_helper_mock: MagicMock
+):
+    # given
+    page(
+        site,
+        "/",
+        '<a href="/a">a</a> <a href="/a?utm=1">a</a> <a href="/copy">copy</a>'
+        ' <a href="/hidden">hidden</a>',
+    )
+    page(
+        site,
+        "/a",
+        "page a with another text",
+        head=f'<link rel="canonical" href="{site.url_for("/a")}">',
+        query_string="utm=1",
+    )
+    page(site, "/a", "page a")
+    page(site, "/copy", "page a")
+    page(
+        site,
+        "/hidden",
+        '<a href="/from-hidden">link</a>',
+        head='<meta name="robots" content="noindex">',
+    )
+    page(site, "/from-hidden", "from hidden")
+    crawler = WebCrawler(env_helper_mock)
+
+    # when
+    pages = list(crawler.crawl(site.url_for("/")))
+
+    # then
+    assert crawled_paths(site, pages) == ["/", "/a", "/from-hidden"]
+    assert crawler.failed == {}
+
+
+def test_crawl_seeds_from_a_sitemap(site: HTTPServer, env_helper_mock: MagicMock):
+    # given
+    site.expect_request("/sitemap.xml").respond_with_data(
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        f"<sitemap><loc>{site.url_for('/pages.xml')}</loc></sitemap>"
+        "</sitemapindex>",
+        content_type="application/xml",
+    )
+    site.expect_request("/pages.xml").respond_with_data(
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        f"<url><loc>{site.url_for('/a')}</loc></url>"
+        f"<url><loc>{site.url_for('/b')}</loc></url>"
+        f"<url><loc>{site.url_for('/private/c')}</loc></url>"
+        "</urlset>",
+        content_type="application/xml",
+    )
+    page(site, "/a", 'page a <a href="/a/deep">deep</a>')
+    page(site, "/b", "page b")
+    crawler = WebCrawler(env_helper_mock, max_depth=0)
+
+    # when
+    pages = list(crawler.crawl(site.url_for("/sitemap.xml")))
+
+    # then
+    assert crawled_paths(site, pages) == ["/a", "/b"]
+
+
+def test_crawl_lists_the_pages_failing_to_be_fetched(
+    site: HTTPServer, env_helper_mock: MagicMock
+):
+    # given
+    page(site, "/", '<a href="/missing">missing</a>')
+    site.expect_request("/missing").respond_with_data("not found", status=404)
+    crawler = WebCrawler(env_helper_mock)
+
+    # when
+    pages = list(crawler.crawl(site.url_for("/")))
+
+    # then
+    assert crawled_paths(site, pages) == ["/"]
+    assert list(crawler.failed) == [site.url_for("/missing")]
+
+
+def test_crawl_is_disallowed_when_robots_txt_is_unauthorized(
+    env_helper_mock: MagicMock,
+):
+    # given
+    server = HTTPServer()
+    server.start()
+    try:
+        server.expect_request("/robots.txt").respond_with_data("", status=403)
+        page(server, "/", "home")
+        crawler = WebCrawler(env_helper_mock)
+
+        # when
+        pages = list(crawler.crawl(server.url_for("/")))
+
+        # then
+        assert pages == []
+    finally:
+        server.stop()
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("HTTPS://Example.com:443/a#top", "https://example.com/a"),
+        ("http://example.com:8080", "http://example.com:8080/"),
+        ("https://example.com/a?b=1", "https://example.com/a?b=1"),
+    ],
+)
+def test_canonicalize_url(url: str, expected: str):
+    assert canonicalize_url(url) == expected
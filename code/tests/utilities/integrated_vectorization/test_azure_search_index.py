@@ -25,6 +25,8 @@ def env_helper_mock():
         env_helper.AZURE_SEARCH_KEY = AZURE_SEARCH_KEY
         env_helper.AZURE_SEARCH_SERVICE = AZURE_SEARCH_SERVICE
         env_helper.AZURE_SEARCH_INDEX = AZURE_SEARCH_INDEX
+        env_helper.AZURE_SEARCH_INDEX_CACHE_TTL = 300
+        env_helper.AZURE_SEARCH_DIMENSIONS = ""
 
         yield env_helper
 
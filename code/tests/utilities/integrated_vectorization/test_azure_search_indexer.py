@@ -1,5 +1,9 @@
+import time
+from datetime import datetime, timedelta, timezone
 import pytest
 from unittest.mock import ANY, MagicMock, patch
+from azure.core.exceptions import ResourceExistsError
+from azure.search.documents.indexes.models import IndexingSchedule
 from backend.batch.utilities.integrated_vectorization.azure_search_indexer import (
     AzureSearchIndexer,
 )
@@ -20,10 +24,18 @@ def env_helper_mock():
         env_helper.AZURE_SEARCH_KEY = AZURE_SEARCH_KEY
         env_helper.AZURE_SEARCH_SERVICE = AZURE_SEARCH_SERVICE
         env_helper.AZURE_SEARCH_INDEX = AZURE_SEARCH_INDEX
+        env_helper.AZURE_SEARCH_INDEXER_SCHEDULE_MINUTES = 5
 
         yield env_helper
 
 
+@pytest.fixture(autouse=True)
+def reset_run_requests():
+    AzureSearchIndexer.clear()
+    yield
+    AzureSearchIndexer.clear()
+
+
 @pytest.fixture(autouse=True)
 def search_indexer_client_mock():
     with patch(
@@ -59,6 +71,7 @@ def test_create_or_update_indexer_keys(
         name="indexer_name",
         description="Indexer to index documents and generate embeddings",
         skillset_name="skillset_name",
+        schedule=IndexingSchedule(interval=timedelta(minutes=5)),
         target_index_name=env_helper_mock.AZURE_SEARCH_INDEX,
         data_source_name=env_helper_mock.AZURE_SEARCH_DATASOURCE_NAME,
         parameters={
@@ -93,6 +106,7 @@ def test_create_or_update_indexer_rbac(
         name="indexer_name",
         description="Indexer to index documents and generate embeddings",
         skillset_name="skillset_name",
+        schedule=IndexingSchedule(interval=timedelta(minutes=5)),
         target_index_name=env_helper_mock.AZURE_SEARCH_INDEX,
         data_source_name=env_helper_mock.AZURE_SEARCH_DATASOURCE_NAME,
         parameters={
@@ -127,6 +141,24 @@ def test_run_indexer(
     )
 
 
+def test_run_indexer_without_reset(
+    env_helper_mock: MagicMock,
+    search_indexer_client_mock: MagicMock,
+    search_indexer_mock: MagicMock,
+):
+    # given
+    azure_search_indexer = AzureSearchIndexer(env_helper_mock)
+
+    # when
+    azure_search_indexer.run_indexer("indexer_name", reset=False)
+
+    # then
+    azure_search_indexer.indexer_client.reset_indexer.assert_not_called()
+    azure_search_indexer.indexer_client.run_indexer.assert_called_once_with(
+        "indexer_name"
+    )
+
+
 def test_indexer_exists(
     env_helper_mock: MagicMock,
     search_indexer_client_mock: MagicMock,
@@ -144,3 +176,175 @@ def test_indexer_exists(
 
     # then
     assert result is True
+
+
+def test_get_schedule_is_none_when_disabled(env_helper_mock: MagicMock):
+    # given
+    env_helper_mock.AZURE_SEARCH_INDEXER_SCHEDULE_MINUTES = 0
+
+    # when
+    schedule = AzureSearchIndexer(env_helper_mock).get_schedule()
+
+    # then
+    assert schedule is None
+
+
+def test_request_run_runs_indexer(
+    env_helper_mock: MagicMock, search_indexer_client_mock: MagicMock
+):
+    # given
+    indexer_client = search_indexer_client_mock.return_value
+    indexer_client.get_indexer_status.return_value.last_result.status = "success"
+
+    # when
+    ran = AzureSearchIndexer(env_helper_mock).request_run("indexer_name", window=30)
+
+    # then
+    assert ran is True
+    indexer_client.reset_indexer.assert_not_called()
+    indexer_client.run_indexer.assert_called_once_with("indexer_name")
+
+
+def test_request_run_coalesces_runs_within_window(
+    env_helper_mock: MagicMock, search_indexer_client_mock: MagicMock
+):
+    # given
+    indexer_client = search_indexer_client_mock.return_value
+    indexer_client.get_indexer_status.return_value.last_result = None
+    AzureSearchIndexer(env_helper_mock).request_run("indexer_name", window=30)
+
+    # when
+    ran = [
+        AzureSearchIndexer(env_helper_mock).request_run("indexer_name", window=30)
+        for _ in range(3)
+    ]
+
+    # then
+    assert ran == [False] * 3
+    indexer_client.get_indexer_status.assert_called_once()
+    indexer_client.run_indexer.assert_called_once_with("indexer_name")
+
+
+def test_request_run_runs_the_coalesced_requests_after_window(
+    env_helper_mock: MagicMock, search_indexer_client_mock: MagicMock
+):
+    # given
+    indexer_client = search_indexer_client_mock.return_value
+    indexer_client.get_indexer_status.return_value.last_result = None
+    AzureSearchIndexer(env_helper_mock).request_run("indexer_name", window=0.2)
+
+    # when
+    ran = [
+        AzureSearchIndexer(env_helper_mock).request_run("indexer_name", window=0.2)
+        for _ in range(3)
+    ]
+
+    # then
+    assert ran == [False] * 3
+    for _ in range(50):
+        if indexer_client.run_indexer.call_count == 2:
+            break
+        time.sleep(0.1)
+    assert indexer_client.run_indexer.call_count == 2
+
+
+def test_request_run_runs_again_after_window(
+    env_helper_mock: MagicMock, search_indexer_client_mock: MagicMock
+):
+    # given
+    indexer_client = search_indexer_client_mock.return_value
+    indexer_client.get_indexer_status.return_value.last_result = None
+    AzureSearchIndexer(env_helper_mock).request_run("indexer_name", window=0)
+
+    # when
+    ran = AzureSearchIndexer(env_helper_mock).request_run("indexer_name", window=0)
+
+    # then
+    assert ran is True
+    assert indexer_client.run_indexer.call_count == 2
+
+
+@patch(
+    "backend.batch.utilities.integrated_vectorization.azure_search_indexer.threading.Timer"
+)
+def test_request_run_schedules_a_run_when_indexer_is_running(
+    timer_mock: MagicMock,
+    env_helper_mock: MagicMock,
+    search_indexer_client_mock: MagicMock,
+):
+    # given
+    indexer_client = search_indexer_client_mock.return_value
+    indexer_client.get_indexer_status.return_value.last_result.status = "inProgress"
+
+    # when
+    ran = AzureSearchIndexer(env_helper_mock).request_run("indexer_name", window=30)
+
+    # then
+    assert ran is False
+    indexer_client.run_indexer.assert_not_called()
+    timer_mock.assert_called_once_with(30, ANY, args=("indexer_name", 30))
+    timer_mock.return_value.start.assert_called_once()
+
+
+def test_request_run_skips_when_another_run_started(
+    env_helper_mock: MagicMock, search_indexer_client_mock: MagicMock
+):
+    # given
+    indexer_client = search_indexer_client_mock.return_value
+    indexer_client.get_indexer_status.return_value.last_result = None
+    indexer_client.run_indexer.side_effect = ResourceExistsError("in progress")
+
+    # when
+    ran = AzureSearchIndexer(env_helper_mock).request_run("indexer_name", window=30)
+
+    # then
+    assert ran is False
+
+
+def test_get_indexer_status(
+    env_helper_mock: MagicMock, search_indexer_client_mock: MagicMock
+):
+    # given
+    start_time = datetime(2024, 5, 1, 12, 0, 0, tzinfo=timezone.utc)
+    status = search_indexer_client_mock.return_value.get_indexer_status.return_value
+    status.status = "running"
+    status.last_result = MagicMock(
+        status="success",
+        start_time=start_time,
+        end_time=start_time + timedelta(seconds=20),
+        item_count=40,
+        failed_item_count=1,
+        errors=[MagicMock(error_message=f"error {i}") for i in range(7)],
+    )
+
+    # when
+    result = AzureSearchIndexer(env_helper_mock).get_indexer_status("indexer_name")
+
+    # then
+    assert result == {
+        "status": "running",
+        "last_run": {
+            "status": "success",
+            "start_time": "2024-05-01T12:00:00+00:00",
+            "end_time": "2024-05-01T12:00:20+00:00",
+            "documents_processed": 40,
+            "documents_failed": 1,
+            "documents_per_second": 2.0,
+            "errors": [f"error {i}" for i in range(5)],
+        },
+    }
+
+
+def test_get_indexer_status_before_first_run(
+    env_helper_mock: MagicMock, search_indexer_client_mock: MagicMock
+):
+    # given
+    status = search_indexer_client_mock.return_value.get_indexer_status.return_value
+    status.status = "running"
+    status.last_result = None
+
+    # when
+    result = AzureSearchIndexer(env_helper_mock).get_indexer_status("indexer_name")
+
+    # then
+    assert result == {"status": "running", "last_run": None}
@@ -1,3 +1,4 @@
+import json
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
@@ -175,3 +176,95 @@ async def test_orchestrate_with_streaming_disabled(orchestrator):
 ##    response = await orchestrator.orchestrate(user_message, chat_history)
 ##    assert response is not None
 ##    assert isinstance(response, Response)
+
+
+@pytest.fixture
+def stream_orchestrator():
+    with patch(
+        "backend.batch.utilities.orchestrator.byod_orchestrator.OrchestratorBase.__init__"
+    ):
+        orchestrator = ByodOrchestrator()
+        orchestrator.env_helper = MagicMock(spec=EnvHelper)
+
+        yield orchestrator
+
+
+def stream_chunk(role=None, content=None, end_turn=False, citations=None):
+    delta = SimpleNamespace(
+        role=role,
+        content=content,
+        model_extra={"context": {"citations": citations or []}},
+    )
+    return SimpleNamespace(
+        id="chunk-id",
+        model="test-model",
+        created=1,
+        object="chat.completion.chunk",
+        choices=[SimpleNamespace(delta=delta, model_extra={"end_turn": end_turn})],
+    )
+
+
+STREAM_CITATIONS = [
+    {
+        "content": "Citation \"text\"",
+        "title": "doc.pdf",
+        "url": '{"id": "doc_1", "source": "https://source"}',
+    }
+]
+
+
+def stream_chunks():
+    return [
+        stream_chunk(role="assistant", citations=STREAM_CITATIONS),
+        stream_chunk(content="Azure AI "),
+        stream_chunk(content="is \"great\"\n"),
+        stream_chunk(end_turn=True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_orchestrate_stream(stream_orchestrator):
+    # given
+    orchestrator = stream_orchestrator
+    orchestrator.env_helper = MagicMock()
+    orchestrator.config = MagicMock()
+    orchestrator.config.prompts.enable_content_safety = False
+    orchestrator.llm_helper.openai_client.chat.completions.create.return_value = (
+        stream_chunks()
+    )
+
+    # when
+    deltas = [delta async for delta in orchestrator.orchestrate_stream("Hello", [])]
+
+    # then
+    assert deltas[1:] == [
+        {"role": "assistant", "content": "Azure AI ", "end_turn": False},
+        {"role": "assistant", "content": 'is "great"\n', "end_turn": False},
+        {"role": "assistant", "content": "", "end_turn": True},
+    ]
+    assert deltas[0]["role"] == "tool"
+    assert json.loads(deltas[0]["content"]) == {
+        "citations": [
+            {
+                "content": 'Citation "text"',
+                "id": "doc_1",
+                "chunk_id": None,
+                "title": "doc.pdf",
+                "source": "https://source",
+            }
+        ]
+    }
+    assert (
+        orchestrator.llm_helper.openai_client.chat.completions.create.call_args.kwargs[
+            "stream"
+        ]
+        is True
+    )
+
+
+def test_supports_streaming(stream_orchestrator):
+    # given
+    stream_orchestrator.env_helper.SHOULD_STREAM = True
+
+    # then
+    assert stream_orchestrator.supports_streaming
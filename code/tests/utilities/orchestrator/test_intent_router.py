@@ -0,0 +1,184 @@
+import pytest
+
+from backend.batch.utilities.orchestrator.intent_router import (
+    DIRECT_REPLY,
+    SEARCH_DOCUMENTS,
+    TEXT_PROCESSING,
+    HashedNgramClassifier,
+    LocalIntentRouter,
+    RouteDecision,
+    RuleBasedIntentRouter,
+    evaluate_router,
+    training_samples_from_conversation_logs,
+)
+
+CHAT_HISTORY = [
+    {"role": "user", "content": "What is the holiday policy?"},
+    {"role": "assistant", "content": "You have 25 days of holidays."},
+]
+
+SAMPLES = [
+    ("tell me about the travel expenses policy", [], SEARCH_DOCUMENTS),
+    ("tell me about the remote work policy", [], SEARCH_DOCUMENTS),
+    ("tell me about the dental benefits", [], SEARCH_DOCUMENTS),
+    ("tell me about the pension plan", [], SEARCH_DOCUMENTS),
+    ("hello", [], DIRECT_REPLY),
+    ("hi there", [], DIRECT_REPLY),
+    ("thanks a lot", CHAT_HISTORY, DIRECT_REPLY),
+    ("thank you", CHAT_HISTORY, DIRECT_REPLY),
+]
+
+
+def test_rules_route_text_operations_to_text_processing():
+    # when
+    decision = RuleBasedIntentRouter().route(
+        "Translate to French: the holiday policy", CHAT_HISTORY
+    )
+
+    # then
+    assert decision == RouteDecision(
+        TEXT_PROCESSING,
+        1.0,
+        {"operation": "Translate to French", "text": "the holiday policy"},
+        router="rules",
+    )
+
+
+@pytest.mark.parametrize(
+    "user_message,chat_history",
+    [
+        ("What is the holiday policy?", []),
+        ("How are you today?", []),
+        ("Who are you?", []),
+        ("What about sick leave?", CHAT_HISTORY),
+    ],
+)
+def test_rules_do_not_route_questions(user_message: str, chat_history: list):
+    # when
+    decision = RuleBasedIntentRouter().route(user_message, chat_history)
+
+    # then
+    assert decision is None
+
+
+def test_classifier_learns_from_samples():
+    # given
+    classifier = HashedNgramClassifier([SEARCH_DOCUMENTS, DIRECT_REPLY]).fit(SAMPLES)
+
+    # when
+    intent, confidence = classifier.predict("tell me about the parking policy", [])
+
+    # then
+    assert intent == SEARCH_DOCUMENTS
+    assert confidence > 0.5
+
+
+def test_classifier_round_trips_through_json():
+    # given
+    classifier = HashedNgramClassifier([SEARCH_DOCUMENTS, DIRECT_REPLY]).fit(SAMPLES)
+
+    # when
+    loaded = HashedNgramClassifier.from_json(classifier.to_json())
+
+    # then
+    assert loaded.predict_proba("hello", []) == classifier.predict_proba("hello", [])
+
+
+def test_local_router_only_routes_confident_search_predictions():
+    # given
+    classifier = HashedNgramClassifier([SEARCH_DOCUMENTS, DIRECT_REPLY]).fit(SAMPLES)
+    router = LocalIntentRouter(classifier, confidence_threshold=0.6)
+
+    # then
+    assert router.route("tell me about the parking policy", [])
+    assert router.route("hello", []) is None
+    assert (
+        LocalIntentRouter(classifier, confidence_threshold=1.0).route(
+            "tell me about the parking policy", []
+        )
+        is None
+    )
+
+
+def test_local_router_leaves_follow_up_questions_to_the_llm():
+    # given
+    classifier = HashedNgramClassifier([SEARCH_DOCUMENTS, DIRECT_REPLY]).fit(SAMPLES)
+    router = LocalIntentRouter(classifier, confidence_threshold=0.6)
+    chat_history = [
+        {"role": "user", "content": "tell me about the parking policy"},
+        {"role": "assistant", "content": "Employees park in lot B."},
+    ]
+
+    # then
+    assert router.route("tell me about the parking policy", [])
+    assert router.route("tell me about the parking policy", chat_history) is None
+
+
+def test_local_router_without_classifier_uses_rules_only():
+    # given
+    router = LocalIntentRouter()
+
+    # then
+    assert router.route("What is the parking policy?", []) is None
+    assert router.route("Summarize: the parking policy", []).intent == TEXT_PROCESSING
+
+
+def test_training_samples_from_conversation_logs():
+    # given
+    records = [
+        {
+            "conversation_id": "1",
+            "type": "assistant",
+            "content": "You have 25 days of holidays.",
+            "sources": ["doc_1"],
+            "created_at": "2024-01-01T00:00:01Z",
+        },
+        {
+            "conversation_id": "1",
+            "type": "user",
+            "content": "What is the holiday policy?",
+            "created_at": "2024-01-01T00:00:00Z",
+        },
+        {
+            "conversation_id": "1",
+            "type": "user",
+            "content": "thanks",
+            "created_at": "2024-01-01T00:00:02Z",
+        },
+        {
+            "conversation_id": "1",
+            "type": "assistant",
+            "content": "You are welcome.",
+            "sources": [],
+            "created_at": "2024-01-01T00:00:03Z",
+        },
+    ]
+
+    # when
+    samples = training_samples_from_conversation_logs(records)
+
+    # then
+    assert samples == [
+        ("What is the holiday policy?", [], SEARCH_DOCUMENTS),
+        ("thanks", CHAT_HISTORY, DIRECT_REPLY),
+    ]
+
+
+def test_evaluate_router():
+    # given
+    router = LocalIntentRouter()
+    samples = [
+        ("Translate to French: the holiday policy", [], TEXT_PROCESSING),
+        ("hello", [], DIRECT_REPLY),
+    ]
+
+    # when
+    report = evaluate_router(router, samples)
+
+    # then
+    assert report == {
+        "samples": 2,
+        "agreement": 0.5,
+        "coverage": 0.5,
+        "routed_accuracy": 1.0,
+    }
@@ -36,7 +36,7 @@ def test_run_tool_returns_answer_json():
     # Then
     assert (
         answer_json
-        == '{"question": "Hello", "answer": "Hello, how can I help you?", "source_documents": [], "prompt_tokens": null, "completion_tokens": null}'
+        == '{"question":"Hello","answer":"Hello, how can I help you?","source_documents":[],"prompt_tokens":null,"completion_tokens":null,"cached_prompt_tokens":0}'
     )
     agent.question_answer_tool.answer_question.assert_called_once_with(
         user_message, chat_history=[]
@@ -62,7 +62,7 @@ def test_run_text_processing_tool_returns_answer_json():
     # Then
     assert (
         answer_json
-        == '{"question": "Hello", "answer": "Hello, how can I help you?", "source_documents": [], "prompt_tokens": null, "completion_tokens": null}'
+        == '{"question":"Hello","answer":"Hello, how can I help you?","source_documents":[],"prompt_tokens":null,"completion_tokens":null,"cached_prompt_tokens":0}'
     )
     agent.text_processing_tool.answer_question.assert_called_once_with(
         user_message, chat_history=[]
@@ -84,7 +84,7 @@ async def test_orchestrate_langchain_to_orchestrate_chat(
 
     agent_chain_mock = MagicMock()
     agent_executor_mock.return_value = agent_chain_mock
-    agent_chain_mock.run.return_value = '{"question": "Hello", "answer": "Hello, how can I help you?", "source_documents": [], "prompt_tokens": null, "completion_tokens": null}'
+    agent_chain_mock.run.return_value = '{"question": "Hello", "answer": "Hello, how can I help you?", "source_documents": [], "prompt_tokens": null, "completion_tokens": null, "cached_prompt_tokens": 0}'
 
     expected_messages = [{"some", "message"}, {"another", "message"}]
     agent.output_parser.parse.return_value = expected_messages
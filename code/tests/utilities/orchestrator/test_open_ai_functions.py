@@ -1,6 +1,12 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
+from backend.batch.utilities.common.answer import Answer
+from backend.batch.utilities.common.source_document import SourceDocument
+from backend.batch.utilities.orchestrator.intent_router import (
+    LocalIntentRouter,
+    RouteDecision,
+)
 from backend.batch.utilities.orchestrator.open_ai_functions import (
     OpenAIFunctionsOrchestrator,
 )
@@ -17,6 +23,17 @@ def llm_helper_mock():
         yield llm_helper
 
 
+@pytest.fixture(autouse=True)
+def env_helper_mock():
+    with patch(
+        "backend.batch.utilities.orchestrator.open_ai_functions.EnvHelper"
+    ) as mock:
+        env_helper = mock.return_value
+        env_helper.INTENT_ROUTER_ENABLED = False
+
+        yield env_helper
+
+
 @pytest.fixture()
 def orchestrator():
     with patch(
@@ -62,3 +79,267 @@ async def test_content_safety_input(orchestrator: OpenAIFunctionsOrchestrator):
 
     # then
     assert response == content_safety_response
+
+
+def tool_call(name: str, arguments: str):
+    call = MagicMock()
+    call.function.name = name
+    call.function.arguments = arguments
+    return call
+
+
+def tool_calls_response(*tool_calls):
+    response = MagicMock()
+    response.usage.prompt_tokens = 100
+    response.usage.completion_tokens = 200
+    response.choices[0].finish_reason = "tool_calls"
+    response.choices[0].message.tool_calls = list(tool_calls)
+    return response
+
+
+@pytest.fixture()
+def question_answer_tool_mock():
+    with patch(
+        "backend.batch.utilities.orchestrator.open_ai_functions.QuestionAnswerTool"
+    ) as mock:
+        yield mock.return_value
+
+
+@pytest.fixture()
+def text_processing_tool_mock():
+    with patch(
+        "backend.batch.utilities.orchestrator.open_ai_functions.TextProcessingTool"
+    ) as mock:
+        yield mock.return_value
+
+
+@pytest.fixture()
+def post_prompt_tool_mock():
+    with patch(
+        "backend.batch.utilities.orchestrator.open_ai_functions.PostPromptTool"
+    ) as mock:
+        yield mock.return_value
+
+
+@pytest.mark.asyncio
+async def test_calls_llm_with_tools(
+    orchestrator: OpenAIFunctionsOrchestrator, llm_helper_mock: MagicMock
+):
+    # given
+    llm_helper_mock.get_chat_completion_with_tools.return_value.choices[
+        0
+    ].finish_reason = "stop"
+    llm_helper_mock.get_chat_completion_with_tools.return_value.choices[
+        0
+    ].message.content = "mock-response"
+    llm_helper_mock.get_chat_completion_with_tools.return_value.usage.prompt_tokens = 10
+    llm_helper_mock.get_chat_completion_with_tools.return_value.usage.completion_tokens = (
+        20
+    )
+
+    # when
+    response = await orchestrator.orchestrate("question", [])
+
+    # then
+    llm_helper_mock.get_chat_completion_with_tools.assert_called_once_with(
+        ANY, orchestrator.tools, tool_choice="auto"
+    )
+    assert [tool["type"] for tool in orchestrator.tools] == ["function", "function"]
+    assert response[1]["content"] == "mock-response"
+    assert orchestrator.tokens == {"prompt": 10, "completion": 20, "total": 30}
+
+
+@pytest.mark.asyncio
+async def test_parallel_search_documents_merges_sources_into_single_answer(
+    orchestrator: OpenAIFunctionsOrchestrator,
+    llm_helper_mock: MagicMock,
+    question_answer_tool_mock: MagicMock,
+    post_prompt_tool_mock: MagicMock,
+):
+    # given
+    orchestrator.config.prompts.enable_post_answering_prompt = False
+    llm_helper_mock.get_chat_completion_with_tools.return_value = tool_calls_response(
+        tool_call("search_documents", '{"question": "first question"}'),
+        tool_call("search_documents", '{"question": "second question"}'),
+    )
+    shared_document = SourceDocument(id="shared", content="shared", source="source")
+    question_answer_tool_mock.search_source_documents.side_effect = [
+        [SourceDocument(id="1", content="first", source="source"), shared_document],
+        [shared_document, SourceDocument(id="2", content="second", source="source")],
+    ]
+    question_answer_tool_mock.answer_question_with_sources.return_value = Answer(
+        question="first question\nsecond question",
+        answer="mock-answer",
+        prompt_tokens=10,
+        completion_tokens=20,
+    )
+
+    # when
+    response = await orchestrator.orchestrate("question", [])
+
+    # then
+    assert question_answer_tool_mock.search_source_documents.call_count == 2
+    question_answer_tool_mock.answer_question_with_sources.assert_called_once()
+    args = question_answer_tool_mock.answer_question_with_sources.call_args.args
+    assert args[0] == "first question\nsecond question"
+    assert [document.id for document in args[2]] == ["1", "shared", "2"]
+    post_prompt_tool_mock.validate_answer.assert_not_called()
+
+    assert response[1]["content"] == "mock-answer"
+    assert orchestrator.tokens == {"prompt": 110, "completion": 220, "total": 330}
+
+
+@pytest.mark.asyncio
+async def test_parallel_search_and_text_processing_are_combined(
+    orchestrator: OpenAIFunctionsOrchestrator,
+    llm_helper_mock: MagicMock,
+    question_answer_tool_mock: MagicMock,
+    text_processing_tool_mock: MagicMock,
+    post_prompt_tool_mock: MagicMock,
+):
+    # given
+    llm_helper_mock.get_chat_completion_with_tools.return_value = tool_calls_response(
+        tool_call("search_documents", '{"question": "search question"}'),
+        tool_call("text_processing", '{"text": "text", "operation": "Translate"}'),
+    )
+    question_answer_tool_mock.search_source_documents.return_value = []
+    question_answer_tool_mock.answer_question_with_sources.return_value = Answer(
+        question="search question",
+        answer="search-answer",
+        prompt_tokens=10,
+        completion_tokens=20,
+    )
+    post_prompt_tool_mock.validate_answer.side_effect = lambda answer: Answer(
+        question=answer.question,
+        answer=answer.answer,
+        prompt_tokens=1,
+        completion_tokens=2,
+    )
+    text_processing_tool_mock.answer_question.return_value = Answer(
+        question="question",
+        answer="text-answer",
+        prompt_tokens=30,
+        completion_tokens=40,
+    )
+
+    # when
+    response = await orchestrator.orchestrate("question", [])
+
+    # then
+    text_processing_tool_mock.answer_question.assert_called_once_with(
+        "question", [], text="text", operation="Translate"
+    )
+    assert response[1]["content"] == "search-answer\n\ntext-answer"
+    assert orchestrator.tokens == {"prompt": 141, "completion": 262, "total": 403}
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool_call_replies_with_message_content(
+    orchestrator: OpenAIFunctionsOrchestrator,
+    llm_helper_mock: MagicMock,
+    question_answer_tool_mock: MagicMock,
+):
+    # given
+    response = tool_calls_response(tool_call("unknown_tool", "{}"))
+    response.choices[0].message.content = "mock-response"
+    llm_helper_mock.get_chat_completion_with_tools.return_value = response
+
+    # when
+    response = await orchestrator.orchestrate("question", [])
+
+    # then
+    question_answer_tool_mock.search_source_documents.assert_not_called()
+    assert response[1]["content"] == "mock-response"
+
+
+@pytest.mark.asyncio
+async def test_intent_router_skips_llm_routing_call(
+    orchestrator: OpenAIFunctionsOrchestrator,
+    llm_helper_mock: MagicMock,
+    question_answer_tool_mock: MagicMock,
+):
+    # given
+    orchestrator.config.prompts.enable_post_answering_prompt = False
+    classifier = MagicMock()
+    classifier.predict.return_value = ("search_documents", 0.95)
+    orchestrator.intent_router = LocalIntentRouter(classifier)
+    question_answer_tool_mock.search_source_documents.return_value = []
+    question_answer_tool_mock.answer_question_with_sources.return_value = Answer(
+        question="What is the holiday policy?",
+        answer="mock-answer",
+        prompt_tokens=10,
+        completion_tokens=20,
+    )
+
+    # when
+    response = await orchestrator.orchestrate("What is the holiday policy?", [])
+
+    # then
+    llm_helper_mock.get_chat_completion_with_tools.assert_not_called()
+    question_answer_tool_mock.search_source_documents.assert_called_once_with(
+        "What is the holiday policy?"
+    )
+    assert response[1]["content"] == "mock-answer"
+    assert orchestrator.tokens == {"prompt": 10, "completion": 20, "total": 30}
+
+
+@pytest.mark.asyncio
+async def test_intent_router_leaves_follow_up_to_llm_routing_call(
+    orchestrator: OpenAIFunctionsOrchestrator,
+    llm_helper_mock: MagicMock,
+    question_answer_tool_mock: MagicMock,
+):
+    # given
+    orchestrator.config.prompts.enable_post_answering_prompt = False
+    classifier = MagicMock()
+    classifier.predict.return_value = ("search_documents", 0.95)
+    orchestrator.intent_router = LocalIntentRouter(classifier)
+    chat_history = [
+        {"role": "user", "content": "What is the holiday policy?"},
+        {"role": "assistant", "content": "Employees get 25 days."},
+    ]
+    llm_helper_mock.get_chat_completion_with_tools.return_value = tool_calls_response(
+        tool_call(
+            "search_documents",
+            '{"question": "What is the holiday policy for contractors?"}',
+        )
+    )
+    question_answer_tool_mock.search_source_documents.return_value = []
+    question_answer_tool_mock.answer_question_with_sources.return_value = Answer(
+        question="What is the holiday policy for contractors?",
+        answer="mock-answer",
+    )
+
+    # when
+    await orchestrator.orchestrate("and for contractors?", chat_history)
+
+    # then
+    llm_helper_mock.get_chat_completion_with_tools.assert_called_once()
+    question_answer_tool_mock.search_source_documents.assert_called_once_with(
+        "What is the holiday policy for contractors?"
+    )
+
+
+@pytest.mark.asyncio
+async def test_intent_router_falls_back_to_llm_when_not_confident(
+    orchestrator: OpenAIFunctionsOrchestrator, llm_helper_mock: MagicMock
+):
+    # given
+    orchestrator.intent_router = MagicMock()
+    orchestrator.intent_router.predict.return_value = RouteDecision(
+        "search_documents", 0.5, {"question": "hello"}, router="classifier"
+    )
+    orchestrator.intent_router.is_confident.return_value = False
+    llm_helper_mock.get_chat_completion_with_tools.return_value.choices[
+        0
+    ].finish_reason = "stop"
+    llm_helper_mock.get_chat_completion_with_tools.return_value.choices[
+        0
+    ].message.content = "mock-response"
+
+    # when
+    response = await orchestrator.orchestrate("hello", [])
+
+    # then
+    llm_helper_mock.get_chat_completion_with_tools.assert_called_once()
+    assert response[1]["content"] == "mock-response"
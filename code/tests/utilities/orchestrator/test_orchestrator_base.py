@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from backend.batch.utilities.orchestrator.orchestrator_base import OrchestratorBase
@@ -29,6 +29,17 @@ def conversation_logger_mock():
         yield conversation_logger
 
 
+@pytest.fixture(autouse=True)
+def chat_history_compactor_mock():
+    with patch(
+        "backend.batch.utilities.orchestrator.orchestrator_base.ChatHistoryCompactor"
+    ) as mock:
+        chat_history_compactor = mock.return_value
+        chat_history_compactor.prompt_tokens = 0
+        chat_history_compactor.completion_tokens = 0
+        yield chat_history_compactor
+
+
 @pytest.fixture(autouse=True)
 def content_safety_checker_mock():
     with patch(
@@ -106,3 +117,110 @@ def test_call_content_safety_output_no_replace(content_safety_checker_mock: Magi
 
     # then
     assert result is None
+
+
+@pytest.mark.asyncio
+async def test_handle_message_compacts_chat_history(
+    chat_history_compactor_mock: MagicMock,
+):
+    # given
+    orchestrator = MockOrchestrator()
+    orchestrator.orchestrate = AsyncMock(return_value=[])
+    chat_history = [{"role": "user", "content": "old question"}]
+    compacted_chat_history = [
+        {"role": "user", "content": "Summarize our earlier conversation."},
+        {"role": "assistant", "content": "summary"},
+    ]
+    chat_history_compactor_mock.compact.return_value = compacted_chat_history
+    chat_history_compactor_mock.prompt_tokens = 10
+    chat_history_compactor_mock.completion_tokens = 5
+
+    # when
+    await orchestrator.handle_message("user message", chat_history, "conversation-id")
+
+    # then
+    chat_history_compactor_mock.compact.assert_called_once_with(
+        chat_history, "conversation-id"
+    )
+    orchestrator.orchestrate.assert_awaited_once_with(
+        "user message", compacted_chat_history
+    )
+    assert orchestrator.tokens == {"prompt": 10, "completion": 5, "total": 15}
+
+
+def test_log_tokens_counts_cached_prompt_tokens():
+    # given
+    orchestrator = MockOrchestrator()
+
+    # when
+    orchestrator.log_tokens(prompt_tokens=100, completion_tokens=10)
+    orchestrator.log_tokens(
+        prompt_tokens=2000, completion_tokens=20, cached_prompt_tokens=1536
+    )
+
+    # then
+    assert orchestrator.tokens == {
+        "prompt": 2100,
+        "completion": 30,
+        "total": 2130,
+        "cached_prompt": 1536,
+    }
+
+
+@pytest.mark.asyncio
+async def test_handle_message_stream_logs_interaction_after_the_stream(
+    config_mock: MagicMock, conversation_logger_mock: MagicMock
+):
+    # given
+    orchestrator = MockOrchestrator()
+    config_mock.logging.log_user_interactions = True
+
+    async def orchestrate_stream(user_message, chat_history, **kwargs):
+        yield {"role": "tool", "content": "{}", "end_turn": False}
+        yield {"role": "assistant", "content": "An ", "end_turn": False}
+        conversation_logger_mock.log.assert_not_called()
+        yield {"role": "assistant", "content": "answer", "end_turn": True}
+
+    orchestrator.orchestrate_stream = orchestrate_stream
+
+    # when
+    deltas = [
+        delta
+        async for delta in orchestrator.handle_message_stream(
+            "user message", [], "conversation-id"
+        )
+    ]
+
+    # then
+    assert len(deltas) == 3
+    conversation_logger_mock.log.assert_called_once_with(
+        messages=[
+            {
+                "role": "user",
+                "content": "user message",
+                "conversation_id": "conversation-id",
+            },
+            {"role": "tool", "content": "{}", "end_turn": False},
+            {"role": "assistant", "content": "An answer", "end_turn": True},
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_orchestrate_stream_yields_the_orchestrated_messages():
+    # given
+    orchestrator = MockOrchestrator()
+    messages = [
+        {"role": "tool", "content": "{}", "end_turn": False},
+        {"role": "assistant", "content": "An answer", "end_turn": True},
+    ]
+    orchestrator.orchestrate = AsyncMock(return_value=messages)
+
+    # when
+    deltas = [
+        delta async for delta in orchestrator.orchestrate_stream("user message", [])
+    ]
+
+    # then
+    assert deltas == messages
+    assert not orchestrator.supports_streaming
@@ -1,3 +1,4 @@
+import json
 from unittest.mock import ANY, AsyncMock, MagicMock, call, patch
 
 import pytest
@@ -13,6 +14,7 @@ from semantic_kernel.contents.utils.finish_reason import FinishReason
 from semantic_kernel.contents.function_call_content import FunctionCallContent
 
 from backend.batch.utilities.common.answer import Answer
+from backend.batch.utilities.common.source_document import SourceDocument
 from backend.batch.utilities.orchestrator.semantic_kernel import (
     SemanticKernelOrchestrator,
 )
@@ -405,6 +407,82 @@ async def test_semantic_kernel_search_documents_without_post_answering_prompt(
     assert orchestrator.tokens == {"prompt": 110, "completion": 220, "total": 330}
 
 
+@pytest.mark.asyncio
+async def test_semantic_kernel_parallel_tool_calls_are_merged(
+    orchestrator: SemanticKernelOrchestrator,
+):
+    # given
+    orchestrator.config.prompts.enable_post_answering_prompt = False
+
+    first_response = ChatMessageContent(
+        role=AuthorRole.ASSISTANT,
+        finish_reason=FinishReason.TOOL_CALLS,
+        items=[
+            FunctionCallContent(
+                id="id-1",
+                name="Chat-search_documents",
+                arguments='{"question": "first question"}',
+            ),
+            FunctionCallContent(
+                id="id-2",
+                name="Chat-search_documents",
+                arguments='{"question": "second question"}',
+            ),
+        ],
+        metadata={
+            "usage": MagicMock(
+                prompt_tokens=100,
+                completion_tokens=200,
+            )
+        },
+    )
+
+    first_answer = Answer(
+        question="first question",
+        answer="first answer[doc1]",
+        source_documents=[
+            SourceDocument(id="1", content="first", source="https://source/a.pdf")
+        ],
+        prompt_tokens=10,
+        completion_tokens=20,
+    )
+    second_answer = Answer(
+        question="second question",
+        answer="second answer[doc1]",
+        source_documents=[
+            SourceDocument(id="2", content="second", source="https://source/b.pdf")
+        ],
+        prompt_tokens=30,
+        completion_tokens=40,
+    )
+
+    with patch.object(orchestrator, "kernel", wraps=orchestrator.kernel) as kernel_mock:
+        kernel_mock.invoke = AsyncMock()
+        kernel_mock.invoke.side_effect = [
+            MagicMock(value=[first_response]),
+            MagicMock(value=first_answer),
+            MagicMock(value=second_answer),
+        ]
+
+        # when
+        response = await orchestrator.orchestrate("question", [])
+
+    # then
+    assert kernel_mock.invoke.await_count == 3
+    kernel_mock.invoke.assert_has_awaits(
+        [
+            call(function=ANY, question="first question"),
+            call(function=ANY, question="second question"),
+        ]
+    )
+
+    assert response[1]["content"] == "first answer[doc1]\n\nsecond answer[doc2]"
+    assert [
+        citation["id"] for citation in json.loads(response[0]["content"])["citations"]
+    ] == ["1", "2"]
+    assert orchestrator.tokens == {"prompt": 140, "completion": 260, "total": 400}
+
+
 @pytest.mark.asyncio
 async def test_chat_history_included(
     orchestrator: SemanticKernelOrchestrator,
@@ -1,5 +1,12 @@
 import pytest
-from unittest.mock import ANY, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import ANY, MagicMock, call, patch
+from azure.core import MatchConditions
+from azure.core.exceptions import (
+    ResourceExistsError,
+    ResourceModifiedError,
+    ResourceNotFoundError,
+)
 from backend.batch.utilities.helpers.azure_blob_storage_client import (
     AzureBlobStorageClient,
 )
@@ -113,6 +120,38 @@ def test_delete_file(BlobServiceClientMock: MagicMock):
     blob_client_mock.delete_blob.assert_called_once()
 
 
+def test_get_blob_metadata(BlobServiceClientMock: MagicMock):
+    # given
+    client = AzureBlobStorageClient()
+    blob_service_client_mock = BlobServiceClientMock.return_value
+    blob_client_mock = blob_service_client_mock.get_blob_client.return_value
+    blob_client_mock.get_blob_properties.return_value.metadata = {"title": "mock-file"}
+
+    # when
+    metadata = client.get_blob_metadata("mock-file")
+
+    # then
+    assert metadata == {"title": "mock-file"}
+    blob_service_client_mock.get_blob_client.assert_called_once_with(
+        container="mock-container", blob="mock-file"
+    )
+
+
+def test_get_blob_metadata_returns_none_when_blob_does_not_exist(
+    BlobServiceClientMock: MagicMock,
+):
+    # given
+    client = AzureBlobStorageClient()
+    blob_client_mock = BlobServiceClientMock.return_value.get_blob_client.return_value
+    blob_client_mock.get_blob_properties.side_effect = ResourceNotFoundError()
+
+    # when
+    metadata = client.get_blob_metadata("mock-file")
+
+    # then
+    assert metadata is None
+
+
 def test_upsert_blob_metadata(BlobServiceClientMock: MagicMock):
     # given
     client = AzureBlobStorageClient()
@@ -122,6 +161,7 @@ def test_upsert_blob_metadata(BlobServiceClientMock: MagicMock):
         "other-key": "other-value",
         "old-key": "old-value",
     }
+    blob_client_mock.get_blob_properties.return_value.etag = "mock-etag"
 
     # when
     client.upsert_blob_metadata(
@@ -141,8 +181,199 @@ def test_upsert_blob_metadata(BlobServiceClientMock: MagicMock):
             "other-key": "other-value",
             "old-key": "new-value",
             "new-key": "some-value",
-        }
+        },
+        etag="mock-etag",
+        match_condition=MatchConditions.IfNotModified,
+    )
+
+
+def test_upsert_blob_metadata_skips_unchanged_metadata(
+    BlobServiceClientMock: MagicMock,
+):
+    # given
+    client = AzureBlobStorageClient()
+    blob_client_mock = BlobServiceClientMock.return_value.get_blob_client.return_value
+    blob_client_mock.get_blob_properties.return_value.metadata = {
+        "embeddings_added": "true"
+    }
+
+    # when
+    client.upsert_blob_metadata("mock-file", {"embeddings_added": "true"})
+
+    # then
+    blob_client_mock.set_blob_metadata.assert_not_called()
+
+
+def test_upsert_blob_metadata_retries_when_modified_concurrently(
+    BlobServiceClientMock: MagicMock,
+):
+    # given
+    client = AzureBlobStorageClient()
+    blob_client_mock = BlobServiceClientMock.return_value.get_blob_client.return_value
+    blob_client_mock.get_blob_properties.side_effect = [
+        SimpleNamespace(metadata={"title": "old"}, etag="etag-1"),
+        SimpleNamespace(metadata={"title": "new"}, etag="etag-2"),
+    ]
+    blob_client_mock.set_blob_metadata.side_effect = [
+        ResourceModifiedError("condition not met"),
+        None,
+    ]
+
+    # when
+    client.upsert_blob_metadata("mock-file", {"embeddings_added": "true"})
+
+    # then
+    assert blob_client_mock.set_blob_metadata.call_args_list[-1] == call(
+        metadata={"title": "new", "embeddings_added": "true"},
+        etag="etag-2",
+        match_condition=MatchConditions.IfNotModified,
+    )
+
+
+def test_upsert_blob_metadata_gives_up_after_attempts(
+    BlobServiceClientMock: MagicMock,
+):
+    # given
+    client = AzureBlobStorageClient()
+    blob_client_mock = BlobServiceClientMock.return_value.get_blob_client.return_value
+    blob_client_mock.get_blob_properties.side_effect = lambda: SimpleNamespace(
+        metadata={}, etag="etag"
+    )
+    blob_client_mock.set_blob_metadata.side_effect = ResourceModifiedError(
+        "condition not met"
+    )
+
+    # when
+    with pytest.raises(ResourceModifiedError):
+        client.upsert_blob_metadata("mock-file", {"embeddings_added": "true"})
+
+    # then
+    assert blob_client_mock.set_blob_metadata.call_count == 5
+
+
+def test_upsert_blobs_metadata(BlobServiceClientMock: MagicMock):
+    # given
+    client = AzureBlobStorageClient()
+    blob_service_client_mock = BlobServiceClientMock.return_value
+    blob_clients = {}
+
+    def get_blob_client(container, blob):
+        blob_client = blob_clients.setdefault(blob, MagicMock())
+        blob_client.get_blob_properties.return_value.metadata = {}
+        if blob == "bad-file":
+            blob_client.set_blob_metadata.side_effect = Exception("forbidden")
+        return blob_client
+
+    blob_service_client_mock.get_blob_client.side_effect = get_blob_client
+
+    # when
+    with pytest.raises(RuntimeError) as exec_info:
+        client.upsert_blobs_metadata(
+            {
+                name: {"embeddings_added": "true"}
+                for name in ["file-1", "bad-file", "file-2"]
+            }
+        )
+
+    # then
+    assert str(exec_info.value) == "Metadata update failed for 1 of 3 blobs: bad-file"
+    for name in ["file-1", "file-2"]:
+        blob_clients[name].set_blob_metadata.assert_called_once()
+
+
+def test_upsert_container_metadata_under_a_lease(BlobServiceClientMock: MagicMock):
+    # given
+    client = AzureBlobStorageClient()
+    container_client_mock = (
+        BlobServiceClientMock.return_value.get_container_client.return_value
+    )
+    lease_mock = container_client_mock.acquire_lease.return_value
+    container_client_mock.get_container_properties.return_value.metadata = {
+        "other-key": "other-value",
+        "old-key": "old-value",
+    }
+
+    # when
+    client.upsert_container_metadata({"old-key": "new-value"})
+
+    # then
+    container_client_mock.get_container_properties.assert_called_once_with(
+        lease=lease_mock
+    )
+    container_client_mock.set_container_metadata.assert_called_once_with(
+        metadata={"other-key": "other-value", "old-key": "new-value"},
+        lease=lease_mock,
+    )
+    lease_mock.release.assert_called_once()
+
+
+def test_upsert_container_metadata_without_lease(BlobServiceClientMock: MagicMock):
+    # given
+    client = AzureBlobStorageClient()
+    container_client_mock = (
+        BlobServiceClientMock.return_value.get_container_client.return_value
+    )
+    container_client_mock.get_container_properties.return_value.metadata = {
+        "other-key": "other-value",
+    }
+
+    # when
+    client.upsert_container_metadata({"key": "value"}, exclusive=False)
+
+    # then
+    container_client_mock.acquire_lease.assert_not_called()
+    container_client_mock.set_container_metadata.assert_called_once_with(
+        metadata={"other-key": "other-value", "key": "value"}
+    )
+
+
+@patch("backend.batch.utilities.helpers.azure_blob_storage_client.time.sleep")
+def test_upsert_container_metadata_waits_for_the_lease(
+    _, BlobServiceClientMock: MagicMock
+):
+    # given
+    client = AzureBlobStorageClient()
+    container_client_mock = (
+        BlobServiceClientMock.return_value.get_container_client.return_value
+    )
+    lease_mock = MagicMock()
+    container_client_mock.acquire_lease.side_effect = [
+        ResourceExistsError("lease already present"),
+        lease_mock,
+    ]
+    container_client_mock.get_container_properties.return_value.metadata = {}
+
+    # when
+    client.upsert_container_metadata({"key": "value"})
+
+    # then
+    assert container_client_mock.acquire_lease.call_count == 2
+    container_client_mock.set_container_metadata.assert_called_once_with(
+        metadata={"key": "value"}, lease=lease_mock
     )
+    lease_mock.release.assert_called_once()
+
+
+@patch("backend.batch.utilities.helpers.azure_blob_storage_client.time.sleep")
+def test_upsert_container_metadata_gives_up_after_attempts(
+    _, BlobServiceClientMock: MagicMock
+):
+    # given
+    client = AzureBlobStorageClient()
+    container_client_mock = (
+        BlobServiceClientMock.return_value.get_container_client.return_value
+    )
+    container_client_mock.acquire_lease.side_effect = ResourceExistsError(
+        "lease already present"
+    )
+
+    # when
+    with pytest.raises(ResourceExistsError):
+        client.upsert_container_metadata({"key": "value"})
+
+    # then
+    assert container_client_mock.acquire_lease.call_count == 5
+    container_client_mock.set_container_metadata.assert_not_called()
 
 
 @patch("backend.batch.utilities.helpers.azure_blob_storage_client.generate_blob_sas")
@@ -191,3 +422,131 @@ def test_get_container_sas(generate_container_sas_mock: MagicMock):
         permission="r",
         expiry=ANY,
     )
+
+
+class FakePager:
+    def __init__(self, pages):
+        self.pages = pages
+        self.continuation_token = None
+
+    def __iter__(self):
+        for i, page in enumerate(self.pages):
+            self.continuation_token = (
+                f"token-{i + 1}" if i + 1 < len(self.pages) else None
+            )
+            yield page
+
+
+def blob(name, metadata=None):
+    return SimpleNamespace(name=name, metadata=metadata)
+
+
+@pytest.fixture
+def container_client_mock(BlobServiceClientMock: MagicMock):
+    container_client = (
+        BlobServiceClientMock.return_value.get_container_client.return_value
+    )
+    container_client.list_blob_names.return_value = ["converted/a.pdf.zip"]
+    container_client.list_blobs.return_value.by_page.return_value = FakePager(
+        [
+            [
+                blob("a.pdf", {"converted_filename": "converted/a.pdf.zip"}),
+                blob("b.pdf", {"embeddings_added": "true"}),
+            ],
+            [blob("converted/a.pdf.zip"), blob("c.pdf")],
+        ]
+    )
+    return container_client
+
+
+@patch(
+    "backend.batch.utilities.helpers.azure_blob_storage_client.generate_container_sas"
+)
+def test_get_all_files(
+    generate_container_sas_mock: MagicMock, container_client_mock: MagicMock
+):
+    # given
+    client = AzureBlobStorageClient()
+    generate_container_sas_mock.return_value = "mock-sas"
+    url = "https://mock-account.blob.core.windows.net/mock-container"
+
+    # when
+    files = client.get_all_files()
+
+    # then
+    assert files == [
+        {
+            "filename": "a.pdf",
+            "converted": True,
+            "embeddings_added": False,
+            "fullpath": f"{url}/a.pdf?mock-sas",
+            "converted_path": f"{url}/converted/a.pdf.zip?mock-sas",
+        },
+        {
+            "filename": "b.pdf",
+            "converted": False,
+            "embeddings_added": True,
+            "fullpath": f"{url}/b.pdf?mock-sas",
+            "converted_path": "",
+        },
+        {
+            "filename": "c.pdf",
+            "converted": False,
+            "embeddings_added": False,
+            "fullpath": f"{url}/c.pdf?mock-sas",
+            "converted_path": "",
+        },
+    ]
+    generate_container_sas_mock.assert_called_once()
+    container_client_mock.list_blob_names.assert_called_once_with(
+        name_starts_with="converted/"
+    )
+
+
+@patch(
+    "backend.batch.utilities.helpers.azure_blob_storage_client.generate_container_sas"
+)
+def test_iter_files_without_metadata_lists_names_only(
+    generate_container_sas_mock: MagicMock, container_client_mock: MagicMock
+):
+    # given
+    client = AzureBlobStorageClient()
+
+    # when
+    files = client.iter_files(include_metadata=False, prefix="folder/", page_size=2)
+
+    # then
+    assert list(files) == [
+        {"filename": "a.pdf"},
+        {"filename": "b.pdf"},
+        {"filename": "c.pdf"},
+    ]
+    container_client_mock.list_blobs.assert_called_once_with(
+        name_starts_with="folder/", include=None, results_per_page=2
+    )
+    container_client_mock.list_blob_names.assert_not_called()
+    generate_container_sas_mock.assert_not_called()
+
+
+def test_iter_file_pages_returns_continuation_tokens(
+    container_client_mock: MagicMock,
+):
+    # given
+    client = AzureBlobStorageClient()
+
+    # when
+    pages = list(
+        client.iter_file_pages(
+            include_metadata=False, page_size=2, continuation_token="token-0"
+        )
+    )
+
+    # then
+    assert [page.files for page in pages] == [
+        [{"filename": "a.pdf"}, {"filename": "b.pdf"}],
+        [{"filename": "c.pdf"}],
+    ]
+    assert [page.continuation_token for page in pages] == ["token-1", None]
+    container_client_mock.list_blobs.return_value.by_page.assert_called_once_with(
+        continuation_token="token-0"
+    )
@@ -38,6 +38,7 @@ def env_helper_mock():
         env_helper = mock.return_value
         env_helper.AZURE_OPENAI_SYSTEM_MESSAGE = "mock azure openai system message"
         env_helper.AZURE_SEARCH_TOP_K = 1
+        env_helper.AZURE_SEARCH_SOURCES_MAX_TOKENS = 6000
         env_helper.AZURE_SEARCH_FILTER = "mock filter"
         env_helper.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION = False
         env_helper.USE_ADVANCED_IMAGE_PROCESSING = False
@@ -125,6 +126,56 @@ def test_answer_question_returns_source_documents(
     assert answer.source_documents == get_source_documents_mock.return_value
 
 
+def test_answer_question_packs_source_documents(
+    get_source_documents_mock: MagicMock, llm_helper_mock: MagicMock
+):
+    # given
+    get_source_documents_mock.return_value = [
+        SourceDocument(
+            id="chunk 1", content="first part", source="mock source", chunk=1
+        ),
+        SourceDocument(
+            id="chunk 0", content="zeroth part", source="mock source", chunk=0
+        ),
+        SourceDocument(
+            id="chunk 1 copy", content="first part", source="other source", chunk=7
+        ),
+    ]
+    tool = QuestionAnswerTool()
+
+    # when
+    answer = tool.answer_question("mock question", [])
+
+    # then
+    assert answer.source_documents == [
+        SourceDocument(
+            id="chunk 0",
+            content="zeroth part\nfirst part",
+            source="mock source",
+            chunk=0,
+        )
+    ]
+    prompt = llm_helper_mock.get_chat_completion.call_args.args[0][-1]["content"][0]
+    assert '{"[doc1]":{"content":"zeroth part\\nfirst part"}}]}' in prompt["text"]
+
+
+def test_static_prefix_is_identical_across_turns(llm_helper_mock: MagicMock):
+    # given
+    tool = QuestionAnswerTool()
+
+    # when
+    tool.answer_question("first question", [])
+    tool.answer_question(
+        "second question", [{"role": "user", "content": "first question"}]
+    )
+
+    # then
+    first_messages = llm_helper_mock.get_chat_completion.call_args_list[0].args[0]
+    second_messages = llm_helper_mock.get_chat_completion.call_args_list[1].args[0]
+    assert json.dumps(first_messages[:4]) == json.dumps(second_messages[:4])
+    assert second_messages[4] == {"content": "first question", "role": "user"}
+
+
 def test_answer_question_returns_answer():
     # given
     tool = QuestionAnswerTool()